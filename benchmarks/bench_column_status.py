@@ -0,0 +1,71 @@
+"""
+Column status benchmark
+
+Compares per-row file status computation (get_advanced_file_status) with the
+batch column API (get_file_column_status) on synthetic task folders.
+
+Usage (from the repository root):
+    python benchmarks/bench_column_status.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client"))
+
+from src.managers.asset_manager import AssetManager  # noqa: E402
+from src.project_context import ProjectContext  # noqa: E402
+
+ROW_COUNTS = [100, 1000, 2500, 5000, 10000]
+PER_ROW_LIMIT = 2500  # Per-row is quadratic, stop before it takes minutes
+
+
+def build_task_folder(root, count):
+    """Create a task folder with `count` files and return the manager + names."""
+    context = ProjectContext(root)
+    production_folder = context.production_folder
+    task_path = os.path.join(production_folder, "Chara", "hero", "Modeling", "Low")
+    os.makedirs(task_path, exist_ok=True)
+
+    names = set()
+    for i in range(count):
+        name = f"hero_Low_v{i:05d}.blend"
+        with open(os.path.join(task_path, name), "wb"):
+            pass
+        names.add(name)
+
+    # Half of the files also exist on the server
+    server_names = {name for i, name in enumerate(sorted(names)) if i % 2 == 0}
+    return AssetManager(context), names, server_names
+
+
+def bench_per_row(asset_manager, local_names):
+    start = time.perf_counter()
+    for name in local_names:
+        asset_manager.get_advanced_file_status("Chara", "hero", "Modeling", "Low", name)
+    return time.perf_counter() - start
+
+
+def bench_batch(asset_manager, local_names, server_names):
+    start = time.perf_counter()
+    asset_manager.get_file_column_status("Chara", "hero", "Modeling", "Low", local_names, server_names)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'rows':>8} {'per-row (s)':>12} {'batch (s)':>10} {'batch us/row':>13}")
+    for count in ROW_COUNTS:
+        with tempfile.TemporaryDirectory() as root:
+            asset_manager, local_names, server_names = build_task_folder(root, count)
+
+            per_row = bench_per_row(asset_manager, local_names) if count <= PER_ROW_LIMIT else None
+            batch = bench_batch(asset_manager, local_names, server_names)
+
+            per_row_label = f"{per_row:12.3f}" if per_row is not None else f"{'skipped':>12}"
+            print(f"{count:>8} {per_row_label} {batch:10.4f} {batch / count * 1e6:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
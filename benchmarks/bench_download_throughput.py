@@ -0,0 +1,176 @@
+"""
+Download throughput benchmark
+
+Serves a large file over the loopback interface with the previous
+implementation (Starlette FileResponse) and with FileStreamResponse, and
+downloads it with requests. Also compares SHA-256 hashing with buffered
+reads against the mmap hashing used by /hash.
+
+Needs the server dependencies (fastapi, uvicorn, requests), plus granian or
+hypercorn to benchmark those servers. uvicorn and hypercorn offer no
+zero-copy extension (chunked reads are used), granian offers
+"http.response.pathsend".
+
+Usage (from the repository root):
+    python benchmarks/bench_download_throughput.py [--size-mb 1024] [--runs 3]
+        [--server uvicorn|granian|hypercorn]
+"""
+
+import argparse
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+import requests  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Header  # noqa: E402
+from fastapi.responses import FileResponse  # noqa: E402
+from file_transfer import FileStreamResponse, file_hash, _hash_cache  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def make_file(folder, size_mb):
+    path = os.path.join(folder, "payload.bin")
+    block = os.urandom(MB)
+    with open(path, "wb") as file:
+        for _ in range(size_mb):
+            file.write(block)
+    return path
+
+
+def make_app(path):
+    app = FastAPI()
+
+    @app.get("/old")
+    def old_download():
+        return FileResponse(path=path, filename="payload.bin", media_type="application/octet-stream")
+
+    @app.get("/new")
+    def new_download(range_header: str = Header(None, alias="Range")):
+        return FileStreamResponse(path, "payload.bin", range_header=range_header)
+
+    return app
+
+
+def create_app():
+    """App factory for servers started in a subprocess (file from BENCH_FILE)."""
+    return make_app(os.environ["BENCH_FILE"])
+
+
+def start_server(server_name, path, port):
+    """
+    Start the benchmark server.
+
+    Returns:
+        callable: Stops the server
+    """
+    if server_name == "uvicorn":
+        server = uvicorn.Server(uvicorn.Config(make_app(path), host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        def stop():
+            server.should_exit = True
+            thread.join()
+        return stop
+
+    commands = {
+        "granian": ["-m", "granian", "--interface", "asgi", "--host", "127.0.0.1", "--port", str(port),
+                    "--log-level", "warning", "--factory", "bench_download_throughput:create_app"],
+        "hypercorn": ["-m", "hypercorn", "--bind", f"127.0.0.1:{port}", "bench_download_throughput:create_app()"],
+    }
+    env = dict(os.environ, BENCH_FILE=path,
+               PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)),
+                                                       os.environ.get("PYTHONPATH")])))
+    process = subprocess.Popen([sys.executable, *commands[server_name]], env=env)
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"{server_name} did not start")
+            time.sleep(0.1)
+
+    def stop():
+        process.terminate()
+        process.wait()
+    return stop
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def download(url):
+    received = 0
+    start = time.perf_counter()
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(MB):
+            received += len(chunk)
+    return received, time.perf_counter() - start
+
+
+def hash_buffered(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(64 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--server", choices=("uvicorn", "granian", "hypercorn"), default="uvicorn")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = make_file(folder, args.size_mb)
+        port = free_port()
+        stop_server = start_server(args.server, path, port)
+
+        print(f"Server: {args.server}, file: {args.size_mb} MiB, runs: {args.runs}")
+        for name in ("old", "new"):
+            speeds = []
+            for _ in range(args.runs):
+                received, elapsed = download(f"http://127.0.0.1:{port}/{name}")
+                assert received == args.size_mb * MB
+                speeds.append(received / MB / elapsed)
+            print(f"download {name}: best {max(speeds):8.1f} MiB/s, mean {sum(speeds) / len(speeds):8.1f} MiB/s")
+
+        stop_server()
+
+        start = time.perf_counter()
+        buffered = hash_buffered(path)
+        buffered_time = time.perf_counter() - start
+        _hash_cache.clear()
+        start = time.perf_counter()
+        mapped, _ = file_hash(path)
+        mapped_time = time.perf_counter() - start
+        start = time.perf_counter()
+        file_hash(path)
+        cached_time = time.perf_counter() - start
+        assert buffered == mapped
+        print(f"sha256 buffered reads: {args.size_mb / buffered_time:8.1f} MiB/s")
+        print(f"sha256 mmap:           {args.size_mb / mapped_time:8.1f} MiB/s")
+        print(f"sha256 cached:         {cached_time * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
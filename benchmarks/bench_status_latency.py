@@ -0,0 +1,72 @@
+"""
+/status serialization latency benchmark
+
+p50/p99 time to turn the /status payload of a ~100k node project into
+response bytes:
+- before: FastAPI default path, jsonable_encoder + stdlib json (when FastAPI
+  is importable, otherwise stdlib json alone, a lower bound)
+- after: FastJSONResponse rendering (orjson when installed)
+
+Usage (from the repository root):
+    python benchmarks/bench_status_latency.py
+"""
+
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "server"))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_status_wire import synthetic_walk  # noqa: E402
+from tree_encoding import encode_list, encode_columnar  # noqa: E402
+import responses  # noqa: E402
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None
+
+RUNS = 30
+
+
+def render_before(content):
+    if jsonable_encoder is not None:
+        content = jsonable_encoder(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def render_after(content):
+    return responses.dump_json(content)
+
+
+def percentiles(render, content):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        render(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def main():
+    payloads = {
+        "list": {"tree": encode_list(synthetic_walk())},
+        "columnar": encode_columnar(synthetic_walk()),
+    }
+    print(f"Nodes: {len(payloads['list']['tree'])}, runs: {RUNS}")
+    print(f"before: {'jsonable_encoder + ' if jsonable_encoder else ''}stdlib json")
+    print(f"after:  {'orjson' if responses.orjson is not None else 'stdlib json (orjson not installed)'}")
+    print(f"{'format':<10} {'path':<8} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, content in payloads.items():
+        assert json.loads(render_before(content)) == json.loads(render_after(content))
+        for label, render in (("before", render_before), ("after", render_after)):
+            p50, p99 = percentiles(render, content)
+            print(f"{name:<10} {label:<8} {p50:>9.1f} {p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+/status wire size benchmark
+
+Measures the bytes sent for the /status tree of a large synthetic project:
+historic list format vs columnar format, uncompressed, gzip and zstd (when
+the optional `zstandard` package is installed), with the same encoders the
+server uses.
+
+Usage (from the repository root):
+    python benchmarks/bench_status_wire.py
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+from http_compression import available_encodings, compress_body  # noqa: E402
+from tree_encoding import encode_list, encode_columnar, decode_columnar  # noqa: E402
+
+ASSET_TYPES = ["Chara", "Env", "Props", "Items", "Modules", "FX"]
+ASSETS_PER_TYPE = 100
+DEPARTMENTS = ["Modeling", "Rigging", "Surfacing", "Lookdev", "Animation"]
+TASKS = ["Low", "High", "Retopo"]
+VERSIONS_PER_TASK = 10
+
+
+def synthetic_walk():
+    """os.walk-like (relative_root, dirs, files) of a ~100k entries project."""
+    yield "", list(ASSET_TYPES), []
+    for asset_type in ASSET_TYPES:
+        assets = [f"{asset_type.lower()}_asset_{i:03d}" for i in range(ASSETS_PER_TYPE)]
+        yield asset_type, assets, []
+        for asset in assets:
+            yield f"{asset_type}/{asset}", list(DEPARTMENTS), []
+            for department in DEPARTMENTS:
+                yield f"{asset_type}/{asset}/{department}", list(TASKS), []
+                for task in TASKS:
+                    files = [f"{asset}_{task}_v{v:03d}.blend" for v in range(1, VERSIONS_PER_TASK + 1)]
+                    files.append(f"{asset}_{task}_master.blend")
+                    yield f"{asset_type}/{asset}/{department}/{task}", [], files
+
+
+def dumps(payload):
+    # Same settings as FastAPI's JSONResponse
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def main():
+    list_payload = {"tree": encode_list(synthetic_walk())}
+    columnar_payload = encode_columnar(synthetic_walk())
+    assert decode_columnar(columnar_payload) == list_payload["tree"]
+    entries = len(list_payload["tree"])
+
+    print(f"Synthetic project: {entries} entries")
+    print(f"{'format':<10} {'encoding':<10} {'bytes':>12} {'ratio':>8} {'encode ms':>10}")
+    baseline = None
+    for name, payload in (("list", list_payload), ("columnar", columnar_payload)):
+        body = dumps(payload)
+        if baseline is None:
+            baseline = len(body)
+        print(f"{name:<10} {'identity':<10} {len(body):>12} {len(body) / baseline:>8.3f} {'':>10}")
+        for encoding in reversed(available_encodings()):
+            start = time.perf_counter()
+            compressed = compress_body(body, encoding)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name:<10} {encoding:<10} {len(compressed):>12} {len(compressed) / baseline:>8.3f} {elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
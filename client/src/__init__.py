@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Code shared with the server lives in <repository>/shared
+_repository = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _repository not in sys.path:
+    sys.path.insert(0, _repository)
@@ -0,0 +1,214 @@
+"""
+Change Channels Module
+
+Push channels delivering server change events to the Sparkle client.
+
+Features:
+- WebSocket channel on /ws/{project} using the Qt event loop (no extra thread)
+- Server-Sent Events channel on /events/{project} for proxies blocking WebSockets
+- Resume from the last received event id, missed events are replayed by the server
+- Watchdogs on both channels: a silent stream (half-open socket) is dropped
+- Uniform signals so ConnectionManager can swap channels transparently
+"""
+
+import json
+from urllib.parse import quote
+from PySide6.QtCore import QObject, Signal, QUrl, QUrlQuery, QTimer
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+from PySide6.QtWebSockets import QWebSocket
+
+
+class WebSocketChannel(QObject):
+    """
+    Change stream over a WebSocket.
+
+    Emits every change event pushed by the server for one project.
+    The server pings an idle socket every 30 seconds, a socket silent for
+    longer is considered half-open (server crash, network unplugged) and
+    dropped.
+    """
+
+    # Signals
+    event_received = Signal(dict)  # Stream event (hello, created, deleted, uploaded, resync)
+    state_changed = Signal(bool)   # True = stream live, False = stream dropped
+
+    name = "websocket"
+
+    def __init__(self):
+        """Initialize the channel with a closed socket."""
+        super().__init__()
+        self.is_open = False
+        self.socket = QWebSocket()
+        self.socket.connected.connect(self._on_connected)
+        self.socket.disconnected.connect(self._on_disconnected)
+        self.socket.textMessageReceived.connect(self._on_message)
+
+        # Watchdog: no message (not even a ping) for 75 seconds means the socket is dead
+        self.watchdog = QTimer()
+        self.watchdog.setSingleShot(True)
+        self.watchdog.setInterval(75000)
+        self.watchdog.timeout.connect(self._on_stalled)
+
+    def open(self, server_url, project_name, last_event_id=None):
+        """
+        Open the change stream of a project.
+
+        Args:
+            server_url (str): HTTP server URL (e.g. "http://192.168.1.100:8000")
+            project_name (str): Name of the project to follow
+            last_event_id (str): Id of the last event received, to get the
+                missed ones replayed (optional)
+        """
+        ws_url = server_url.replace("http", "ws", 1).rstrip("/")
+        url = QUrl(f"{ws_url}/ws/{quote(project_name)}")
+        if last_event_id:
+            query = QUrlQuery()
+            query.addQueryItem("since", last_event_id)
+            url.setQuery(query)
+        self.socket.open(url)
+
+    def close(self):
+        """Close the change stream."""
+        self.watchdog.stop()
+        self.socket.close()
+
+    def _on_connected(self):
+        self.is_open = True
+        self.watchdog.start()
+        self.state_changed.emit(True)
+
+    def _on_disconnected(self):
+        # Also emitted for failed connection attempts so the caller can retry
+        self.watchdog.stop()
+        self.is_open = False
+        self.state_changed.emit(False)
+
+    def _on_stalled(self):
+        # A half-open socket never completes a close handshake: abort it
+        print("WARNING: Change stream (websocket) stalled, dropping it")
+        self.socket.abort()
+        if self.is_open:
+            self._on_disconnected()
+
+    def _on_message(self, message):
+        self.watchdog.start()
+        try:
+            event = json.loads(message)
+        except ValueError:
+            print(f"WARNING: Invalid change event: {message}")
+            return
+        if event.get("type") != "ping":
+            self.event_received.emit(event)
+
+
+class SSEChannel(QObject):
+    """
+    Change stream over Server-Sent Events.
+
+    Plain streamed HTTP GET, goes through proxies that break WebSockets.
+    The server sends a comment every 15 seconds, a silent stream is
+    considered dead and dropped.
+    """
+
+    # Signals
+    event_received = Signal(dict)  # Stream event (hello, created, deleted, uploaded, resync)
+    state_changed = Signal(bool)   # True = stream live, False = stream dropped
+
+    name = "sse"
+
+    def __init__(self):
+        """Initialize the channel without any pending request."""
+        super().__init__()
+        self.is_open = False
+        self.network = QNetworkAccessManager(self)
+        self.reply = None
+        self._buffer = b""
+        self._data_lines = []
+
+        # Watchdog: no byte for 45 seconds means the stream is stalled
+        self.watchdog = QTimer()
+        self.watchdog.setSingleShot(True)
+        self.watchdog.setInterval(45000)
+        self.watchdog.timeout.connect(self._on_stalled)
+
+    def open(self, server_url, project_name, last_event_id=None):
+        """
+        Open the change stream of a project.
+
+        Args:
+            server_url (str): HTTP server URL (e.g. "http://192.168.1.100:8000")
+            project_name (str): Name of the project to follow
+            last_event_id (str): Id of the last event received, to get the
+                missed ones replayed (optional)
+        """
+        self._abort_reply()
+        request = QNetworkRequest(QUrl(f"{server_url.rstrip('/')}/events/{quote(project_name)}"))
+        request.setRawHeader(b"Accept", b"text/event-stream")
+        request.setRawHeader(b"Cache-Control", b"no-cache")
+        if last_event_id:
+            request.setRawHeader(b"Last-Event-ID", last_event_id.encode())
+
+        self._buffer = b""
+        self._data_lines = []
+        self.reply = self.network.get(request)
+        self.reply.readyRead.connect(self._on_ready_read)
+        self.reply.finished.connect(self._on_finished)
+        self.watchdog.start()
+
+    def close(self):
+        """Close the change stream."""
+        self._abort_reply()
+        self._set_open(False)
+
+    def _abort_reply(self):
+        self.watchdog.stop()
+        if self.reply is not None:
+            reply = self.reply
+            self.reply = None
+            reply.readyRead.disconnect(self._on_ready_read)
+            reply.finished.disconnect(self._on_finished)
+            reply.abort()
+            reply.deleteLater()
+
+    def _set_open(self, is_open):
+        if self.is_open != is_open:
+            self.is_open = is_open
+            self.state_changed.emit(is_open)
+
+    def _on_ready_read(self):
+        self.watchdog.start()
+        self._buffer += bytes(self.reply.readAll())
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            self._on_line(line.rstrip(b"\r").decode("utf-8", "replace"))
+
+    def _on_line(self, line):
+        # An empty line dispatches the event, ':' starts a comment (keep-alive)
+        if not line:
+            if self._data_lines:
+                self._on_message("\n".join(self._data_lines))
+            self._data_lines = []
+        elif line.startswith("data:"):
+            self._data_lines.append(line[5:].lstrip(" "))
+
+    def _on_message(self, message):
+        try:
+            event = json.loads(message)
+        except ValueError:
+            print(f"WARNING: Invalid change event: {message}")
+            return
+        if event.get("type") == "hello":
+            self._set_open(True)
+        self.event_received.emit(event)
+
+    def _on_stalled(self):
+        print("WARNING: Change stream (sse) stalled, dropping it")
+        self._on_finished()
+
+    def _on_finished(self):
+        # Also reached for refused or failed requests so the caller can retry
+        self._abort_reply()
+        if self.is_open:
+            self._set_open(False)
+        else:
+            self.state_changed.emit(False)
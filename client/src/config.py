@@ -1,36 +1,102 @@
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
 
 class configSparkle():
+    # Parsed config shared by every instance, reloaded only when the file changes
+    RELOAD_CHECK_INTERVAL = 1.0  # seconds between two mtime checks
+
+    _data = None
+    _loaded_path = None
+    _loaded_state = None
+    _checked_at = 0.0
+    _sparkle_folder = None
+    _listeners = []
+    _lock = threading.Lock()
+
     def __init__(self):
-                
-        self.sparkle_folder = Path.home() / "Documents" / "Sparkle"
-        self.sparkle_folder.mkdir(parents=True, exist_ok=True)
+
+        # Paths are resolved (and the folder created) once per process
+        if configSparkle._sparkle_folder is None:
+            sparkle_folder = Path.home() / "Documents" / "Sparkle"
+            sparkle_folder.mkdir(parents=True, exist_ok=True)
+            configSparkle._sparkle_folder = sparkle_folder
+
+        self.sparkle_folder = configSparkle._sparkle_folder
 
         self.config_path = self.sparkle_folder / "config.json"
 
         self.default_config = {
-            "projects_folder": str(Path.home() / "Documents" / "Sparkle"),
+            "projects_folder": str(self.sparkle_folder),
             "version": "1.0.0"
         }
 
     def load_config(self):
-        if os.path.exists(self.config_path):
+        """
+        Return the config, parsed from config.json only when it changed on disk.
+
+        The file mtime is checked at most once per RELOAD_CHECK_INTERVAL, so
+        calling this in hot paths costs a dict copy.
+        """
+        cls = configSparkle
+        changed = False
+        with cls._lock:
+            now = time.monotonic()
+            if cls._data is None or cls._loaded_path != self.config_path or now - cls._checked_at >= cls.RELOAD_CHECK_INTERVAL:
+                cls._checked_at = now
+                state = self._file_state()
+                if cls._data is None or cls._loaded_path != self.config_path or state != cls._loaded_state:
+                    changed = cls._data is not None and cls._loaded_path == self.config_path
+                    cls._data = self._read_config() if state else dict(self.default_config)
+                    cls._loaded_path = self.config_path
+                    cls._loaded_state = state
+            config = dict(cls._data)
+
+        if changed:
+            # Edited by another process (or by hand)
+            self._notify(config)
+        return config
+
+    def _file_state(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_config(self):
+        try:
             with open(self.config_path, "r") as file:
-                config = json.load(file)
-                return config
-        else:
-            config = self.default_config
-            return config
-        
+                return json.load(file)
+        except ValueError:
+            # Half-written by an old client: keep the previous values
+            print(f"WARNING: Invalid config file: {self.config_path}")
+            return dict(configSparkle._data or self.default_config)
+
+    @classmethod
+    def add_listener(cls, callback):
+        """Call callback(config) whenever the config is saved or changed on disk."""
+        if callback not in cls._listeners:
+            cls._listeners.append(callback)
+
+    @classmethod
+    def remove_listener(cls, callback):
+        if callback in cls._listeners:
+            cls._listeners.remove(callback)
+
+    def _notify(self, config):
+        for callback in list(configSparkle._listeners):
+            callback(dict(config))
+
     def update_active_project(self, project_path):
-        
+
         current_config = self.load_config()
-        
+
         current_config["project_active_folder"] = project_path
-        
+
         self.save_config(current_config)
 
     def uptdate_url(self, server_url):
@@ -50,6 +116,18 @@ class configSparkle():
         self.save_config(current_config)
 
     def save_config(self, config_data):
+        """Write config.json atomically (temp file + rename) and update the shared copy."""
         json_str = json.dumps(config_data, indent=4)
-        with open (self.config_path, "w") as file:
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+        with open(tmp_path, "w") as file:
             file.write(json_str)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.config_path)
+
+        with configSparkle._lock:
+            configSparkle._data = dict(config_data)
+            configSparkle._loaded_path = self.config_path
+            configSparkle._loaded_state = self._file_state()
+            configSparkle._checked_at = time.monotonic()
+        self._notify(config_data)
@@ -7,14 +7,33 @@ Provides automatic server detection, fallback to local mode, and connection moni
 Features:
 - Automatic server availability detection
 - Graceful fallback to local mode when server unavailable
-- Periodic connection health checks
-- Signal-based connection state notifications
+- Liveness inferred from regular traffic, non-blocking health probes only when idle
+- Exponential probe backoff while offline
+- Debounced signal-based connection state notifications
 - Request management with timeout handling
+- Server push of change events (WebSocket, or SSE behind proxies) with
+  automatic reconnection and resume from the last received event, also when
+  switching back to a previously followed project
+- Streamed file transfers under the shared transfer rate limit
+- Large downloads split into byte ranges fetched in parallel over pooled
+  connections and verified against the server hash
 """
 
 import requests
+import hashlib
 import os
-from PySide6.QtCore import QObject, Signal, QTimer
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from PySide6.QtCore import QObject, Signal, QTimer, QUrl
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from src.change_channels import WebSocketChannel, SSEChannel
+from src.rate_limiter import transfer_limiter
+
+# Temporary files of the downloads of a project, next to its 02_Production
+DOWNLOADS_FOLDER = ".sparkle_downloads"
 
 
 class ConnectionManager(QObject):
@@ -27,21 +46,69 @@ class ConnectionManager(QObject):
     
     # Signals for connection state notifications
     connection_changed = Signal(bool)  # True = connected, False = disconnected
+    change_received = Signal(dict)     # Server change event (created, deleted, uploaded)
+    push_changed = Signal(bool)        # True = change stream live, False = polling needed
+    _request_failed = Signal()         # Network failure of a request, from any thread
+
+    # Health probe tuning (seconds)
+    PROBE_TIMEOUT = 2
+    MIN_BACKOFF = 1
+    MAX_BACKOFF = 60
+    FAILURES_TO_DISCONNECT = 2
+
+    # File transfer tuning (bytes)
+    TRANSFER_CHUNK_SIZE = 1024 * 1024
+    PARALLEL_MIN_SIZE = 64 * 1024 * 1024   # Smaller files use a single stream
+    PARALLEL_MIN_PART = 16 * 1024 * 1024
+    PARALLEL_STREAMS = 4
     
     def __init__(self):
         """
         Initialize the connection manager.
         
-        Sets up connection state tracking and periodic health check timer.
+        Sets up connection state tracking and the health check timer.
         """
         super().__init__()
         self.server_url = ""
         self.is_connected = False
-        self.last_check_failed = False
-        
-        # Timer for periodic connection health checks
+        self.state_known = False  # False until the first check answered
+
+        # Liveness tracking: any successful exchange with the server counts
+        self.last_success = 0.0   # time.monotonic() of the last successful exchange
+        self.last_contact = 0.0   # time.time() of the same, server state seen up to then
+        self.failure_count = 0    # Consecutive failed probes/requests
+        self.backoff = self.MIN_BACKOFF
+        self.check_interval = 30
+        self.auto_check = False
+
+        # Non-blocking health probe
+        self.network = QNetworkAccessManager(self)
+        self.probe_reply = None
+        self._request_failed.connect(self._on_request_failed)
+
+        # Pooled connections for parallel range downloads (created on first use)
+        self.transfer_session = None
+
+        # Single-shot timer rescheduled after every check (idle interval or backoff)
         self.connection_timer = QTimer()
-        self.connection_timer.timeout.connect(self.check_connection)
+        self.connection_timer.setSingleShot(True)
+        self.connection_timer.timeout.connect(self._on_check_timer)
+
+        # Server push (change stream) state
+        # Channels by preference, the next one is tried when a channel never comes up
+        self.channel_types = [WebSocketChannel, SSEChannel]
+        self.channel_index = 0
+        self.channel_failures = 0
+        self.channel_was_live = False
+        self.change_channel = None
+        self.change_project = ""
+        self.last_event_id = None
+        self.event_positions = {}  # Project name -> last event id, for projects followed earlier
+        self.stream_resumed = False
+        self.push_active = False
+        self.push_retry_timer = QTimer()
+        self.push_retry_timer.setSingleShot(True)
+        self.push_retry_timer.timeout.connect(self._open_change_channel)
         
     def set_server_url(self, url):
         """
@@ -51,39 +118,103 @@ class ConnectionManager(QObject):
             url (str): Server URL to connect to
         """
         self.server_url = url
+        self.failure_count = 0
+        self.backoff = self.MIN_BACKOFF
         self.check_connection()
         
     def check_connection(self):
         """
-        Check if the server is accessible.
+        Start a health probe of the server.
         
-        Performs a health check request to the server and updates connection state.
-        Falls back to local mode if server is not reachable.
+        The probe runs on the Qt event loop and never blocks the UI: the
+        connection state is updated (and connection_changed emitted) when the
+        answer arrives. Falls back to local mode if the server keeps failing.
         
         Returns:
-            bool: True if server is accessible, False otherwise
+            bool: Current connection state (before the probe answers)
         """
         if not self.server_url:
             print("WARNING: No server URL configured")
             self._set_connection_state(False)
             return False
-            
-        print(f"INFO: Testing connection to: {self.server_url}/health")
-        try:
-            response = requests.get(f"{self.server_url}/health", timeout=2)
-            print(f"INFO: Server response: status={response.status_code}")
-            
-            if response.status_code == 200:
-                self._set_connection_state(True)
-                return True
-            else:
+
+        if self.probe_reply is None:
+            request = QNetworkRequest(QUrl(f"{self.server_url}/health"))
+            request.setTransferTimeout(self.PROBE_TIMEOUT * 1000)
+            self.probe_reply = self.network.get(request)
+            self.probe_reply.finished.connect(self._on_probe_finished)
+        return self.is_connected
+
+    def _on_probe_finished(self):
+        """Apply the result of the health probe and schedule the next check."""
+        reply = self.probe_reply
+        self.probe_reply = None
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        error = reply.error()
+        error_text = reply.errorString()
+        reply.deleteLater()
+
+        if error == QNetworkReply.NoError and status == 200:
+            self._record_success()
+            self._set_connection_state(True)
+        else:
+            if self.is_connected or self.failure_count == 0:
+                print(f"WARNING: Connection failed: {error_text}")
+            self._record_failure()
+        self._schedule_check()
+
+    def _record_success(self):
+        """Note a successful exchange with the server (safe from any thread)."""
+        self.last_success = time.monotonic()
+        self.last_contact = time.time()
+        self.failure_count = 0
+        self.backoff = self.MIN_BACKOFF
+
+    def _record_failure(self):
+        """
+        Count a failed probe or request.
+
+        A single failure doesn't drop the connection, only FAILURES_TO_DISCONNECT
+        in a row do. While offline each failure doubles the probe backoff.
+        """
+        self.failure_count += 1
+        if self.is_connected:
+            if self.failure_count >= self.FAILURES_TO_DISCONNECT:
                 self._set_connection_state(False)
-                return False
-                
-        except Exception as e:
-            print(f"WARNING: Connection failed: {e}")
+        else:
             self._set_connection_state(False)
-            return False
+            self.backoff = min(self.backoff * 2, self.MAX_BACKOFF)
+
+    def _on_request_failed(self):
+        """A regular request failed: confirm with a probe instead of guessing."""
+        if self.is_connected:
+            self.check_connection()
+
+    def _schedule_check(self):
+        """Schedule the next health check according to the connection state."""
+        if not self.auto_check:
+            return
+        if self.is_connected and self.failure_count == 0:
+            delay = self.check_interval
+        elif self.is_connected:
+            # Suspicious failure: confirm quickly before switching to local mode
+            delay = self.MIN_BACKOFF
+        else:
+            delay = self.backoff
+        self.connection_timer.start(int(delay * 1000))
+
+    def _on_check_timer(self):
+        """Probe the server unless recent traffic already proved it alive."""
+        if self.is_connected and self.failure_count == 0:
+            if self.push_active:
+                # Live stream: its pings prove the server alive, a silent one
+                # is dropped by the channel watchdog (then probed below)
+                self._record_success()
+            idle = time.monotonic() - self.last_success
+            if idle < self.check_interval:
+                self.connection_timer.start(int((self.check_interval - idle) * 1000))
+                return
+        self.check_connection()
     
     def _set_connection_state(self, connected):
         """
@@ -92,15 +223,28 @@ class ConnectionManager(QObject):
         Args:
             connected (bool): New connection state
         """
-        if self.is_connected != connected:
+        if self.is_connected != connected or not self.state_known:
+            self.state_known = True
             self.is_connected = connected
             self.connection_changed.emit(connected)
             
             if connected:
                 print("SUCCESS: Server connected - Collaborative mode activated")
+                self._open_change_channel()
             else:
                 print("INFO: Server disconnected - Local mode activated")
+                self._close_change_channel()
     
+    def _on_network_error(self, error):
+        """
+        Report a request exception to the liveness tracking.
+
+        Args:
+            error (Exception): Exception raised by requests
+        """
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            self._request_failed.emit()
+
     def make_request(self, endpoint, timeout=3):
         """
         Make a server request only if connected.
@@ -120,14 +264,14 @@ class ConnectionManager(QObject):
             
         try:
             response = requests.get(f"{self.server_url}{endpoint}", timeout=timeout)
+            self._record_success()
             if response.status_code == 200:
                 return response.json()
             else:
                 return None
         except Exception as e:
             print(f"ERROR: Request failed for {endpoint}: {e}")
-            # Re-check connection on request failure
-            self.check_connection()
+            self._on_network_error(e)
             return None
     
     def make_post_request(self, endpoint, data=None, timeout=3):
@@ -149,6 +293,7 @@ class ConnectionManager(QObject):
             
         try:
             response = requests.post(f"{self.server_url}{endpoint}", json=data, timeout=timeout)
+            self._record_success()
             if response.status_code == 200:
                 return response.json()
             else:
@@ -156,62 +301,414 @@ class ConnectionManager(QObject):
                 return None
         except Exception as e:
             print(f"ERROR: POST request failed for {endpoint}: {e}")
-            # Re-check connection on request failure
-            self.check_connection()
+            self._on_network_error(e)
+            return None
+    
+    def make_delete_request(self, endpoint, timeout=10):
+        """
+        Make a DELETE request to the server only if connected.
+        
+        Args:
+            endpoint (str): API endpoint to request (e.g., "/delete/project/Chara/hero")
+            timeout (int): Request timeout in seconds
+            
+        Returns:
+            dict or None: JSON response data if successful, None if failed
+        """
+        if not self.is_connected:
+            return None
+            
+        try:
+            response = requests.delete(f"{self.server_url}{endpoint}", timeout=timeout)
+            self._record_success()
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"WARNING: DELETE request failed with status {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"ERROR: DELETE request failed for {endpoint}: {e}")
+            self._on_network_error(e)
             return None
     
     def start_auto_check(self, interval_seconds=30):
         """
         Start automatic connection health checks.
         
+        While connected the server is only probed after interval_seconds
+        without any successful traffic; while offline probes back off from
+        MIN_BACKOFF to MAX_BACKOFF seconds.
+        
         Args:
-            interval_seconds (int): Check interval in seconds
+            interval_seconds (int): Idle interval in seconds before a probe
         """
-        self.connection_timer.setInterval(interval_seconds * 1000)
-        self.connection_timer.start()
+        self.check_interval = interval_seconds
+        self.auto_check = True
+        self._schedule_check()
         print(f"INFO: Auto connection check started (interval: {interval_seconds}s)")
         
     def stop_auto_check(self):
         """Stop automatic connection health checks."""
+        self.auto_check = False
         self.connection_timer.stop()
         print("INFO: Auto connection check stopped")
     
-    def download_file_from_server(self, endpoint, local_path):
+    # =============================================================================
+    # SERVER PUSH (CHANGE STREAM)
+    # =============================================================================
+
+    def start_change_stream(self, project_name):
+        """
+        Follow the change events of a project.
+
+        The stream is opened whenever the server is connected and reopened
+        automatically after a drop; push_changed reports when it is live.
+
+        Args:
+            project_name (str): Name of the project to follow
+        """
+        if project_name == self.change_project:
+            return
+        self._close_change_channel()
+        self._remember_event_position()
+        self.change_project = project_name
+        # Back to a project followed earlier: the events missed meanwhile are replayed
+        self.last_event_id = self.event_positions.pop(project_name, None)
+        self._open_change_channel()
+
+    def stop_change_stream(self):
+        """Stop following change events."""
+        self._remember_event_position()
+        self.change_project = ""
+        self.last_event_id = None
+        self._close_change_channel()
+
+    def _remember_event_position(self):
+        """Keep the stream position of the followed project for a later switch back."""
+        if self.change_project and self.last_event_id is not None:
+            self.event_positions[self.change_project] = self.last_event_id
+
+    def _open_change_channel(self):
+        """Open the change channel if a project is followed and the server is up."""
+        if not self.change_project or not self.is_connected or not self.server_url:
+            return
+
+        if self.change_channel is None:
+            self.change_channel = self.channel_types[self.channel_index]()
+            self.change_channel.event_received.connect(self._on_change_event)
+            self.change_channel.state_changed.connect(self._on_change_channel_state)
+
+        # With a known event id the server replays what was missed (or asks for a rescan)
+        self.stream_resumed = self.last_event_id is not None
+        self.channel_was_live = False
+        print(f"INFO: Opening change stream for '{self.change_project}' ({self.change_channel.name})")
+        self.change_channel.open(self.server_url, self.change_project, self.last_event_id)
+
+    def _close_change_channel(self):
+        """Close the change channel without scheduling a reconnection."""
+        self.push_retry_timer.stop()
+        self._discard_change_channel()
+        self._set_push_state(False)
+
+    def _discard_change_channel(self):
+        """Disconnect and close the current channel object."""
+        if self.change_channel is not None:
+            channel = self.change_channel
+            self.change_channel = None
+            channel.state_changed.disconnect(self._on_change_channel_state)
+            channel.event_received.disconnect(self._on_change_event)
+            channel.close()
+
+    def _on_change_channel_state(self, live):
+        """
+        Track the change channel state and retry when it drops.
+
+        A channel failing twice without ever coming up (e.g. WebSocket upgrade
+        refused by a proxy) is replaced by the next channel type.
+
+        Args:
+            live (bool): True if the stream is open
+        """
+        was_live = self.push_active
+        self._set_push_state(live)
+        if live:
+            self._record_success()
+            self.channel_was_live = True
+            self.channel_failures = 0
+            return
+
+        if was_live and self.is_connected:
+            # A live stream dropping may mean the server is gone: confirm now
+            self.check_connection()
+
+        if not self.channel_was_live:
+            self.channel_failures += 1
+            if self.channel_failures >= 2:
+                self.channel_failures = 0
+                self._discard_change_channel()
+                self.channel_index = (self.channel_index + 1) % len(self.channel_types)
+                print(f"INFO: Change stream falling back to {self.channel_types[self.channel_index].name}")
+
+        if self.change_project and self.is_connected:
+            self.push_retry_timer.start(5000)
+
+    def _set_push_state(self, live):
+        """
+        Update push state and emit signal if state changed.
+
+        Args:
+            live (bool): New push state
+        """
+        if self.push_active != live:
+            self.push_active = live
+            self.push_changed.emit(live)
+            if live:
+                print("INFO: Change stream live - Polling suspended")
+            else:
+                print("INFO: Change stream down - Polling fallback")
+
+    def _on_change_event(self, event):
+        """
+        Forward a server change event.
+
+        A "resync" event means the missed events are gone from the server
+        journal: it has an empty path so receivers rescan the whole project.
+
+        Args:
+            event (dict): Event with 'id', 'type', 'path' and 'kind'
+        """
+        self._record_success()
+        event_type = event.get("type")
+        if event_type == "hello":
+            # Start point of a fresh stream, a resumed one keeps its own position
+            if self.last_event_id is None:
+                self.last_event_id = event.get("id")
+            return
+
+        if event.get("id"):
+            self.last_event_id = event["id"]
+        if event_type in ("created", "deleted", "uploaded", "resync"):
+            self.change_received.emit(event)
+
+    def download_file_from_server(self, endpoint, local_path, hash_endpoint=None, parallel=True):
         """
         Download a file from server and save it locally.
-        
+
+        The file is streamed to a temporary file of its own (_partial_path)
+        under the transfer rate limit and moved into place once complete, so
+        an interrupted download never leaves a truncated file behind.
+
+        Files of at least PARALLEL_MIN_SIZE are fetched as PARALLEL_STREAMS
+        byte ranges at once over pooled connections, written into a
+        preallocated file and checked against the server SHA-256.
+
         Args:
             endpoint (str): Download endpoint (e.g., "/download/project/path/file.blend")
-            local_file_path (str): Where to save the file locally
-            
+            local_path (str): Where to save the file locally
+            hash_endpoint (str): Hash endpoint of the same file, required for
+                parallel downloads (e.g., "/hash/project/path/file.blend")
+            parallel (bool): Allow parallel range download of large files
+
         Returns:
             bool: True if successful, False otherwise
         """
         if not self.is_connected:
             return False
-            
+
+        partial_path = None
         try:
-            response = requests.get(f"{self.server_url}{endpoint}", timeout=30)
-            if response.status_code == 200:
-                # Create parent directories if needed
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                
-                # Write binary content to file
-                with open(local_path, 'wb') as f:
-                    f.write(response.content)
-                
-                print(f"INFO: Downloaded file to {local_path}")
-                return True
+            # Create parent directories if needed
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            partial_path = self._partial_path(local_path)
+
+            size = self._parallel_download_size(endpoint) if parallel and hash_endpoint else None
+            if size is not None:
+                try:
+                    downloaded = self._download_ranges(endpoint, partial_path, size)
+                except (requests.RequestException, OSError) as e:
+                    print(f"WARNING: Range request of {endpoint} failed: {e}")
+                    downloaded = False
+                if not downloaded:
+                    # e.g. a proxy refusing ranges: one plain stream may still go through
+                    print(f"WARNING: Parallel download of {endpoint} failed, retrying as a single stream")
+                    downloaded = self._download_single(endpoint, partial_path)
+                elif not self._verify_download(hash_endpoint, partial_path):
+                    print(f"WARNING: Parallel download of {endpoint} corrupted, retrying as a single stream")
+                    downloaded = self._download_single(endpoint, partial_path)
             else:
-                print(f"ERROR: Download failed, status: {response.status_code}")
+                downloaded = self._download_single(endpoint, partial_path)
+
+            if not downloaded:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
                 return False
+            os.replace(partial_path, local_path)
+
+            print(f"INFO: Downloaded file to {local_path}")
+            return True
         except Exception as e:
             print(f"ERROR: Download failed for {endpoint}: {e}")
+            if partial_path is not None and os.path.exists(partial_path):
+                os.remove(partial_path)
+            self._on_network_error(e)
             return False
-    
+
+    @staticmethod
+    def _partial_path(local_path):
+        """
+        Temporary file of one download.
+
+        Files of a project go to <project>/.sparkle_downloads, outside the
+        production tree (never shown in the file lists) and on the same file
+        system for the final move; a unique name per transfer keeps two
+        downloads of the same file apart.
+        """
+        folder = os.path.dirname(local_path)
+        for parent in Path(local_path).parents:
+            if parent.name == "02_Production":
+                folder = str(parent.parent / DOWNLOADS_FOLDER)
+                os.makedirs(folder, exist_ok=True)
+                break
+        return os.path.join(folder, f".{uuid.uuid4().hex}.part")
+
+    def _download_single(self, endpoint, partial_path):
+        """
+        Stream a whole file into partial_path.
+
+        Returns:
+            bool: True if the file was written
+        """
+        with requests.get(f"{self.server_url}{endpoint}", stream=True, timeout=30) as response:
+            self._record_success()
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code != 200 or content_type.startswith("application/json"):
+                # Missing files are reported as a JSON error body
+                print(f"ERROR: Download failed, status: {response.status_code}")
+                return False
+
+            # Stream binary content to the partial file
+            with open(partial_path, 'wb') as f:
+                for chunk in response.iter_content(self.TRANSFER_CHUNK_SIZE):
+                    transfer_limiter.consume(len(chunk))
+                    f.write(chunk)
+        return True
+
+    def _get_transfer_session(self):
+        """Session whose pool keeps one connection per parallel stream."""
+        if self.transfer_session is None:
+            self.transfer_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.PARALLEL_STREAMS)
+            self.transfer_session.mount("http://", adapter)
+            self.transfer_session.mount("https://", adapter)
+        return self.transfer_session
+
+    def _parallel_download_size(self, endpoint):
+        """
+        Size of the file if it is worth downloading in parallel ranges.
+
+        Returns:
+            int or None: File size, None for a single stream download
+        """
+        response = self._get_transfer_session().head(f"{self.server_url}{endpoint}", timeout=10)
+        self._record_success()
+        if response.status_code != 200 or response.headers.get("Accept-Ranges") != "bytes":
+            return None
+        size = int(response.headers.get("Content-Length", 0))
+        return size if size >= self.PARALLEL_MIN_SIZE else None
+
+    def _download_ranges(self, endpoint, partial_path, size):
+        """
+        Fetch a file as concurrent byte ranges into a preallocated file.
+
+        Returns:
+            bool: True if every range was written
+        """
+        streams = max(1, min(self.PARALLEL_STREAMS, size // self.PARALLEL_MIN_PART))
+        part_size = -(-size // streams)
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+        # Preallocate (sparse where the filesystem supports it) so every
+        # range is written at its own offset
+        with open(partial_path, 'wb') as f:
+            f.truncate(size)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            results = list(executor.map(lambda byte_range: self._download_range(endpoint, partial_path, *byte_range),
+                                        ranges))
+        self._record_success()
+        return all(results)
+
+    def _download_range(self, endpoint, partial_path, start, end):
+        """
+        Fetch bytes start-end (inclusive) into the same offsets of partial_path.
+
+        Returns:
+            bool: True if the whole range was written
+        """
+        headers = {"Range": f"bytes={start}-{end}"}
+        url = f"{self.server_url}{endpoint}"
+        with self._get_transfer_session().get(url, headers=headers, stream=True, timeout=30) as response:
+            if response.status_code != 206:
+                print(f"ERROR: Range {start}-{end} of {endpoint} failed, status: {response.status_code}")
+                return False
+            written = 0
+            with open(partial_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in response.iter_content(self.TRANSFER_CHUNK_SIZE):
+                    transfer_limiter.consume(len(chunk))
+                    f.write(chunk)
+                    written += len(chunk)
+        return written == end - start + 1
+
+    def _verify_download(self, hash_endpoint, partial_path):
+        """
+        Compare the SHA-256 of a downloaded file with the server's.
+
+        Returns:
+            bool: True if both hashes match
+        """
+        expected = self.make_request(hash_endpoint, timeout=120)
+        if not expected or "hash" not in expected:
+            print(f"WARNING: No server hash for {hash_endpoint}")
+            return False
+        return self._sha256(partial_path) == expected["hash"]
+
+    def matches_server_file(self, hash_endpoint, local_path):
+        """
+        Check that a local file holds the same data as its server copy.
+
+        Args:
+            hash_endpoint (str): Hash endpoint of the server file
+            local_path (str): Local file
+
+        Returns:
+            bool: True if sizes and SHA-256 match, False if they differ or
+                the server has no such file
+        """
+        expected = self.make_request(hash_endpoint, timeout=120)
+        if not expected or "hash" not in expected:
+            return False
+        try:
+            if expected.get("size") != os.path.getsize(local_path):
+                return False
+            return self._sha256(local_path) == expected["hash"]
+        except OSError:
+            return False
+
+    def _sha256(self, path):
+        """SHA-256 hex digest of a file."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(8 * self.TRANSFER_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     def upload_file_to_server(self, endpoint, local_file_path):
         """
         Upload a file from local to server.
+
+        The file is streamed as the raw request body under the transfer rate
+        limit, it is never loaded in memory.
         
         Args:
             endpoint (str): Upload endpoint (e.g., "/upload/project/path/file.blend")
@@ -228,10 +725,10 @@ class ConnectionManager(QObject):
             return False
             
         try:
-            # Open and send the file
+            # Open and stream the file
             with open(local_file_path, 'rb') as f:
-                files = {'file': f}
-                response = requests.post(f"{self.server_url}{endpoint}", files=files, timeout=60)
+                response = requests.put(f"{self.server_url}{endpoint}", data=self._read_chunks(f), timeout=60)
+            self._record_success()
             
             if response.status_code == 200:
                 print(f"INFO: Uploaded file from {local_file_path}")
@@ -241,8 +738,18 @@ class ConnectionManager(QObject):
                 return False
         except Exception as e:
             print(f"ERROR: Upload failed for {endpoint}: {e}")
+            self._on_network_error(e)
             return False
 
+    def _read_chunks(self, file):
+        """Yield a file in rate limited chunks (upload request body)."""
+        while True:
+            chunk = file.read(self.TRANSFER_CHUNK_SIZE)
+            if not chunk:
+                return
+            transfer_limiter.consume(len(chunk))
+            yield chunk
+
 
 # Global singleton instance
 connection_manager = ConnectionManager()
\ No newline at end of file
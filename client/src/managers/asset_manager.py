@@ -5,12 +5,14 @@ Handles all asset-related data operations including:
 - Loading assets from local and server sources
 - Asset data population and status detection
 - Asset hierarchy management
+- Server listings kept warm per project (LRU over the last projects), so
+  switching back to a project doesn't start cold
 """
 
 import os
 import time
+from collections import OrderedDict
 from datetime import datetime
-from src.config import configSparkle
 from src.connection_manager import connection_manager
 
 
@@ -21,19 +23,55 @@ class AssetManager:
     This class handles all backend operations related to assets,
     departments, tasks and their synchronization status.
     """
+
+    # Number of inactive projects whose listings stay in memory
+    WARM_PROJECT_COUNT = 4
     
-    def __init__(self, production_folder):
+    def __init__(self, context):
         """
-        Initialize AssetManager with production folder path.
+        Initialize AssetManager for a project.
         
         Args:
-            production_folder (str): Path to the 02_Production folder
+            context (ProjectContext): Active project (name, 02_Production folder)
         """
-        self.production_folder = production_folder
+        self.context = context
+        self.production_folder = context.production_folder
         self.asset_cache = None
         self.department_cache = None
         self.task_cache = None
         self.file_cache = None
+        # Listings of the projects displayed earlier, least recently used first
+        self.warm_projects = OrderedDict()
+
+    def set_context(self, context):
+        """
+        Switch to another project.
+
+        The listings of the previous project are set aside and the ones of
+        the new project restored if it was displayed recently; their TTL and
+        the replayed change events keep them correct.
+        
+        Args:
+            context (ProjectContext): New active project
+        """
+        if context == self.context:
+            return
+        if self.context.is_valid:
+            self.warm_projects[self.context.root] = (
+                self.asset_cache, self.department_cache, self.task_cache, self.file_cache
+            )
+            self.warm_projects.move_to_end(self.context.root)
+            while len(self.warm_projects) > self.WARM_PROJECT_COUNT:
+                self.warm_projects.popitem(last=False)
+
+        self.context = context
+        self.production_folder = context.production_folder
+        caches = self.warm_projects.pop(context.root, None)
+        if caches is None:
+            self.clear_all_caches()
+        else:
+            self.asset_cache, self.department_cache, self.task_cache, self.file_cache = caches
+            print(f"INFO: Restored warm listings of project '{context.name}'")
 
         
     def get_local_assets(self):
@@ -69,21 +107,38 @@ class AssetManager:
         Returns:
             dict: Server assets data or empty dict if not connected
         """
-        valide = self.is_assetCache_valide()
+        server_assets = self.fetch_server_assets(project_name)
+        return server_assets if server_assets is not None else {}
+
+    def fetch_server_assets(self, project_name):
+        """
+        Fetch assets from server, telling an empty listing from no answer.
+
+        Args:
+            project_name (str): Name of the current project
+
+        Returns:
+            dict or None: Server assets data, None if the server is offline or
+                didn't answer (the last known listing still holds)
+        """
+        valide = self.is_assetCache_valide() and self._cache_matches(
+            self.asset_cache, project_name=project_name
+        )
 
         if valide == False:
             server_assets = connection_manager.make_request(f"/projects/{project_name}/assets")
-            timesstamp = time.time()
-            ttl = 60
-            self.asset_cache = {
-                "data": server_assets,
-                "timestamp": timesstamp,
-                "ttl": ttl
-            }
+            # Only a real answer is cached, a failure is retried on the next call
+            if server_assets is not None:
+                self.asset_cache = {
+                    "data": server_assets,
+                    "timestamp": time.time(),
+                    "ttl": 60,
+                    "project_name": project_name
+                }
         else:
             server_assets = self.asset_cache.get("data")
-        return server_assets if server_assets is not None else {}
-        
+        return server_assets
+
     
     def is_assetCache_valide(self):
         """
@@ -113,6 +168,20 @@ class AssetManager:
             
 
     
+    @staticmethod
+    def _cache_matches(cache, **keys):
+        """
+        Check that a cache entry was filled for the requested location.
+
+        Args:
+            cache (dict): Cache entry
+            **keys: Expected values (project_name, folder_name, ...)
+
+        return:
+            True if every key matches
+        """
+        return all(cache.get(key) == value for key, value in keys.items())
+
     def get_local_departments(self, folder_name, asset_name):
         """
         Get local departments for a specific asset.
@@ -144,7 +213,10 @@ class AssetManager:
         Returns:
             set: Set of department names found on server
         """
-        valide = self.is_departmentCache_valide()
+        valide = self.is_departmentCache_valide() and self._cache_matches(
+            self.department_cache, project_name=project_name,
+            folder_name=folder_name, asset_name=asset_name
+        )
         if valide == False:
             response = connection_manager.make_request(
                 f"/projects/{project_name}/{folder_name}/{asset_name}/department"
@@ -228,7 +300,10 @@ class AssetManager:
             set: Set of task names found on server
         """
 
-        valide = self.is_taskCache_valide()
+        valide = self.is_taskCache_valide() and self._cache_matches(
+            self.task_cache, project_name=project_name, folder_name=folder_name,
+            asset_name=asset_name, department_name=department_name
+        )
 
         if valide == False:
             response = connection_manager.make_request(
@@ -314,7 +389,10 @@ class AssetManager:
             set: Set of file names found on server
         """
 
-        valide = self.is_fileCache_valide()
+        valide = self.is_fileCache_valide() and self._cache_matches(
+            self.file_cache, project_name=project_name, folder_name=folder_name,
+            asset_name=asset_name, department_name=department_name, task_name=task_name
+        )
         if valide == False: 
             response = connection_manager.make_request(
                 f"/projects/{project_name}/{folder_name}/{asset_name}/{department_name}/{task_name}/file"
@@ -402,11 +480,7 @@ class AssetManager:
         Returns:
             str: Status - 'local_only', 'server_only', or 'synced'
         """
-        # Get project name
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.context.name
         
         local_departments = self.get_local_departments(folder_name, asset_name)
         server_departments = self.get_server_departments(project_name, folder_name, asset_name)
@@ -436,11 +510,7 @@ class AssetManager:
         Returns:
             str: Status - 'local_only', 'server_only', or 'synced'
         """
-        # Get project name
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.context.name
         
         local_tasks = self.get_local_tasks(folder_name, asset_name, department_name)
         server_tasks = self.get_server_tasks(project_name, folder_name, asset_name, department_name)
@@ -471,10 +541,7 @@ class AssetManager:
             str: Status - 'local_only', 'server_only', or 'synced'
         """
 
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.context.name
         
         local_file = self.get_local_files(folder_name, asset_name, department_name, task_name)
         server_file = self.get_server_files(project_name, folder_name, asset_name, department_name, task_name)
@@ -564,10 +631,7 @@ class AssetManager:
         Returns:
             dict: Status info with 'status', 'tooltip'
         """
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.context.name
         
         local_departments = self.get_local_departments(folder_name, asset_name)
         server_departments = self.get_server_departments(project_name, folder_name, asset_name)
@@ -608,10 +672,7 @@ class AssetManager:
         Returns:
             dict: Status info with 'status', 'tooltip'
         """
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.context.name
         
         local_tasks = self.get_local_tasks(folder_name, asset_name, department_name)
         server_tasks = self.get_server_tasks(project_name, folder_name, asset_name, department_name)
@@ -653,10 +714,7 @@ class AssetManager:
         Returns:
             dict: Status info with 'status', 'tooltip'
         """
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.context.name
         
         local_files = self.get_local_files(folder_name, asset_name, department_name, task_name)
         server_files = self.get_server_files(project_name, folder_name, asset_name, department_name, task_name)
@@ -701,6 +759,207 @@ class AssetManager:
             
         return result
     
+    # =============================================================================
+    # BATCH STATUS COMPUTATION (whole column in one pass)
+    # =============================================================================
+
+    def get_asset_tree_status(self, local_assets, server_assets):
+        """
+        Determine advanced sync status of every asset in one pass.
+
+        Args:
+            local_assets (dict): Local assets data
+            server_assets (dict): Server assets data
+
+        Returns:
+            dict: (folder_name, asset_name) -> status info dict
+        """
+        statuses = {}
+        for folder_name in set(local_assets.keys()) | set(server_assets.keys()):
+            folder_statuses = self._get_folder_column_status(
+                os.path.join(self.production_folder, folder_name),
+                local_assets.get(folder_name, set()),
+                server_assets.get(folder_name, []),
+                "🟠 Asset synchronisé (local: {time})",
+                "⚪ Asset local uniquement (créé: {time})",
+                "⚫ Asset serveur uniquement"
+            )
+            for asset_name, info in folder_statuses.items():
+                statuses[(folder_name, asset_name)] = info
+        return statuses
+
+    def get_department_column_status(self, folder_name, asset_name, local_departments, server_departments):
+        """
+        Determine advanced sync status of every department of an asset in one pass.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            local_departments (set): Local department names
+            server_departments (set): Server department names
+
+        Returns:
+            dict: department_name -> status info dict
+        """
+        return self._get_folder_column_status(
+            os.path.join(self.production_folder, folder_name, asset_name),
+            local_departments, server_departments,
+            "🟠 Department synchronisé ({time})",
+            "⚪ Department local uniquement (créé: {time})",
+            "⚫ Department serveur uniquement"
+        )
+
+    def get_task_column_status(self, folder_name, asset_name, department_name, local_tasks, server_tasks):
+        """
+        Determine advanced sync status of every task of a department in one pass.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            local_tasks (set): Local task names
+            server_tasks (set): Server task names
+
+        Returns:
+            dict: task_name -> status info dict
+        """
+        return self._get_folder_column_status(
+            os.path.join(self.production_folder, folder_name, asset_name, department_name),
+            local_tasks, server_tasks,
+            "🟠 Task synchronisé ({time})",
+            "⚪ Task local uniquement (créé: {time})",
+            "⚫ Task serveur uniquement"
+        )
+
+    def get_file_column_status(self, folder_name, asset_name, department_name, task_name, local_files, server_files):
+        """
+        Determine advanced sync status of every file of a task in one pass.
+
+        Same rules as get_advanced_file_status but with a single stat per
+        local file and no directory listing, config read or server call.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            task_name (str): Task name
+            local_files (set): Local file names
+            server_files (set): Server file names
+
+        Returns:
+            dict: file_name -> status info dict
+        """
+        task_path = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name)
+        local_files = set(local_files)
+        server_files = set(server_files)
+        now = datetime.now()
+        statuses = {}
+
+        for file_name in local_files | server_files:
+            local_has = file_name in local_files
+            server_has = file_name in server_files
+            result = {'status': 'unknown', 'tooltip': ''}
+
+            if local_has:
+                mod_time, file_size = self._stat_entry(os.path.join(task_path, file_name))
+
+                if not server_has:
+                    result['status'] = 'local_only'
+                    result['tooltip'] = f"⚪ Fichier local uniquement ({mod_time.strftime('%H:%M') if mod_time else 'N/A'}, {file_size} bytes)"
+                elif mod_time:
+                    time_diff = (now - mod_time).seconds
+                    if time_diff < 300:  # Modified in last 5 minutes
+                        result['status'] = 'conflict'
+                        result['tooltip'] = f"🔴 Conflit détecté! Modifié à {mod_time.strftime('%H:%M')}, vérifier le serveur"
+                    elif time_diff < 3600:  # Modified in last hour
+                        result['status'] = 'needs_sync'
+                        result['tooltip'] = f"🟡 Fichier modifié ({mod_time.strftime('%H:%M')}, {file_size} bytes), sync requise"
+                    else:
+                        result['status'] = 'synced'
+                        result['tooltip'] = f"🟠 Fichier synchronisé ({mod_time.strftime('%H:%M')}, {file_size} bytes)"
+                else:
+                    result['status'] = 'synced'
+                    result['tooltip'] = "🟠 Fichier synchronisé"
+
+            elif server_has:
+                result['status'] = 'server_only'
+                result['tooltip'] = "⚫ Fichier serveur uniquement"
+
+            statuses[file_name] = result
+        return statuses
+
+    def _get_folder_column_status(self, parent_path, local_names, server_names, synced_tooltip, local_tooltip, server_tooltip):
+        """
+        Compute folder-based sync status for a whole column.
+
+        Args:
+            parent_path (str): Local path containing the entries
+            local_names (iterable): Names found locally
+            server_names (iterable): Names found on the server
+            synced_tooltip (str): Tooltip template for synced entries ({time} placeholder)
+            local_tooltip (str): Tooltip template for local only entries ({time} placeholder)
+            server_tooltip (str): Tooltip for server only entries
+
+        Returns:
+            dict: name -> status info dict
+        """
+        local_names = set(local_names)
+        server_names = set(server_names)
+        statuses = {}
+
+        for name in local_names | server_names:
+            result = {'status': 'unknown', 'tooltip': ''}
+
+            if name in local_names:
+                mod_time, _ = self._stat_entry(os.path.join(parent_path, name))
+                time_label = mod_time.strftime('%H:%M') if mod_time else 'N/A'
+                if name in server_names:
+                    result['status'] = 'synced'
+                    result['tooltip'] = synced_tooltip.format(time=time_label)
+                else:
+                    result['status'] = 'local_only'
+                    result['tooltip'] = local_tooltip.format(time=time_label)
+            else:
+                result['status'] = 'server_only'
+                result['tooltip'] = server_tooltip
+
+            statuses[name] = result
+        return statuses
+
+    @staticmethod
+    def _stat_entry(path):
+        """
+        Stat a local entry once.
+
+        Args:
+            path (str): Path of the file or folder
+
+        Returns:
+            tuple: (modification datetime or None, size in bytes)
+        """
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None, 0
+        return datetime.fromtimestamp(stat_result.st_mtime), stat_result.st_size
+
+    def invalidate_server_listing(self, depth):
+        """
+        Drop the cached server listing containing entries of a given depth.
+
+        Args:
+            depth (int): Depth of the changed path relative to 02_Production
+                (1-2 assets, 3 departments, 4 tasks, 5 files)
+        """
+        if depth <= 2:
+            self.asset_cache = None
+        elif depth == 3:
+            self.department_cache = None
+        elif depth == 4:
+            self.task_cache = None
+        else:
+            self.file_cache = None
+
     def clear_all_caches(self):
         """
         When call clear all the asset_manager Cache
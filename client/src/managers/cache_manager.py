@@ -0,0 +1,242 @@
+"""
+Cache Manager Module
+
+Persistent client-side cache of the last known synchronization state:
+- Local and server listings for every browsed level of a project
+- Last computed sync statuses and tooltips
+- Instant cold start of the FileManager before background reconciliation
+- Asset trees of the last projects also kept in memory, so a project switch
+  paints without touching the database
+"""
+
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from src.config import configSparkle
+
+
+class CacheManager:
+    """
+    Stores the last known local/server tree of each project in SQLite.
+
+    Every listing is identified by its parent path relative to the
+    02_Production folder:
+        ""                              -> asset type folders
+        "Chara"                         -> assets
+        "Chara/hero"                    -> departments
+        "Chara/hero/Modeling"           -> tasks
+        "Chara/hero/Modeling/Low"       -> files
+    """
+
+    # Number of projects whose asset tree stays in memory
+    MEMORY_PROJECT_COUNT = 4
+
+    def __init__(self, db_path=None):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            db_path (str): Optional database path, defaults to
+                <sparkle_folder>/cache/sync_state.db
+        """
+        if db_path is None:
+            cache_folder = configSparkle().sparkle_folder / "cache"
+            cache_folder.mkdir(parents=True, exist_ok=True)
+            db_path = cache_folder / "sync_state.db"
+
+        self.db_path = str(db_path)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        # Project name -> (local_assets, server_assets, statuses), least recently used first
+        self.memory_assets = OrderedDict()
+
+    def _remember_assets(self, project_name, assets):
+        """Keep an asset tree in memory, evicting the least recently used project."""
+        self.memory_assets[project_name] = assets
+        self.memory_assets.move_to_end(project_name)
+        while len(self.memory_assets) > self.MEMORY_PROJECT_COUNT:
+            self.memory_assets.popitem(last=False)
+
+    def _create_tables(self):
+        """Create cache tables if they don't exist yet."""
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS listings (
+                    project TEXT NOT NULL,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    local INTEGER NOT NULL,
+                    server INTEGER NOT NULL,
+                    status TEXT,
+                    PRIMARY KEY (project, parent, name)
+                )
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS listing_meta (
+                    project TEXT NOT NULL,
+                    parent TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (project, parent)
+                )
+            """)
+
+    # =============================================================================
+    # GENERIC LISTINGS
+    # =============================================================================
+
+    def store_listing(self, project_name, parent, local_names, server_names, statuses=None):
+        """
+        Replace the cached listing of one level.
+
+        Args:
+            project_name (str): Name of the project
+            parent (str): Parent path relative to 02_Production
+            local_names (iterable): Names found locally
+            server_names (iterable): Names found on the server
+            statuses (dict): Optional mapping name -> status info dict
+        """
+        statuses = statuses or {}
+        local_names = set(local_names)
+        server_names = set(server_names)
+
+        rows = []
+        for name in local_names | server_names:
+            status_info = statuses.get(name)
+            rows.append((
+                project_name, parent, name,
+                int(name in local_names), int(name in server_names),
+                json.dumps(status_info) if status_info else None
+            ))
+
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM listings WHERE project = ? AND parent = ?",
+                (project_name, parent)
+            )
+            self.connection.executemany(
+                "INSERT INTO listings VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO listing_meta VALUES (?, ?, ?)",
+                (project_name, parent, time.time())
+            )
+
+    def load_listing(self, project_name, parent):
+        """
+        Load the cached listing of one level.
+
+        Args:
+            project_name (str): Name of the project
+            parent (str): Parent path relative to 02_Production
+
+        Returns:
+            tuple or None: (local set, server set, statuses dict), None if never cached
+        """
+        meta = self.connection.execute(
+            "SELECT updated_at FROM listing_meta WHERE project = ? AND parent = ?",
+            (project_name, parent)
+        ).fetchone()
+        if meta is None:
+            return None
+
+        local_names, server_names, statuses = set(), set(), {}
+        for name, local, server, status in self.connection.execute(
+            "SELECT name, local, server, status FROM listings WHERE project = ? AND parent = ?",
+            (project_name, parent)
+        ):
+            if local:
+                local_names.add(name)
+            if server:
+                server_names.add(name)
+            if status:
+                statuses[name] = json.loads(status)
+        return local_names, server_names, statuses
+
+    # =============================================================================
+    # ASSET TREE
+    # =============================================================================
+
+    def store_assets(self, project_name, local_assets, server_assets, statuses=None):
+        """
+        Cache the complete asset tree (asset types and their assets).
+
+        Args:
+            project_name (str): Name of the project
+            local_assets (dict): Asset type -> set of local asset names
+            server_assets (dict): Asset type -> list of server asset names
+            statuses (dict): Optional mapping (folder_name, asset_name) -> status info
+        """
+        statuses = statuses or {}
+        self._remember_assets(project_name, (local_assets, server_assets, statuses))
+        self.store_listing(project_name, "", local_assets.keys(), server_assets.keys())
+
+        for folder_name in set(local_assets.keys()) | set(server_assets.keys()):
+            folder_statuses = {
+                asset_name: info for (folder, asset_name), info in statuses.items()
+                if folder == folder_name
+            }
+            self.store_listing(
+                project_name, folder_name,
+                local_assets.get(folder_name, set()),
+                server_assets.get(folder_name, []),
+                folder_statuses
+            )
+
+    def load_assets(self, project_name):
+        """
+        Load the cached asset tree.
+
+        Args:
+            project_name (str): Name of the project
+
+        Returns:
+            tuple or None: (local_assets, server_assets, statuses) shaped like the
+                AssetManager results, None if the project was never cached
+        """
+        if project_name in self.memory_assets:
+            self.memory_assets.move_to_end(project_name)
+            return self.memory_assets[project_name]
+
+        folders = self.load_listing(project_name, "")
+        if folders is None:
+            return None
+
+        local_folders, server_folders, _ = folders
+        local_assets = {folder_name: set() for folder_name in local_folders}
+        server_assets = {folder_name: [] for folder_name in server_folders}
+        statuses = {}
+
+        # Single query for the whole second level instead of one per folder
+        for folder_name, asset_name, local, server, status in self.connection.execute(
+            "SELECT parent, name, local, server, status FROM listings "
+            "WHERE project = ? AND parent != '' AND instr(parent, '/') = 0",
+            (project_name,)
+        ):
+            if local and folder_name in local_assets:
+                local_assets[folder_name].add(asset_name)
+            if server and folder_name in server_assets:
+                server_assets[folder_name].append(asset_name)
+            if status:
+                statuses[(folder_name, asset_name)] = json.loads(status)
+
+        self._remember_assets(project_name, (local_assets, server_assets, statuses))
+        return local_assets, server_assets, statuses
+
+    def clear_project(self, project_name):
+        """
+        Drop every cached listing of a project.
+
+        Args:
+            project_name (str): Name of the project
+        """
+        self.memory_assets.pop(project_name, None)
+        with self.connection:
+            self.connection.execute("DELETE FROM listings WHERE project = ?", (project_name,))
+            self.connection.execute("DELETE FROM listing_meta WHERE project = ?", (project_name,))
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
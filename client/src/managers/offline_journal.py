@@ -0,0 +1,414 @@
+"""
+Offline Journal Module
+
+Persistent queue of the server operations requested while offline:
+- Publish file, create folder and delete, stored in SQLite
+- Deduplication when queued (same operation twice, operations made moot by a delete)
+- Ordered replay in a background thread as soon as the server is back
+- Deletes go through the queue online too: consecutive deletes of a project
+  are sent as one batch request
+- Conflict detection: server paths changed after the last contact are reported,
+  never overwritten
+"""
+
+import os
+import sqlite3
+import time
+from PySide6.QtCore import QObject, QThread, Signal
+from src.config import configSparkle
+from src.connection_manager import connection_manager
+
+
+OPERATIONS = ("create_folder", "publish_file", "delete")
+
+
+def _is_under(path, parent):
+    """True if path is parent itself or inside it (paths relative to 02_Production)."""
+    return path == parent or path.startswith(parent + "/")
+
+
+class ReplayWorker(QThread):
+    """
+    Replays queued operations against the server off the GUI thread.
+
+    Operations run in queue order and the replay stops at the first network
+    failure, the remaining ones are kept for the next reconnection.
+    """
+
+    # Signals (handled on the GUI thread, which owns the database)
+    op_done = Signal(int)           # Operation id replayed (or made moot)
+    op_conflict = Signal(int, str)  # Operation id, conflict description
+    op_failed = Signal(int, str)    # Operation id, permanent error
+
+    def __init__(self, operations, force=False):
+        """
+        Args:
+            operations (list): Operation dicts, in queue order
+            force (bool): Skip conflict checks (user chose to overwrite)
+        """
+        super().__init__()
+        self.operations = operations
+        self.force = force
+        self.stopped = False  # True if the server went away during the replay
+
+    def run(self):
+        """Check conflicts with one stat call per project, then replay in order."""
+        server_stats = {}
+        if not self.force:
+            server_stats = self._stat_targets()
+            if server_stats is None:
+                self.stopped = True
+                return
+
+        deletes = []
+        for index, operation in enumerate(self.operations):
+            if operation["op"] == "create_folder" and self._created_later(operation, self.operations[index + 1:]):
+                # The server creates parent folders anyway
+                self.op_done.emit(operation["id"])
+                continue
+
+            conflict = self._find_conflict(operation, server_stats)
+            if conflict:
+                self.op_conflict.emit(operation["id"], conflict)
+                continue
+
+            if operation["op"] == "delete":
+                deletes.append(operation)
+                continue
+            if deletes and not self._execute_deletes(deletes):
+                self.stopped = True
+                return
+            deletes = []
+
+            result = self._execute(operation)
+            if result is None:
+                self.stopped = True
+                return
+            if result is True:
+                self.op_done.emit(operation["id"])
+            else:
+                self.op_failed.emit(operation["id"], result)
+
+        if deletes and not self._execute_deletes(deletes):
+            self.stopped = True
+
+    def _execute_deletes(self, operations):
+        """
+        Send consecutive delete operations, one batch request per project.
+
+        Returns:
+            bool: False on network failure
+        """
+        by_project = {}
+        for operation in operations:
+            by_project.setdefault(operation["project"], []).append(operation)
+
+        for project_name, project_operations in by_project.items():
+            # Paths already gone count as deleted
+            response = connection_manager.make_post_request(
+                f"/delete/{project_name}", {"paths": [operation["path"] for operation in project_operations]},
+                timeout=30
+            )
+            if response is None:
+                return False
+            for operation in project_operations:
+                self.op_done.emit(operation["id"])
+        return True
+
+    def _stat_targets(self):
+        """
+        Fetch the server state of every path that could conflict.
+
+        Returns:
+            dict or None: (project, path) -> stat dict, None if the server is unreachable
+        """
+        paths_by_project = {}
+        for operation in self.operations:
+            if operation["op"] in ("publish_file", "delete"):
+                paths_by_project.setdefault(operation["project"], set()).add(operation["path"])
+
+        server_stats = {}
+        for project_name, paths in paths_by_project.items():
+            response = connection_manager.make_post_request(
+                f"/stat/{project_name}", {"paths": sorted(paths)}
+            )
+            if response is None:
+                return None
+            for path, stat in response.get("stats", {}).items():
+                server_stats[(project_name, path)] = stat
+        return server_stats
+
+    @staticmethod
+    def _created_later(operation, next_operations):
+        """True if a later create/publish in the batch creates this folder too."""
+        for other in next_operations:
+            if other["project"] != operation["project"] or other["op"] == "delete":
+                continue
+            if other["path"] != operation["path"] and _is_under(other["path"], operation["path"]):
+                return True
+        return False
+
+    @staticmethod
+    def _find_conflict(operation, server_stats):
+        """
+        Detect a server change the user could not have seen when queuing.
+
+        Returns:
+            str: Conflict description, empty if none
+        """
+        stat = server_stats.get((operation["project"], operation["path"]))
+        if not stat or not stat.get("exists"):
+            return ""
+        if stat["mtime"] <= operation["base_time"]:
+            return ""
+
+        changed_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(stat["mtime"]))
+        if operation["op"] == "publish_file":
+            return f"Server file modified on {changed_at}, after you went offline"
+        return f"Server content modified on {changed_at}, after you went offline"
+
+    @staticmethod
+    def _execute(operation):
+        """
+        Send one operation to the server.
+
+        Returns:
+            True if done, None on network failure, error message if it can never succeed
+        """
+        endpoint_path = f"{operation['project']}/{operation['path']}"
+
+        if operation["op"] == "create_folder":
+            response = connection_manager.make_post_request(f"/create_folder/{endpoint_path}")
+            return True if response else None
+
+        if operation["op"] == "publish_file":
+            if not os.path.exists(operation["local_path"]):
+                return f"Local file no longer exists: {operation['local_path']}"
+            success = connection_manager.upload_file_to_server(f"/upload/{endpoint_path}", operation["local_path"])
+            return True if success else None
+
+        return f"Unknown operation: {operation['op']}"
+
+
+class OfflineJournal(QObject):
+    """
+    Journal of the server operations intended while offline.
+
+    Operations are persisted in SQLite so they survive a restart, and
+    replayed automatically when connection_manager reports the server back.
+    Each operation keeps the time of the last server contact before it was
+    queued (base_time): a server path modified after that time is a conflict
+    and is kept for the user to resolve instead of being overwritten.
+    """
+
+    # Signals
+    pending_changed = Signal(int)          # Number of operations waiting in the journal
+    replay_finished = Signal(int, list)    # Operations replayed, issues (failed + all conflicts) as dicts
+
+    def __init__(self, db_path=None):
+        """
+        Open (and create if needed) the journal database.
+
+        Args:
+            db_path (str): Optional database path, defaults to
+                <sparkle_folder>/cache/offline_journal.db
+        """
+        super().__init__()
+        if db_path is None:
+            cache_folder = configSparkle().sparkle_folder / "cache"
+            cache_folder.mkdir(parents=True, exist_ok=True)
+            db_path = cache_folder / "offline_journal.db"
+
+        self.db_path = str(db_path)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+        self.worker = None
+        self._replayed = 0
+        self._issues = []
+
+        connection_manager.connection_changed.connect(self._on_connection_changed)
+
+    def _create_tables(self):
+        """Create the journal table if it doesn't exist yet."""
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS operations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    project TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    local_path TEXT NOT NULL DEFAULT '',
+                    queued_at REAL NOT NULL,
+                    base_time REAL NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    detail TEXT NOT NULL DEFAULT ''
+                )
+            """)
+
+    # =============================================================================
+    # QUEUE
+    # =============================================================================
+
+    def enqueue(self, project_name, op, path, local_path=""):
+        """
+        Queue a server operation.
+
+        A pending identical operation is kept instead of adding a new one, and
+        a delete drops the pending operations inside the deleted path.
+
+        Args:
+            project_name (str): Name of the project
+            op (str): "create_folder", "publish_file" or "delete"
+            path (str): Path relative to 02_Production ("Chara/hero/Modeling")
+            local_path (str): Local file to upload (publish_file only)
+        """
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op}")
+
+        now = time.time()
+        base_time = connection_manager.last_contact or now
+        with self.connection:
+            if op == "delete":
+                pending = self.connection.execute(
+                    "SELECT id, path FROM operations WHERE project = ? AND state = 'pending'",
+                    (project_name,)
+                ).fetchall()
+                moot = [(row["id"],) for row in pending if _is_under(row["path"], path)]
+                self.connection.executemany("DELETE FROM operations WHERE id = ?", moot)
+
+            duplicate = self.connection.execute(
+                "SELECT id FROM operations WHERE project = ? AND op = ? AND path = ? AND state = 'pending'",
+                (project_name, op, path)
+            ).fetchone()
+            if duplicate is None:
+                self.connection.execute(
+                    "INSERT INTO operations (project, op, path, local_path, queued_at, base_time) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (project_name, op, path, local_path, now, base_time)
+                )
+
+        print(f"INFO: Queued operation {op} '{path}'")
+        self.pending_changed.emit(self.pending_count())
+
+    def pending_count(self):
+        """
+        Returns:
+            int: Number of operations waiting to be replayed
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM operations WHERE state = 'pending'"
+        ).fetchone()[0]
+
+    def conflicts(self):
+        """
+        Returns:
+            list: Operation dicts in conflict with the server, oldest first
+        """
+        rows = self.connection.execute(
+            "SELECT * FROM operations WHERE state = 'conflict' ORDER BY id"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    # =============================================================================
+    # REPLAY
+    # =============================================================================
+
+    def _on_connection_changed(self, connected):
+        if connected:
+            self.replay()
+
+    def replay(self, operation_ids=None, force=False):
+        """
+        Replay the pending operations in a background thread.
+
+        Args:
+            operation_ids (list): Only replay these operations (optional)
+            force (bool): Skip conflict checks, overwriting the server
+
+        Returns:
+            bool: True if a replay was started
+        """
+        if self.worker is not None or not connection_manager.is_connected:
+            return False
+
+        if operation_ids is None:
+            rows = self.connection.execute(
+                "SELECT * FROM operations WHERE state = 'pending' ORDER BY id"
+            ).fetchall()
+        else:
+            placeholders = ",".join("?" * len(operation_ids))
+            rows = self.connection.execute(
+                f"SELECT * FROM operations WHERE id IN ({placeholders}) ORDER BY id",
+                list(operation_ids)
+            ).fetchall()
+        if not rows:
+            return False
+
+        print(f"INFO: Replaying {len(rows)} offline operation(s)")
+        self._replayed = 0
+        self._issues = []
+        self.worker = ReplayWorker([dict(row) for row in rows], force)
+        self.worker.op_done.connect(self._on_op_done)
+        self.worker.op_conflict.connect(self._on_op_conflict)
+        self.worker.op_failed.connect(self._on_op_failed)
+        self.worker.finished.connect(self._on_replay_finished)
+        self.worker.start()
+        return True
+
+    def resolve_conflicts(self, operation_ids, overwrite):
+        """
+        Settle conflicting operations.
+
+        Args:
+            operation_ids (list): Ids of the operations in conflict
+            overwrite (bool): True to replay them anyway, False to drop them
+        """
+        if overwrite:
+            if not self.replay(operation_ids, force=True):
+                print("WARNING: Conflicts kept, server unavailable")
+            return
+        with self.connection:
+            self.connection.executemany("DELETE FROM operations WHERE id = ?", [(i,) for i in operation_ids])
+
+    def _on_op_done(self, operation_id):
+        with self.connection:
+            self.connection.execute("DELETE FROM operations WHERE id = ?", (operation_id,))
+        self._replayed += 1
+
+    def _on_op_conflict(self, operation_id, detail):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE operations SET state = 'conflict', detail = ? WHERE id = ?", (detail, operation_id)
+            )
+        row = self.connection.execute("SELECT * FROM operations WHERE id = ?", (operation_id,)).fetchone()
+        print(f"WARNING: Offline operation {row['op']} '{row['path']}' in conflict: {detail}")
+
+    def _on_op_failed(self, operation_id, detail):
+        row = self.connection.execute("SELECT * FROM operations WHERE id = ?", (operation_id,)).fetchone()
+        with self.connection:
+            self.connection.execute("DELETE FROM operations WHERE id = ?", (operation_id,))
+        issue = dict(row)
+        issue.update(state="failed", detail=detail)
+        self._issues.append(issue)
+        print(f"ERROR: Offline operation {row['op']} '{row['path']}' dropped: {detail}")
+
+    def _on_replay_finished(self):
+        stopped = self.worker.stopped
+        self.worker.deleteLater()
+        self.worker = None
+        if stopped:
+            print("WARNING: Offline replay interrupted, remaining operations kept")
+        print(f"INFO: Offline replay done ({self._replayed} operation(s) sent)")
+        # Conflicts left undecided earlier are reported again with the new ones
+        self.pending_changed.emit(self.pending_count())
+        self.replay_finished.emit(self._replayed, self._issues + self.conflicts())
+        if not stopped and self.pending_count():
+            # Queued while this replay was running
+            self.replay()
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
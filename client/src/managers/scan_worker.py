@@ -0,0 +1,40 @@
+"""
+Scan Worker Module
+
+Background scanning of local and server assets:
+- Runs the local folder scan and server listing off the GUI thread
+- Hands the results back to the UI through a Qt signal
+"""
+
+from PySide6.QtCore import QThread, Signal
+
+
+class AssetScanWorker(QThread):
+    """
+    Thread scanning local and server assets for reconciliation.
+
+    The UI paints the cached tree first, then starts this worker and
+    repopulates once fresh data is available.
+    """
+
+    # Emitted with (local_assets, server_assets)
+    scan_finished = Signal(object, object)
+
+    def __init__(self, asset_manager, project_name):
+        """
+        Initialize the worker.
+
+        Args:
+            asset_manager: AssetManager instance used for scanning
+            project_name (str): Name of the current project
+        """
+        super().__init__()
+        self.asset_manager = asset_manager
+        self.project_name = project_name
+
+    def run(self):
+        """Scan local and server assets then emit the results."""
+        local_assets = self.asset_manager.get_local_assets()
+        # None when the server didn't answer: the UI keeps its last known listing
+        server_assets = self.asset_manager.fetch_server_assets(self.project_name)
+        self.scan_finished.emit(local_assets, server_assets)
@@ -0,0 +1,317 @@
+"""
+Search Manager Module
+
+Name search across the asset tree of the active project:
+- Online, queries go to the server search index (/search), one page at a time
+- A local mirror of that index (<sparkle_folder>/cache/search/<project>.db)
+  answers the same queries offline
+- The mirror is downloaded once (/search_index) in a background thread, then
+  kept current by the server change events received by the FileManager; a
+  resync event downloads it again
+"""
+
+import sqlite3
+import time
+from urllib.parse import urlencode, quote
+from PySide6.QtCore import QObject, QThread, Signal
+from shared.search_schema import (ENTRY_COLUMNS, FTS_REBUILD, FTS_SCHEMA, FTS_TABLE, FTS_TRIGGERS, GLOB_SPECIAL,
+                                  SCHEMA, below, entry_row, search_page)
+from src.config import configSparkle
+from src.connection_manager import connection_manager
+
+MIRROR_MAX_AGE = 3600  # Seconds before a mirror is downloaded again on project load
+
+# Same entries and trigram index as the server (shared/search_schema.py), plus the mirror state
+MIRROR_SCHEMA = SCHEMA + """
+CREATE TABLE IF NOT EXISTS mirror_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SearchMirror:
+    """Local copy of the server search index of one project."""
+
+    def __init__(self, project_name, db_path=None):
+        """
+        Open (and create if needed) the mirror of a project.
+
+        Args:
+            project_name (str): Name of the project
+            db_path (str): Optional database path, defaults to
+                <sparkle_folder>/cache/search/<project>.db
+        """
+        if db_path is None:
+            folder = configSparkle().sparkle_folder / "cache" / "search"
+            folder.mkdir(parents=True, exist_ok=True)
+            db_path = folder / f"{project_name}.db"
+        self.project_name = project_name
+        self.db_path = str(db_path)
+        self.connection = sqlite3.connect(self.db_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(MIRROR_SCHEMA)
+        try:
+            had_fts = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'names'").fetchone() is not None
+            self.connection.executescript(FTS_SCHEMA)
+            if not had_fts:
+                # Mirror created before the trigram index, or left without it by a failed replace
+                with self.connection:
+                    self.connection.execute(FTS_REBUILD)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+
+    def meta(self, key):
+        row = self.connection.execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO mirror_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def is_stale(self):
+        """True if the mirror was never downloaded or is older than MIRROR_MAX_AGE."""
+        synced_at = self.meta("synced_at")
+        return synced_at is None or time.time() - float(synced_at) > MIRROR_MAX_AGE
+
+    def replace(self, export):
+        """
+        Replace the mirror content with a /search_index export.
+
+        Args:
+            export (dict): {"event_id", "paths", "kinds", "sizes", "mtimes"}
+        """
+        rows = [entry_row(path, kind == "folder", size, mtime) for path, kind, size, mtime
+                in zip(export["paths"], export["kinds"], export["sizes"], export["mtimes"])]
+        connection = self.connection
+        # One transaction: searches of other connections see the old mirror until the commit,
+        # a failure leaves it untouched (executescript runs each statement on its own)
+        connection.execute("BEGIN")
+        with connection:
+            if self.fts:
+                # Emptied and refilled in bulk rather than row by row through the triggers
+                for trigger in FTS_TRIGGERS:
+                    connection.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                connection.execute("DROP TABLE IF EXISTS names")
+            connection.execute("DELETE FROM entries")
+            connection.executemany(f"INSERT INTO entries ({ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            if self.fts:
+                for statement in (FTS_TABLE, *FTS_TRIGGERS.values()):
+                    connection.execute(statement)
+                connection.execute(FTS_REBUILD)
+            self._set_meta("event_id", export.get("event_id") or "")
+            self._set_meta("synced_at", str(time.time()))
+
+    def apply_event(self, event):
+        """
+        Apply a server change event.
+
+        Args:
+            event (dict): Change event with 'type', 'path', 'kind' and 'timestamp'
+        """
+        path = event.get("path", "")
+        if not path:
+            return
+        with self.connection:
+            if event.get("type") == "deleted":
+                self.connection.execute("DELETE FROM entries WHERE path = ? OR (path >= ? AND path < ?)",
+                                        (path, *below(path)))
+            else:
+                self.connection.execute(
+                    f"INSERT INTO entries ({ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime",
+                    entry_row(path, event.get("kind") != "file", 0, event.get("timestamp") or time.time())
+                )
+            if event.get("id"):
+                self._set_meta("event_id", event["id"])
+
+    def search(self, **filters):
+        """
+        Search the mirror (same filters and result shape as the server /search).
+
+        Returns:
+            dict: {"results": [{"path", "name", "kind", "size", "mtime"}], "next_cursor"}
+        """
+        return search_page(self.connection, fts=self.fts, **filters)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class MirrorSyncWorker(QThread):
+    """Downloads the server index of a project into a mirror database."""
+
+    # Emitted with (project name, success)
+    sync_finished = Signal(str, bool)
+
+    def __init__(self, project_name, db_path):
+        """
+        Args:
+            project_name (str): Name of the project
+            db_path (str): Mirror database to fill
+        """
+        super().__init__()
+        self.project_name = project_name
+        self.db_path = db_path
+
+    def run(self):
+        """Download the index and replace the mirror content."""
+        export = connection_manager.make_request(f"/search_index/{quote(self.project_name)}", timeout=120)
+        if not export or "paths" not in export:
+            self.sync_finished.emit(self.project_name, False)
+            return
+        # The thread uses its own connection to the mirror database
+        mirror = SearchMirror(self.project_name, self.db_path)
+        try:
+            mirror.replace(export)
+        finally:
+            mirror.close()
+        print(f"INFO: Search mirror of '{self.project_name}' updated ({len(export['paths'])} entries)")
+        self.sync_finished.emit(self.project_name, True)
+
+
+class SearchManager(QObject):
+    """
+    Searches of the active project: server index online, local mirror offline.
+    """
+
+    def __init__(self, context):
+        """
+        Initialize the manager for a project.
+
+        Args:
+            context (ProjectContext): Active project
+        """
+        super().__init__()
+        self.context = None
+        self.mirror = None
+        self.sync_worker = None
+        self._stale_workers = []
+        # Events received during a download, applied on top of it once done
+        self._pending_events = []
+        self.set_context(context)
+
+    def set_context(self, context):
+        """
+        Switch to another project's mirror.
+
+        Args:
+            context (ProjectContext): New active project
+        """
+        if self.context is not None and context == self.context:
+            return
+        self.context = context
+        self._pending_events = []
+        if self.mirror is not None:
+            self.mirror.close()
+        self.mirror = SearchMirror(context.name) if context.is_valid else None
+
+    def sync_mirror(self, force=False):
+        """
+        Download the server index in the background if the mirror is stale.
+
+        Args:
+            force (bool): Download even if the mirror is recent (resync)
+        """
+        if self.mirror is None or not connection_manager.is_connected:
+            return
+        if not force and not self.mirror.is_stale():
+            return
+        if self.sync_worker is not None and self.sync_worker.isRunning():
+            if self.sync_worker.project_name == self.context.name:
+                return
+            # Another project's download: let it end, its mirror is still useful
+            stale_worker = self.sync_worker
+            self._stale_workers.append(stale_worker)
+            stale_worker.finished.connect(lambda: self._stale_workers.remove(stale_worker))
+        self.sync_worker = MirrorSyncWorker(self.context.name, self.mirror.db_path)
+        self.sync_worker.sync_finished.connect(self._on_sync_finished)
+        self.sync_worker.start()
+
+    def _on_sync_finished(self, project_name, success):
+        """Apply the events received while the mirror was downloading."""
+        if project_name != self.context.name or self.mirror is None:
+            return
+        events, self._pending_events = self._pending_events, []
+        for event in events:
+            self.mirror.apply_event(event)
+
+    def apply_event(self, event):
+        """
+        Keep the mirror current with a server change event.
+
+        Args:
+            event (dict): Change event of the active project
+        """
+        if self.mirror is None:
+            return
+        if event.get("type") == "resync" or not event.get("path"):
+            self.sync_mirror(force=True)
+            return
+        if self.sync_worker is not None and self.sync_worker.isRunning() \
+                and self.sync_worker.project_name == self.context.name:
+            self._pending_events.append(event)
+            return
+        self.mirror.apply_event(event)
+
+    def search(self, **filters):
+        """
+        Search the active project.
+
+        Args:
+            **filters: query, mode, kind, asset_type, extension, department,
+                modified_since, cursor, limit (see search_query)
+
+        Returns:
+            dict: {"results", "next_cursor", "offline"}, empty results without a project
+        """
+        if not self.context.is_valid:
+            return {"results": [], "next_cursor": None, "offline": True}
+
+        if connection_manager.is_connected:
+            params = {"q": filters.get("query", ""), "type": filters.get("asset_type")}
+            params.update({key: value for key, value in filters.items() if key not in ("query", "asset_type")})
+            endpoint = f"/search/{quote(self.context.name)}?" + urlencode(
+                {key: value for key, value in params.items() if value is not None}
+            )
+            response = connection_manager.make_request(endpoint)
+            if response is not None and "results" in response:
+                response["offline"] = False
+                return response
+
+        result = self.mirror.search(**filters)
+        result["offline"] = True
+        return result
+
+
+# Filter prefixes of the search box: "ext:blend dept:Modeling hero"
+SEARCH_KEYWORDS = {"ext": "extension", "dept": "department", "type": "asset_type", "kind": "kind"}
+
+
+def parse_search_text(text, mode="prefix"):
+    """
+    Turn the search box text into search filters.
+
+    "key:value" words set filters (ext, dept, type, kind), the other words
+    are the name query; a query holding *, ? or [ is a glob pattern.
+
+    Args:
+        text (str): Search box text
+        mode (str): Mode used for plain queries ("prefix" or "substring")
+
+    Returns:
+        dict: Filters for SearchManager.search
+    """
+    filters = {}
+    words = []
+    for word in text.split():
+        key, separator, value = word.partition(":")
+        if separator and key.lower() in SEARCH_KEYWORDS and value:
+            filters[SEARCH_KEYWORDS[key.lower()]] = value
+        else:
+            words.append(word)
+    filters["query"] = " ".join(words)
+    filters["mode"] = "glob" if GLOB_SPECIAL.search(filters["query"]) else mode
+    return filters
@@ -5,11 +5,17 @@ Handles all synchronization operations including:
 - Publishing assets, departments, and tasks to server
 - Downloading assets, departments, and tasks from server
 - Server communication for folder creation
+- Queuing publishes in the offline journal while the server is unreachable
+- Reserving version numbers on the server so concurrent saves never collide
+- Publishing masters as a server-side promotion of the published version
+  instead of uploading the same bytes a second time
+- Scaffolding assets and departments from a server template in one call
 """
 
+import filecmp
 import os
-from src.config import configSparkle
 from src.connection_manager import connection_manager
+from src.managers.version_manager import VERSION_PATTERN, MASTER_PATTERN, VersionManager, version_index
 
 
 class SyncManager:
@@ -20,26 +26,52 @@ class SyncManager:
     departments, and tasks with the server.
     """
     
-    def __init__(self, production_folder):
+    def __init__(self, context, offline_journal=None):
         """
-        Initialize SyncManager with production folder path.
+        Initialize SyncManager for a project.
         
         Args:
-            production_folder (str): Path to the 02_Production folder
+            context (ProjectContext): Active project (name, folders, endpoints)
+            offline_journal: OfflineJournal queuing publishes while offline (optional)
         """
-        self.production_folder = production_folder
+        self.set_context(context)
+        self.offline_journal = offline_journal
+
+    def set_context(self, context):
+        """
+        Switch to another project.
+        
+        Args:
+            context (ProjectContext): New active project
+        """
+        self.context = context
+        self.production_folder = context.production_folder
+
+    def _queue_if_offline(self, op, path, local_path=""):
+        """
+        Queue a server operation in the offline journal if the server is unreachable.
+
+        Args:
+            op (str): "create_folder", "publish_file" or "delete"
+            path (str): Path relative to 02_Production
+            local_path (str): Local file to upload (publish_file only)
+
+        Returns:
+            bool: True if queued, False if the operation must be sent now
+        """
+        if connection_manager.is_connected or self.offline_journal is None:
+            return False
+        self.offline_journal.enqueue(self._get_project_name(), op, path, local_path)
+        return True
     
     def _get_project_name(self):
         """
-        Get current project name from configuration.
+        Get current project name.
         
         Returns:
             str: Current project name
         """
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        return os.path.basename(folder_path)
+        return self.context.name
     
     def publish_asset(self, folder_name, asset_name):
         """
@@ -52,13 +84,14 @@ class SyncManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        project_name = self._get_project_name()
-        
         # Create folder structure on server using the correct endpoint format
         folder_path = f"{folder_name}/{asset_name}"
         
+        if self._queue_if_offline("create_folder", folder_path):
+            return True
+        
         response = connection_manager.make_post_request(
-            f"/create_folder/{project_name}/{folder_path}"
+            f"{self.context.create_folder_prefix}/{folder_path}"
         )
         
         if response and response.get("message"):
@@ -102,13 +135,14 @@ class SyncManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        project_name = self._get_project_name()
-        
         # Create folder structure on server using the correct endpoint format
         folder_path = f"{folder_name}/{asset_name}/{department_name}"
         
+        if self._queue_if_offline("create_folder", folder_path):
+            return True
+        
         response = connection_manager.make_post_request(
-            f"/create_folder/{project_name}/{folder_path}"
+            f"{self.context.create_folder_prefix}/{folder_path}"
         )
         
         if response and response.get("message"):
@@ -118,6 +152,33 @@ class SyncManager:
             print(f"ERROR: Failed to publish department '{department_name}'")
             return False
     
+    def instantiate_template(self, template_name, relative_path, folders):
+        """
+        Create the folders of a template on the server in one request.
+
+        Args:
+            template_name (str): Server template name
+            relative_path (str): Asset or department path relative to 02_Production
+            folders (list): Template folders, queued one by one while offline
+
+        Returns:
+            bool: True if created or queued, False otherwise
+        """
+        if not connection_manager.is_connected and self.offline_journal is not None:
+            for folder in folders or [""]:
+                path = f"{relative_path}/{folder}" if folder else relative_path
+                self.offline_journal.enqueue(self._get_project_name(), "create_folder", path)
+            return True
+
+        response = connection_manager.make_post_request(
+            f"{self.context.instantiate_prefix}/{relative_path}", {"template": template_name}
+        )
+        if response and "created" in response:
+            print(f"INFO: Applied template '{template_name}' to {relative_path} on server")
+            return True
+        print(f"ERROR: Failed to apply template '{template_name}' to {relative_path}")
+        return False
+
     def download_department(self, folder_name, asset_name, department_name):
         """
         Download (create) a department folder locally.
@@ -154,13 +215,14 @@ class SyncManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        project_name = self._get_project_name()
-        
         # Create folder structure on server using the correct endpoint format
         folder_path = f"{folder_name}/{asset_name}/{department_name}/{task_name}"
         
+        if self._queue_if_offline("create_folder", folder_path):
+            return True
+        
         response = connection_manager.make_post_request(
-            f"/create_folder/{project_name}/{folder_path}"
+            f"{self.context.create_folder_prefix}/{folder_path}"
         )
         
         if response and response.get("message"):
@@ -194,7 +256,193 @@ class SyncManager:
             print(f"ERROR: Failed to download task '{task_name}': {e}")
             return False
         
-    def publish_file(self, folder_name, asset_name, department_name, task_name, file_name):
+    def reserve_version(self, folder_name, asset_name, department_name, task_name, asset, task, extension,
+                        min_version=1):
+        """
+        Reserve the next version number of a file on the server.
+
+        The server hands out each number once, even to artists saving the
+        same task at the same time. Pass the result to publish_file to
+        upload the reserved name.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            task_name (str): Task name
+            asset (str): Asset part of the file name
+            task (str): Task part of the file name
+            extension (str): File extension without the dot
+            min_version (int): Lowest number wanted (the locally saved one)
+
+        Returns:
+            dict or None: version, name, path and token; None if offline
+        """
+        task_path = f"{folder_name}/{asset_name}/{department_name}/{task_name}"
+        reservation = connection_manager.make_post_request(
+            f"{self.context.reserve_version_prefix}/{task_path}",
+            data={"asset": asset, "task": task, "extension": extension, "min_version": min_version}
+        )
+        if reservation and "token" in reservation:
+            print(f"INFO: Reserved version {reservation['name']}")
+            return reservation
+        return None
+
+    def publish_version(self, folder_name, asset_name, department_name, task_name, file_name):
+        """
+        Publish a file, under a version number reserved on the server.
+
+        Two artists publishing the same vNNN at once never overwrite each
+        other: the first one keeps the number, the next one gets the next
+        free number and its local file is renamed to it before the upload.
+        Files that aren't versions, and publishes queued offline (checked
+        for conflicts when replayed), go through publish_file unchanged.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            task_name (str): Task name
+            file_name (str): File to publish
+
+        Returns:
+            str or None: Published file name (differs from file_name if the
+                number was taken), None on failure
+        """
+        if connection_manager.is_connected and MASTER_PATTERN.match(file_name) \
+                and self._promote_master_on_server(folder_name, asset_name, department_name, task_name, file_name):
+            return file_name
+
+        match = VERSION_PATTERN.match(file_name)
+        if match is None or not connection_manager.is_connected:
+            return file_name if self.publish_file(folder_name, asset_name, department_name, task_name, file_name) else None
+
+        asset, task, version, extension = match.groups()
+        task_folder = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name)
+        reservation = self.reserve_version(folder_name, asset_name, department_name, task_name,
+                                           asset, task, extension, min_version=int(version))
+        if reservation is not None and reservation["name"] != file_name \
+                and os.path.exists(os.path.join(task_folder, reservation["name"])):
+            # That number is used locally too: take one above every local version
+            reservation = self.reserve_version(
+                folder_name, asset_name, department_name, task_name, asset, task, extension,
+                min_version=version_index.next_version(task_folder, asset, task, extension)
+            )
+        if reservation is None:
+            print(f"ERROR: Could not reserve a version for {file_name}")
+            return None
+
+        if reservation["name"] != file_name:
+            print(f"WARNING: {file_name} is already taken on the server, publishing it as {reservation['name']}")
+            os.replace(os.path.join(task_folder, file_name), os.path.join(task_folder, reservation["name"]))
+            version_index.invalidate(task_folder)
+            file_name = reservation["name"]
+
+        if not self.publish_file(folder_name, asset_name, department_name, task_name, file_name, reservation=reservation):
+            return None
+
+        # A local master promoted from this version follows it without a second upload
+        master_name = VersionManager().master_name(file_name)
+        if self._promoted_from(task_folder, master_name) == file_name:
+            self.set_master_on_server(folder_name, asset_name, department_name, task_name, file_name)
+        return file_name
+
+    def _promoted_from(self, task_folder, master_name):
+        """
+        Local version a master file was promoted from (same content).
+
+        Args:
+            task_folder (str): Local task folder
+            master_name (str): Master file name
+
+        Returns:
+            str or None: Version file name, None if no version matches
+        """
+        match = MASTER_PATTERN.match(master_name)
+        master_path = os.path.join(task_folder, master_name)
+        if match is None or not os.path.isfile(master_path):
+            return None
+        asset, task, extension = match.groups()
+        master_size = os.path.getsize(master_path)
+        # Newest first: the master is nearly always the latest version
+        for version in reversed(version_index.versions(task_folder, asset, task, extension)):
+            version_name = f"{asset}_{task}_v{version:03d}.{extension}"
+            version_path = os.path.join(task_folder, version_name)
+            try:
+                if os.path.samefile(version_path, master_path) or (
+                        os.path.getsize(version_path) == master_size
+                        and filecmp.cmp(version_path, master_path, shallow=False)):
+                    return version_name
+            except OSError:
+                continue
+        return None
+
+    def _promote_master_on_server(self, folder_name, asset_name, department_name, task_name, master_name):
+        """
+        Publish a master by promoting its version on the server.
+
+        Returns:
+            bool: True if the server promoted the version, False if the
+                master must be uploaded (no matching version, or the
+                version isn't on the server)
+        """
+        task_folder = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name)
+        version_name = self._promoted_from(task_folder, master_name)
+        if version_name is None:
+            return False
+        if self._promote_on_server(folder_name, asset_name, department_name, task_name, version_name):
+            print(f"INFO: Published {master_name} as a promotion of {version_name}")
+            return True
+        return False
+
+    def _promote_on_server(self, folder_name, asset_name, department_name, task_name, version_name):
+        """
+        Promote a version on the server if it holds the same data as the local one.
+
+        The server's vNNN can be another artist's save (local version never
+        published, or renumbered when it was): promoting it would publish
+        the wrong master.
+
+        Returns:
+            bool: True if the server promoted the version
+        """
+        server_path = f"{folder_name}/{asset_name}/{department_name}/{task_name}/{version_name}"
+        local_path = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name,
+                                  version_name)
+        if not connection_manager.matches_server_file(f"{self.context.hash_prefix}/{server_path}", local_path):
+            return False
+        return self.set_master_on_server(folder_name, asset_name, department_name, task_name, version_name)
+
+    def set_master(self, folder_name, asset_name, department_name, task_name, file_name):
+        """
+        Make a version the master, locally and on the server.
+
+        The local master is a clone or copy of the version (VersionManager.promote_master).
+        If the server holds the same version the server promotes it too;
+        otherwise the master is published later with the version (publish_version).
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            task_name (str): Task name
+            file_name (str): Version file
+
+        Returns:
+            bool: True if the local master was set
+        """
+        version_path = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name, file_name)
+        try:
+            VersionManager().promote_master(version_path)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Could not set {file_name} as master: {e}")
+            return False
+        if connection_manager.is_connected \
+                and not self._promote_on_server(folder_name, asset_name, department_name, task_name, file_name):
+            print(f"INFO: {file_name} isn't on the server, its master is published with it")
+        return True
+
+    def publish_file(self, folder_name, asset_name, department_name, task_name, file_name, reservation=None):
         """
         Publish upload a file on the server
 
@@ -204,23 +452,78 @@ class SyncManager:
             department_name (str): Department name
             task_name (str): Task name
             file_name (str): File to Publish
+            reservation (dict): Version reservation of file_name from reserve_version (optional)
 
         Returns:
             bool: True if succesful, False otherwise
         """
-        project_name = self._get_project_name()
         server_path = f"{folder_name}/{asset_name}/{department_name}/{task_name}/{file_name}"
         local_path = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name, file_name)
 
-        success = connection_manager.upload_file_to_server(
-            f"/upload/{project_name}/{server_path}",
-            local_path
-        )
+        if self._queue_if_offline("publish_file", server_path, local_path):
+            return True
+
+        endpoint = f"{self.context.upload_prefix}/{server_path}"
+        if reservation is not None:
+            endpoint += f"?reservation={reservation['token']}"
+
+        success = connection_manager.upload_file_to_server(endpoint, local_path)
         if success:
             return True
         else:
             return False
     
+    def set_master_on_server(self, folder_name, asset_name, department_name, task_name, file_name):
+        """
+        Make a published version the master on the server.
+
+        The server links the version to the master name instead of receiving
+        the same data a second time.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            task_name (str): Task name
+            file_name (str): Published version file
+
+        Returns:
+            bool: True if succesful, False otherwise
+        """
+        server_path = f"{folder_name}/{asset_name}/{department_name}/{task_name}/{file_name}"
+        response = connection_manager.make_post_request(f"{self.context.set_master_prefix}/{server_path}")
+        return bool(response and response.get("master"))
+
+    def delete_on_server(self, relative_paths):
+        """
+        Delete folders or files on the server.
+
+        The deletes go through the offline journal, which sends the
+        consecutive deletes of a project as one batch request in the
+        background (right away when connected, on reconnection otherwise).
+
+        Args:
+            relative_paths (list or str): Paths relative to 02_Production ("Chara/hero/Modeling")
+
+        Returns:
+            bool: True if deleted or queued, False otherwise
+        """
+        if isinstance(relative_paths, str):
+            relative_paths = [relative_paths]
+        if not relative_paths:
+            return True
+
+        if self.offline_journal is not None:
+            for relative_path in relative_paths:
+                self.offline_journal.enqueue(self._get_project_name(), "delete", relative_path)
+            self.offline_journal.replay()
+            return True
+
+        response = connection_manager.make_post_request(
+            self.context.delete_prefix, {"paths": list(relative_paths)}, timeout=30
+        )
+        return response is not None
+    
     def download_file(self, folder_name, asset_name, department_name, task_name, file_name):
         """
         Publish upload a file on the server
@@ -236,14 +539,14 @@ class SyncManager:
             bool: True if succesful, False otherwise
         """
 
-        project_name = self._get_project_name()
         server_path = f"{folder_name}/{asset_name}/{department_name}/{task_name}/{file_name}"
         local_path = os.path.join(self.production_folder, folder_name, asset_name, department_name, task_name, file_name)
         
         # Use the new download method from connection_manager
         success = connection_manager.download_file_from_server(
-            f"/download/{project_name}/{server_path}",
-            local_path
+            f"{self.context.download_prefix}/{server_path}",
+            local_path,
+            hash_endpoint=f"{self.context.hash_prefix}/{server_path}"
         )
         if success:
             return True
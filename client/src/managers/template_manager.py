@@ -0,0 +1,152 @@
+"""
+Template Manager Module
+
+Client copy of the server's named folder templates:
+- Cached in <sparkle_folder>/cache/templates.json, available at once (and offline)
+- Refreshed on connection with the cached version, the server only answers
+  the templates when they changed
+- Local scaffolding of a project, asset or department in a few makedirs;
+  the server side is one instantiate call (see SyncManager.instantiate_template)
+- Falls back to the built-in project_config layout before the first download
+"""
+
+import json
+import os
+from src.config import configSparkle
+from src.config_project import project_config
+from src.connection_manager import connection_manager
+
+
+def default_templates():
+    """
+    Templates built from project_config, used until the server's are known.
+
+    Returns:
+        dict: {name: {"kind", "folders"}}
+    """
+    config = project_config()
+    templates = {
+        "project": {
+            "kind": "project",
+            "folders": [f"{main_folder}/{subfolder}"
+                        for main_folder, subfolders in config.config_project.items() for subfolder in subfolders],
+        },
+        "asset": {
+            "kind": "asset",
+            "folders": [f"{department}/{task}" for department, tasks in config.department.items() for task in tasks],
+        },
+    }
+    for department, tasks in config.department.items():
+        templates[department] = {"kind": "department", "folders": list(tasks)}
+    return templates
+
+
+class TemplateCache:
+    """
+    Cached list of the server templates.
+
+    Reads never touch the network; refresh() is a single small request that
+    returns only a version when nothing changed.
+    """
+
+    def __init__(self, cache_file=None):
+        """
+        Load the cached templates.
+
+        Args:
+            cache_file (str): Optional cache path, defaults to
+                <sparkle_folder>/cache/templates.json
+        """
+        if cache_file is None:
+            cache_file = configSparkle().sparkle_folder / "cache" / "templates.json"
+        self.cache_file = str(cache_file)
+        self.version = None
+        self._templates = default_templates()
+        self._load_cache()
+        connection_manager.connection_changed.connect(self._on_connection_changed)
+
+    def _load_cache(self):
+        """Read the cached copy, keep the defaults if there is none."""
+        try:
+            with open(self.cache_file, "r") as f:
+                cached = json.load(f)
+            self._templates = cached["templates"]
+            self.version = cached["version"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save_cache(self):
+        """Write the cached copy atomically."""
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"version": self.version, "templates": self._templates}, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+
+    def _on_connection_changed(self, connected):
+        if connected:
+            self.refresh()
+
+    def refresh(self):
+        """
+        Update the cache from the server if its templates changed.
+
+        Returns:
+            bool: True if the templates changed
+        """
+        endpoint = "/templates" if self.version is None else f"/templates?since={self.version}"
+        response = connection_manager.make_request(endpoint)
+        if not response or response.get("unchanged") or "templates" not in response:
+            return False
+        self._templates = response["templates"]
+        self.version = response["version"]
+        try:
+            self._save_cache()
+        except OSError as e:
+            print(f"WARNING: Could not cache the templates: {e}")
+        print(f"INFO: Templates updated to version {self.version}")
+        return True
+
+    def names(self, kind):
+        """
+        Args:
+            kind (str): "project", "asset" or "department"
+
+        Returns:
+            list: Template names of that kind, sorted
+        """
+        return sorted(name for name, template in self._templates.items() if template.get("kind") == kind)
+
+    def get(self, name):
+        """
+        Args:
+            name (str): Template name
+
+        Returns:
+            dict or None: {"kind", "folders"} of the template
+        """
+        return self._templates.get(name)
+
+    def scaffold(self, name, base_folder):
+        """
+        Create the folders of a template locally.
+
+        Args:
+            name (str): Template name
+            base_folder (str): Project root (project templates), asset or department folder
+
+        Returns:
+            list: Template folders (relative to base_folder), empty if the template is unknown
+        """
+        template = self.get(name)
+        if template is None:
+            print(f"WARNING: Unknown template '{name}'")
+            return []
+        os.makedirs(base_folder, exist_ok=True)
+        for folder in template["folders"]:
+            os.makedirs(os.path.join(base_folder, *folder.split("/")), exist_ok=True)
+        return list(template["folders"])
+
+
+# Global singleton instance
+template_cache = TemplateCache()
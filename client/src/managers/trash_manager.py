@@ -0,0 +1,160 @@
+"""
+Trash Manager Module
+
+Instant local deletes:
+- The deleted folder or file is renamed into the project trash folder
+  (".sparkle_trash" next to 02_Production, same drive), which takes no time
+  whatever its size
+- A background thread reclaims the trash at a throttled pace and reports
+  its progress, so the UI never freezes on a large delete
+- Leftovers of an interrupted reclaim are picked up on the next start
+"""
+
+import os
+import shutil
+import time
+import uuid
+from PySide6.QtCore import QObject, QThread, Signal
+
+
+TRASH_FOLDER = ".sparkle_trash"
+
+
+class ReclaimWorker(QThread):
+    """Deletes the trashed entries of a trash folder, bottom-up, in batches."""
+
+    # Signals
+    progress = Signal(str, int)   # Entry name, files deleted so far
+    entry_reclaimed = Signal(str) # Entry name
+
+    BATCH_SIZE = 500
+    BATCH_PAUSE = 0.05  # Seconds between batches, leaves disk time to the artist
+
+    def __init__(self, trash_folder):
+        """
+        Args:
+            trash_folder (str): Trash folder to empty
+        """
+        super().__init__()
+        self.trash_folder = trash_folder
+        self.failed = set()  # Entries that couldn't be deleted (files in use)
+
+    def run(self):
+        """Reclaim every entry, including the ones trashed while running."""
+        while True:
+            try:
+                entries = [name for name in sorted(os.listdir(self.trash_folder)) if name not in self.failed]
+            except FileNotFoundError:
+                return
+            if not entries:
+                return
+            for name in entries:
+                try:
+                    self._reclaim(name)
+                except OSError as e:
+                    print(f"WARNING: Could not empty {name} from the trash: {e}")
+                    self.failed.add(name)
+
+    def _reclaim(self, name):
+        """Delete one trashed entry."""
+        path = os.path.join(self.trash_folder, name)
+        if not os.path.isdir(path) or os.path.islink(path):
+            os.remove(path)
+            self.entry_reclaimed.emit(name)
+            return
+
+        deleted = 0
+        for root, dirs, files in os.walk(path, topdown=False):
+            for file_name in files:
+                try:
+                    os.remove(os.path.join(root, file_name))
+                except FileNotFoundError:
+                    pass
+                deleted += 1
+                if deleted % self.BATCH_SIZE == 0:
+                    self.progress.emit(name, deleted)
+                    time.sleep(self.BATCH_PAUSE)
+            for dir_name in dirs:
+                dir_path = os.path.join(root, dir_name)
+                if os.path.islink(dir_path):
+                    os.remove(dir_path)
+                else:
+                    os.rmdir(dir_path)
+        shutil.rmtree(path, ignore_errors=True)
+        self.progress.emit(name, deleted)
+        self.entry_reclaimed.emit(name)
+
+
+class LocalTrash(QObject):
+    """
+    Local trash of the project folders.
+
+    Deletes are a rename into the trash; reclaiming the space happens in a
+    ReclaimWorker per trash folder.
+    """
+
+    # Signals
+    progress = Signal(str, int)    # Entry name, files deleted so far
+    entry_reclaimed = Signal(str)  # Entry name
+
+    def __init__(self):
+        """Initialize the trash, no reclaim runs until something is trashed."""
+        super().__init__()
+        self.workers = {}
+
+    @staticmethod
+    def trash_folder(project_root):
+        """
+        Args:
+            project_root (str): Project root folder
+
+        Returns:
+            str: Trash folder of the project
+        """
+        return os.path.join(project_root, TRASH_FOLDER)
+
+    def move_to_trash(self, path, project_root):
+        """
+        Delete a folder or file by moving it to the project trash.
+
+        Args:
+            path (str): Folder or file to delete
+            project_root (str): Root folder of the project holding path
+
+        Raises:
+            OSError: The path can't be moved (in use, permissions)
+        """
+        trash_folder = self.trash_folder(project_root)
+        os.makedirs(trash_folder, exist_ok=True)
+        os.rename(path, os.path.join(trash_folder, f"{uuid.uuid4().hex}_{os.path.basename(path)}"))
+        print(f"INFO: Moved {path} to the trash")
+        self.reclaim(project_root)
+
+    def reclaim(self, project_root):
+        """
+        Start reclaiming a project trash in the background (no-op if running or empty).
+
+        Args:
+            project_root (str): Root folder of the project
+        """
+        trash_folder = self.trash_folder(project_root)
+        worker = self.workers.get(trash_folder)
+        if worker is not None and worker.isRunning():
+            # The running worker lists the folder again before it stops
+            return
+        failed = worker.failed if worker is not None else set()
+        if not os.path.isdir(trash_folder) or not set(os.listdir(trash_folder)) - failed:
+            return
+
+        worker = ReclaimWorker(trash_folder)
+        worker.progress.connect(self.progress)
+        worker.entry_reclaimed.connect(self.entry_reclaimed)
+        # Something trashed just as the worker stopped is picked up here
+        worker.finished.connect(lambda: self.reclaim(project_root))
+        self.workers[trash_folder] = worker
+        worker.start()
+
+    def wait(self):
+        """Block until every reclaim is over (application exit)."""
+        for worker in self.workers.values():
+            worker.wait()
@@ -1,173 +1,136 @@
 """
 UI Population Manager Module
 
-Handles UI widget population and visual feedback:
-- Populating asset tree with color coding
-- Populating department and task lists
+Handles UI model population and visual feedback:
+- Populating the asset tree model with sync statuses
+- Populating department, task and file list models
 - Visual status indicators
 """
 
-from PySide6.QtWidgets import QTreeWidgetItem, QListWidgetItem
-from PySide6.QtGui import QBrush, QColor
+from PySide6.QtGui import QColor
 
 
 class UIPopulationManager:
     """
-    Manages population of UI widgets with data and visual feedback.
+    Manages population of the browser models with data and visual feedback.
     
-    This class handles populating tree widgets and lists with appropriate
-    color coding based on sync status.
+    This class computes sync statuses and hands them to the item models,
+    which update their rows in place and color them by status.
     """
     
     @staticmethod
-    def populate_asset_tree(asset_tree, local_assets, server_assets, asset_manager):
+    def populate_asset_tree(asset_model, local_assets, server_assets, asset_manager, statuses=None):
         """
-        Populate asset tree with local and server data, applying color coding.
-        
+        Populate asset tree model with local and server data, applying color coding.
+
         Args:
-            asset_tree: QTreeWidget to populate
+            asset_model: AssetTreeModel to populate
             local_assets (dict): Local assets data
             server_assets (dict): Server assets data
             asset_manager: AssetManager instance for status detection
+            statuses (dict): Precomputed (folder_name, asset_name) -> status info,
+                e.g. from the sync-state cache (optional)
+
+        Returns:
+            dict: Status info used for each (folder_name, asset_name)
         """
-        # Get all unique folder types from both sources
-        all_folders = set(local_assets.keys()) | set(server_assets.keys())
-        
-        for folder_name in sorted(all_folders):
-            folder_item = QTreeWidgetItem(asset_tree)
-            folder_item.setText(0, folder_name)
-            
-            # Get all unique assets in this folder from both sources
-            local_set = local_assets.get(folder_name, set())
-            server_set = set(server_assets.get(folder_name, []))  # Convert to set
-            all_assets = local_set | server_set
-            
-            for asset_name in sorted(all_assets):
-                asset_item = QTreeWidgetItem(folder_item)
-                asset_item.setText(0, asset_name)
-                
-                # Apply color coding based on sync status
-                # Use advanced status for detailed feedback
-                status_info = asset_manager.get_advanced_asset_status(folder_name, asset_name, local_assets, server_assets)
-                color = UIPopulationManager._get_status_color(status_info['status'])
-                asset_item.setForeground(0, QBrush(color))
-                asset_item.setToolTip(0, status_info['tooltip'])
+        # Compute the status of the whole tree in one pass unless already known
+        if statuses is None:
+            statuses = asset_manager.get_asset_tree_status(local_assets, server_assets)
+
+        # Fill assets missing from precomputed statuses (e.g. partial cache)
+        for folder_name in set(local_assets.keys()) | set(server_assets.keys()):
+            all_assets = set(local_assets.get(folder_name, set())) | set(server_assets.get(folder_name, []))
+            for asset_name in all_assets:
+                if (folder_name, asset_name) not in statuses:
+                    statuses[(folder_name, asset_name)] = asset_manager.get_advanced_asset_status(
+                        folder_name, asset_name, local_assets, server_assets
+                    )
+
+        asset_model.set_tree(local_assets, server_assets, statuses)
+        return statuses
     
     @staticmethod
-    def populate_department_list(department_list, local_departments, server_departments, asset_manager=None, folder_name=None, asset_name=None):
+    def populate_department_list(department_model, local_departments, server_departments, asset_manager=None, folder_name=None, asset_name=None):
         """
-        Populate department list with color coding based on sync status.
+        Populate department list model with color coding based on sync status.
         
         Args:
-            department_list: QListWidget to populate
+            department_model: StatusListModel to populate
             local_departments (set): Set of local department names
             server_departments (set): Set of server department names
             asset_manager: AssetManager instance for advanced status (optional)
             folder_name (str): Asset type folder name (optional)
             asset_name (str): Asset name (optional)
+
+        Returns:
+            dict: Status info used for each department
         """
-        department_list.clear()
-        
-        # Get all unique departments from both sources
-        all_departments = local_departments | server_departments
-        
-        for department_name in sorted(all_departments):
-            item = QListWidgetItem(department_name)
-            
-            if asset_manager and folder_name and asset_name:
-                # Use advanced status with tooltips
-                status_info = asset_manager.get_advanced_department_status(folder_name, asset_name, department_name)
-                color = UIPopulationManager._get_status_color(status_info['status'])
-                item.setForeground(QBrush(color))
-                item.setToolTip(status_info['tooltip'])
-            else:
-                # Fallback to basic color coding
-                if department_name in local_departments and department_name in server_departments:
-                    item.setForeground(QBrush(QColor(255, 165, 0)))  # Orange
-                elif department_name in local_departments:
-                    item.setForeground(QBrush(QColor(255, 255, 255)))  # White
-                else:
-                    item.setForeground(QBrush(QColor(0, 0, 0)))  # Black
-            
-            department_list.addItem(item)
+        if asset_manager and folder_name and asset_name:
+            # Compute the whole column status in one pass, with tooltips
+            statuses = asset_manager.get_department_column_status(
+                folder_name, asset_name, local_departments, server_departments
+            )
+        else:
+            # Fallback to basic color coding
+            statuses = UIPopulationManager._get_basic_statuses(local_departments, server_departments)
+
+        department_model.set_entries(statuses)
+        return statuses
     
     @staticmethod
-    def populate_task_list(task_list, local_tasks, server_tasks, asset_manager=None, folder_name=None, asset_name=None, department_name=None):
+    def populate_task_list(task_model, local_tasks, server_tasks, asset_manager=None, folder_name=None, asset_name=None, department_name=None):
         """
-        Populate task list with color coding based on sync status.
+        Populate task list model with color coding based on sync status.
         
         Args:
-            task_list: QListWidget to populate
+            task_model: StatusListModel to populate
             local_tasks (set): Set of local task names
             server_tasks (set): Set of server task names
             asset_manager: AssetManager instance for advanced status (optional)
             folder_name (str): Asset type folder name (optional)
             asset_name (str): Asset name (optional)
             department_name (str): Department name (optional)
+
+        Returns:
+            dict: Status info used for each task
         """
-        task_list.clear()
-        
-        # Get all unique tasks from both sources
-        all_tasks = local_tasks | server_tasks
-        
-        for task_name in sorted(all_tasks):
-            item = QListWidgetItem(task_name)
-            
-            if asset_manager and folder_name and asset_name and department_name:
-                # Use advanced status with tooltips
-                status_info = asset_manager.get_advanced_task_status(folder_name, asset_name, department_name, task_name)
-                color = UIPopulationManager._get_status_color(status_info['status'])
-                item.setForeground(QBrush(color))
-                item.setToolTip(status_info['tooltip'])
-            else:
-                # Fallback to basic color coding
-                if task_name in local_tasks and task_name in server_tasks:
-                    item.setForeground(QBrush(QColor(255, 165, 0)))  # Orange
-                elif task_name in local_tasks:
-                    item.setForeground(QBrush(QColor(255, 255, 255)))  # White
-                else:
-                    item.setForeground(QBrush(QColor(0, 0, 0)))  # Black
-            
-            task_list.addItem(item)
+        if asset_manager and folder_name and asset_name and department_name:
+            # Compute the whole column status in one pass, with tooltips
+            statuses = asset_manager.get_task_column_status(
+                folder_name, asset_name, department_name, local_tasks, server_tasks
+            )
+        else:
+            # Fallback to basic color coding
+            statuses = UIPopulationManager._get_basic_statuses(local_tasks, server_tasks)
+
+        task_model.set_entries(statuses)
+        return statuses
     
     @staticmethod
-    def populate_file_list(file_list, local_files, server_files):
+    def populate_file_list(file_model, local_files, server_files):
         """
-        Populate file list with color coding based on sync status.
+        Populate file list model with color coding based on sync status.
         
         Args:
-            file_list: QListWidget to populate
+            file_model: StatusListModel to populate
             local_files (set): Set of local file names
             server_files (set): Set of server file names
+
+        Returns:
+            dict: Status info used for each file
         """
-        file_list.clear()
-        
-        # Get all unique files from both sources
-        all_files = local_files | server_files
-        
-        for file_name in sorted(all_files):
-            item = QListWidgetItem(file_name)
-            
-            # Apply color coding based on presence in local/server
-            if file_name in local_files and file_name in server_files:
-                # Synced - Orange
-                item.setForeground(QBrush(QColor(255, 165, 0)))
-            elif file_name in local_files:
-                # Local only - White (default)
-                item.setForeground(QBrush(QColor(255, 255, 255)))
-            else:
-                # Server only - Black
-                item.setForeground(QBrush(QColor(0, 0, 0)))
-            
-            file_list.addItem(item)
+        statuses = UIPopulationManager._get_basic_statuses(local_files, server_files)
+        file_model.set_entries(statuses)
+        return statuses
 
     @staticmethod
-    def populate_file_list_advanced(file_list, local_files, server_files, asset_manager, folder_name, asset_name, department_name, task_name):
+    def populate_file_list_advanced(file_model, local_files, server_files, asset_manager, folder_name, asset_name, department_name, task_name):
         """
-        Populate file list with advanced color coding and tooltips.
+        Populate file list model with advanced color coding and tooltips.
         
         Args:
-            file_list: QListWidget to populate
+            file_model: StatusListModel to populate
             local_files (set): Set of local file names
             server_files (set): Set of server file names
             asset_manager: AssetManager instance for advanced status detection
@@ -175,26 +138,39 @@ class UIPopulationManager:
             asset_name (str): Asset name
             department_name (str): Department name
             task_name (str): Task name
+
+        Returns:
+            dict: Status info used for each file
         """
-        file_list.clear()
-        
-        # Get all unique files from both sources
-        all_files = local_files | server_files
-        
-        for file_name in sorted(all_files):
-            item = QListWidgetItem(file_name)
-            
-            # Get advanced status with conflict detection
-            status_info = asset_manager.get_advanced_file_status(
-                folder_name, asset_name, department_name, task_name, file_name
-            )
-            
-            # Apply advanced color coding
-            color = UIPopulationManager._get_status_color(status_info['status'])
-            item.setForeground(QBrush(color))
-            item.setToolTip(status_info['tooltip'])
-            
-            file_list.addItem(item)
+        # Get advanced status with conflict detection for the whole column at once
+        statuses = asset_manager.get_file_column_status(
+            folder_name, asset_name, department_name, task_name, local_files, server_files
+        )
+        file_model.set_entries(statuses)
+        return statuses
+
+    @staticmethod
+    def _get_basic_statuses(local_names, server_names):
+        """
+        Presence-only sync status without tooltips.
+
+        Args:
+            local_names (set): Names found locally
+            server_names (set): Names found on the server
+
+        Returns:
+            dict: name -> status info dict
+        """
+        statuses = {}
+        for name in local_names | server_names:
+            if name in local_names and name in server_names:
+                status = "synced"
+            elif name in local_names:
+                status = "local_only"
+            else:
+                status = "server_only"
+            statuses[name] = {'status': status, 'tooltip': ''}
+        return statuses
     
     @staticmethod
     def _get_status_color(status):
@@ -2,15 +2,206 @@
 Version manager module
 
 Handle versionning files in the diferent software
+- Version catalog of task folders, built once per folder and updated on
+  every save instead of rescanning the folder
+- Master promotion without writing the data twice where the file system can
+  clone it (reflink), an independent copy otherwise: masters are edited in
+  place by the DCC apps, a hardlink would rewrite the version
 """
 
 import re
 import os
+import threading
+from bisect import insort
+from shared.file_links import promote_file
+
+VERSION_PATTERN = re.compile(r"^([A-Za-z0-9]+)_([A-Za-z0-9]+)_v(\d{3})\.([A-Za-z0-9]+)$")
+MASTER_PATTERN = re.compile(r"^([A-Za-z0-9]+)_([A-Za-z0-9]+)_master\.([A-Za-z0-9]+)$")
+
+
+class _FolderIndex:
+    """Versions and masters of one task folder."""
+
+    def __init__(self, mtime):
+        self.mtime = mtime
+        self.versions = {}    # (asset, task, extension) -> sorted version numbers
+        self.masters = {}     # (asset, task, extension) -> master file name
+        self.pending = set()  # Names handed out by a save-as, not on disk yet
+        self.expected = set() # Names a save may write, cataloged only once on disk
+
+    def add(self, filename):
+        """Catalog a file name, returns False if it isn't a version/master file."""
+        match = VERSION_PATTERN.match(filename)
+        if match:
+            asset, task, version, extension = match.groups()
+            versions = self.versions.setdefault((asset, task, extension), [])
+            if int(version) not in versions:
+                insort(versions, int(version))
+            return True
+        match = MASTER_PATTERN.match(filename)
+        if match:
+            self.masters[match.groups()] = filename
+            return True
+        return False
+
+
+class VersionIndex:
+    """
+    Catalog of the versions of each task folder.
+
+    A folder is listed once, then kept up to date by the saves going through
+    VersionManager, so computing the next version doesn't rescan the folder.
+    A folder modified by anything else (download, file explorer) is detected
+    by its mtime and listed again.
+    """
 
-class VersionManager:
     def __init__(self):
-        self.pattern = r"^([A-Za-z0-9]+)_([A-Za-z0-9]+)_v(\d{3})\.([A-Za-z0-9]+)$"
-        self.master_pattern = r"^([A-Za-z0-9]+)_([A-Za-z0-9]+)_master\.([A-Za-z0-9]+)$"
+        """Initialize an empty catalog."""
+        self._folders = {}
+        self._lock = threading.Lock()
+
+    def _folder(self, directory_path):
+        """
+        Index of a folder, listed again only if it changed behind our back.
+
+        Returns:
+            _FolderIndex: Catalog of the folder
+        """
+        directory_path = os.path.normpath(directory_path)
+        mtime = os.stat(directory_path).st_mtime_ns
+        folder = self._folders.get(directory_path)
+        if folder is not None and folder.mtime != mtime:
+            created = {name for name in folder.pending | folder.expected
+                       if os.path.exists(os.path.join(directory_path, name))}
+            if created:
+                # Changed by our own saves: catalog what they wrote
+                folder.mtime = mtime
+                folder.pending -= created
+                for name in created & folder.expected:
+                    folder.add(name)
+                folder.expected -= created
+            else:
+                folder = None
+
+        if folder is None:
+            previous = self._folders.get(directory_path)
+            folder = _FolderIndex(mtime)
+            with os.scandir(directory_path) as entries:
+                for entry in entries:
+                    folder.add(entry.name)
+            if previous is not None:
+                # Versions handed out but not saved yet stay reserved
+                for name in previous.pending:
+                    if folder.add(name) and not os.path.exists(os.path.join(directory_path, name)):
+                        folder.pending.add(name)
+                folder.expected = {name for name in previous.expected
+                                   if not os.path.exists(os.path.join(directory_path, name))}
+            self._folders[directory_path] = folder
+        return folder
+
+    def versions(self, directory_path, asset, task, extension):
+        """
+        Args:
+            directory_path (str): Task folder
+            asset (str): Asset name
+            task (str): Task name
+            extension (str): File extension without the dot
+
+        Returns:
+            list: Version numbers, ascending
+        """
+        with self._lock:
+            return list(self._folder(directory_path).versions.get((asset, task, extension), []))
+
+    def latest(self, directory_path, asset, task, extension):
+        """
+        Returns:
+            int or None: Highest version number, None if there is none
+        """
+        with self._lock:
+            versions = self._folder(directory_path).versions.get((asset, task, extension))
+            return versions[-1] if versions else None
+
+    def next_version(self, directory_path, asset, task, extension):
+        """
+        Returns:
+            int: Version number the next save should use
+        """
+        latest = self.latest(directory_path, asset, task, extension)
+        return (latest or 0) + 1
+
+    def master(self, directory_path, asset, task, extension):
+        """
+        Returns:
+            str or None: Master file name, None if there is none
+        """
+        with self._lock:
+            return self._folder(directory_path).masters.get((asset, task, extension))
+
+    def has_versions(self, directory_path):
+        """True if the folder holds at least one version file."""
+        with self._lock:
+            return any(self._folder(directory_path).versions.values())
+
+    def has_master(self, directory_path):
+        """True if the folder holds a master file."""
+        with self._lock:
+            return bool(self._folder(directory_path).masters)
+
+    def record(self, directory_path, filename):
+        """
+        Catalog a version or master file about to be written by a save.
+
+        Args:
+            directory_path (str): Task folder
+            filename (str): Name of the saved file
+        """
+        with self._lock:
+            folder = self._folder(directory_path)
+            if folder.add(filename) and not os.path.exists(os.path.join(directory_path, filename)):
+                folder.pending.add(filename)
+
+    def expect(self, directory_path, filename):
+        """
+        Note a file a save may write (e.g. the master of a save-as).
+
+        Unlike record, the file is only cataloged once it exists, so
+        has_master/master never report a master that was not written.
+
+        Args:
+            directory_path (str): Task folder
+            filename (str): Name of the file
+        """
+        with self._lock:
+            folder = self._folder(directory_path)
+            if os.path.exists(os.path.join(directory_path, filename)):
+                folder.add(filename)
+            else:
+                folder.expected.add(filename)
+
+    def invalidate(self, directory_path=None):
+        """
+        Forget a folder (or every folder), it is listed again on next use.
+
+        Args:
+            directory_path (str): Task folder, None for all
+        """
+        with self._lock:
+            if directory_path is None:
+                self._folders.clear()
+            else:
+                self._folders.pop(os.path.normpath(directory_path), None)
+
+
+# Global singleton instance
+version_index = VersionIndex()
+
+
+class VersionManager:
+    def __init__(self, index=None):
+        self.pattern = VERSION_PATTERN
+        self.master_pattern = MASTER_PATTERN
+        self.index = index if index is not None else version_index
 
     def clean_name(self, name):
         """
@@ -23,30 +214,20 @@ class VersionManager:
             Clean name without space or spécial character
         """
         return re.sub(r'[^A-Za-z0-9]', '', name)
-    
+
     def is_versioned_file(self, directory_path):
         """
         Verify if a verion file already exist
         """
+        return self.index.has_versions(directory_path)
 
-        is_version_file = False
-        for file in os.listdir(directory_path):
-            if re.fullmatch(self.pattern, file):
-                is_version_file = True
-        return is_version_file
-    
     def is_master_file(self, directory_path):
         """
         Verify if the a master file already exist
         """
+        return self.index.has_master(directory_path)
 
-        is_master_file = False
-        for file in os.listdir(directory_path):
-            if re.fullmatch(self.master_pattern, file):
-                is_master_file = True
-        return is_master_file
 
-    
     def parse_filename(self, filename):
         """
         Cute the filename in four piece
@@ -57,15 +238,15 @@ class VersionManager:
             Dic: with the four part of the filename
 
         """
-        match = re.match(self.pattern, filename)
+        match = self.pattern.match(filename)
         if match:
             return {
                 "asset_name": match.group(1),
                 "task_name": match.group(2),
                 "version": int(match.group(3)),
-                "extension": match.group(4)  
+                "extension": match.group(4)
             }
-    
+
     def get_next_version_number(self, directory_path, asset, task, extension):
         """
         Change the version of the filename
@@ -78,27 +259,66 @@ class VersionManager:
         Returns:
             New filename
         """
-        max_version = 0
-
-        files = os.listdir(directory_path)
-        for file in files:
-            if file.startswith(f"{asset}_{task}_v"):
-                name = self.parse_filename(file)
-                version = name.get("version", "")
-                if max_version < version:
-                    max_version = version
-        if max_version > 0:
-            new_version = max_version + 1
-            new_name = f"{asset}_{task}_v{new_version:03d}.{extension}"
-        else:
-            new_name =f"{asset}_{task}_v001.{extension}"
-        return new_name     
-
-    def creat_version_save_as(self, directory_path, asset, task, extension):
-
-        version = self.get_next_version_number(directory_path, asset, task, extension)
+        new_version = self.index.next_version(directory_path, asset, task, extension)
+        return f"{asset}_{task}_v{new_version:03d}.{extension}"
+
+    def creat_version_save_as(self, directory_path, asset, task, extension, reserved_name=None):
+        """
+        Paths of the next version and of the master
+
+        Args:
+            directory_path: Local Path of the file
+            asset: asset_name
+            task: task_name
+            extension: .blend, .mb, .hipnic
+            reserved_name: Version name reserved on the server
+                (SyncManager.reserve_version), used instead of the local count
+        Returns:
+            Version path and master path
+        """
+        version = reserved_name or self.get_next_version_number(directory_path, asset, task, extension)
         version_path = os.path.join(directory_path, version)
         master = f"{asset}_{task}_master.{extension}"
         master_path = os.path.join(directory_path, master)
 
-        return version_path, master_path
\ No newline at end of file
+        # Catalog the save so the next one doesn't rescan the folder; the
+        # master only counts once it is written (saved or promote_master)
+        self.index.record(directory_path, version)
+        self.index.expect(directory_path, master)
+
+        return version_path, master_path
+
+    def master_name(self, version_name):
+        """
+        Master file name of a version file name
+
+        Args:
+            version_name: Version file name
+        Returns:
+            Master file name, None if version_name isn't a version file
+        """
+        name = self.parse_filename(version_name)
+        if not name:
+            return None
+        return f"{name['asset_name']}_{name['task_name']}_master.{name['extension']}"
+
+    def promote_master(self, version_path):
+        """
+        Make a saved version the master, instead of saving the scene twice
+
+        Args:
+            version_path: Path of the saved version file
+        Returns:
+            Master path
+        """
+        directory_path, version_name = os.path.split(version_path)
+        master = self.master_name(version_name)
+        if not master:
+            raise ValueError(f"Not a version file: {version_name}")
+        master_path = os.path.join(directory_path, master)
+
+        # Never a hardlink: artists open and save masters, that would rewrite the version
+        method = promote_file(version_path, master_path, hardlink=False)
+        self.index.record(directory_path, master)
+        print(f"INFO: Master set to {version_name} ({method})")
+        return master_path
@@ -3,16 +3,54 @@ CRUD Operations Module
 
 Handles all Create, Read, Update, Delete operations including:
 - Create dialogs for assets, departments, and tasks
+- Scaffolding from the server templates (local folders plus one server call)
 - Delete operations with confirmation
 - File and folder management
 """
 
 import os
-import shutil
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (QMainWindow, QHBoxLayout, QVBoxLayout, QLineEdit, 
-                               QPushButton, QMessageBox, QWidget)
+                               QPushButton, QMessageBox, QWidget, QComboBox)
 from ui.ui_utility import stylesheet
+from src.managers.template_manager import template_cache
+
+NO_TEMPLATE = "No template"
+
+
+def template_combo(kind):
+    """
+    Combo box listing the cached templates of a kind.
+
+    Args:
+        kind (str): "asset" or "department"
+
+    Returns:
+        QComboBox: NO_TEMPLATE first, then the template names
+    """
+    combo = QComboBox()
+    combo.addItem(NO_TEMPLATE)
+    combo.addItems(template_cache.names(kind))
+    return combo
+
+
+def apply_template(parent, template_name, path):
+    """
+    Scaffold a folder from a template, locally then on the server.
+
+    Args:
+        parent: FileManager instance
+        template_name (str): Template name (NO_TEMPLATE only creates the folder)
+        path (str): Local asset or department folder
+    """
+    if template_name == NO_TEMPLATE:
+        os.makedirs(path, exist_ok=True)
+        return
+    folders = template_cache.scaffold(template_name, path)
+    sync_manager = getattr(parent, "sync_manager", None)
+    if sync_manager is not None:
+        relative_path = os.path.relpath(path, parent.production_folder).replace(os.sep, "/")
+        sync_manager.instantiate_template(template_name, relative_path, folders)
 
 
 class CreateAssetDialog(QMainWindow):
@@ -28,7 +66,7 @@ class CreateAssetDialog(QMainWindow):
         """
         super().__init__()
         self.setWindowTitle("Create New Asset")
-        self.setFixedSize(300, 150)
+        self.setFixedSize(300, 180)
         self.raise_()
         self.activateWindow()
 
@@ -43,6 +81,11 @@ class CreateAssetDialog(QMainWindow):
         self.name.setPlaceholderText("Name :")
         layout.addWidget(self.name)
 
+        self.template = template_combo("asset")
+        if self.template.count() > 1:
+            self.template.setCurrentIndex(1)
+        layout.addWidget(self.template)
+
         create_btn = QPushButton("Create")
         create_btn.clicked.connect(self.create_asset)
         layout.addWidget(create_btn)
@@ -59,7 +102,7 @@ class CreateAssetDialog(QMainWindow):
             return
         
         asset_path = os.path.join(self.folder_path, name)
-        os.makedirs(asset_path, exist_ok=True)
+        apply_template(self.parent, self.template.currentText(), asset_path)
 
         # Refresh parent view if available
         if self.parent and hasattr(self.parent, 'refresh_all'):
@@ -81,7 +124,7 @@ class CreateDepartmentDialog(QMainWindow):
         """
         super().__init__()
         self.setWindowTitle("Create New Department")
-        self.setFixedSize(300, 150)
+        self.setFixedSize(300, 180)
         self.raise_()
         self.activateWindow()
 
@@ -96,6 +139,11 @@ class CreateDepartmentDialog(QMainWindow):
         self.name.setPlaceholderText("Name :")
         layout.addWidget(self.name)
 
+        # Picking a template names the department after it unless another name is typed
+        self.template = template_combo("department")
+        self.template.currentTextChanged.connect(self._on_template_changed)
+        layout.addWidget(self.template)
+
         create_btn = QPushButton("Create")
         create_btn.clicked.connect(self.create_department)
         layout.addWidget(create_btn)
@@ -104,6 +152,10 @@ class CreateDepartmentDialog(QMainWindow):
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
 
+    def _on_template_changed(self, template_name):
+        if template_name != NO_TEMPLATE and self.name.text() in ("", *template_cache.names("department")):
+            self.name.setText(template_name)
+
     def create_department(self):
         """Create new department with validation."""
         name = self.name.text()
@@ -112,7 +164,7 @@ class CreateDepartmentDialog(QMainWindow):
             return
         
         department_path = os.path.join(self.asset_path, name)
-        os.makedirs(department_path, exist_ok=True)
+        apply_template(self.parent, self.template.currentText(), department_path)
 
         # Refresh parent view if available
         if self.parent and hasattr(self.parent, 'refresh_current_asset'):
@@ -180,110 +232,77 @@ class DeleteOperations:
     @staticmethod
     def delete_item(parent):
         """
-        Delete currently selected item with confirmation.
-        
+        Delete the items selected in the focused column with one confirmation.
+
+        Several items (Ctrl/Shift selection) are deleted together: moved to
+        the local trash, then sent to the server as a single batch.
+
         Args:
             parent: FileManager instance containing the UI components
         """
-        asset = parent.asset_tree.currentItem()
-        department = parent.department_list.currentItem()
-        task = parent.task_list.currentItem()
-        file_item = parent.file_list.currentItem() if hasattr(parent, 'file_list') else None
-        
-        asset_name = asset.text(0) if asset else None
-        folder = asset.parent() if asset else None
-        folder_name = folder.text(0) if folder else None
-        department_name = department.text() if department else None
-        task_name = task.text() if task else None
-        file_name = file_item.text() if file_item else None
-        
-        if parent.asset_tree.hasFocus():
-            DeleteOperations._delete_asset(parent, asset_name, folder_name)
-        elif parent.department_list.hasFocus():
-            DeleteOperations._delete_department(parent, folder_name, asset_name, department_name)
-        elif parent.task_list.hasFocus():
-            DeleteOperations._delete_task(parent, folder_name, asset_name, department_name, task_name)
-        elif hasattr(parent, 'file_list') and parent.file_list.hasFocus():
-            DeleteOperations._delete_file(parent, folder_name, asset_name, department_name, task_name, file_name)
-    
-    @staticmethod
-    def _delete_asset(parent, asset_name, folder_name):
-        """Delete asset with confirmation."""
-        if not asset_name or not folder_name:
-            return
-        
-        result = QMessageBox.question(
-            parent, 
-            "Delete Asset", 
-            f"Delete '{asset_name}'?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
+        columns = (
+            (parent.asset_tree, "Asset", parent.refresh_all),
+            (parent.department_list, "Department", parent.refresh_current_asset),
+            (parent.task_list, "Task", parent.refresh_current_department),
+            (parent.file_list, "File", parent.refresh_current_task),
         )
-        
-        if result == QMessageBox.Yes:
-            asset_path = os.path.join(parent.production_folder, folder_name, asset_name)
-            shutil.rmtree(asset_path)
-            parent.refresh_all()
-    
-    @staticmethod
-    def _delete_department(parent, folder_name, asset_name, department_name):
-        """Delete department with confirmation."""
-        if not folder_name or not asset_name or not department_name:
-            return
-        
-        result = QMessageBox.question(
-            parent, 
-            "Delete Department", 
-            f"Delete '{department_name}'?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-        
-        if result == QMessageBox.Yes:
-            dept_path = os.path.join(parent.production_folder, folder_name, asset_name, department_name)
-            shutil.rmtree(dept_path)
-            parent.refresh_current_asset()
-    
+        for view, label, refresh in columns:
+            if view.hasFocus():
+                paths = parent.get_selected_paths(view)
+                if paths and DeleteOperations._confirm(parent, label, paths):
+                    if DeleteOperations._delete_everywhere(parent, paths):
+                        refresh()
+                return
+
     @staticmethod
-    def _delete_task(parent, folder_name, asset_name, department_name, task_name):
-        """Delete task with confirmation."""
-        if not folder_name or not asset_name or not department_name or not task_name:
-            return
-        
+    def _confirm(parent, label, paths):
+        """Ask once for all the items, returns True if confirmed."""
+        if len(paths) == 1:
+            question = f"Delete '{paths[0][-1]}'?"
+        else:
+            names = "\n".join(path[-1] for path in paths[:10])
+            more = f"\n... and {len(paths) - 10} more" if len(paths) > 10 else ""
+            question = f"Delete these {len(paths)} {label.lower()}s?\n\n{names}{more}"
+
         result = QMessageBox.question(
             parent, 
-            "Delete Task", 
-            f"Delete '{task_name}'?",
+            f"Delete {label}", 
+            question,
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
-        
-        if result == QMessageBox.Yes:
-            task_path = os.path.join(parent.production_folder, folder_name, asset_name, department_name, task_name)
-            shutil.rmtree(task_path)
-            parent.refresh_current_department()
-    
+        return result == QMessageBox.Yes
+
     @staticmethod
-    def _delete_file(parent, folder_name, asset_name, department_name, task_name, file_name):
-        """Delete file with confirmation."""
-        if not folder_name or not asset_name or not department_name or not task_name or not file_name:
-            return
-        
-        result = QMessageBox.question(
-            parent, 
-            "Delete File", 
-            f"Delete '{file_name}'?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-        
-        if result == QMessageBox.Yes:
-            file_path = os.path.join(parent.production_folder, folder_name, asset_name, department_name, task_name, file_name)
-            if os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-            else:
-                os.remove(file_path)
-            parent.refresh_current_task()
+    def _delete_everywhere(parent, paths):
+        """
+        Delete folders or files locally and on the server.
+
+        The local copies are moved to the project trash (instant, reclaimed
+        in the background); the server deletes go through the sync queue as
+        one batch request.
+
+        Args:
+            parent: FileManager instance
+            paths (list): Path parts below 02_Production of each item
+
+        Returns:
+            bool: True if anything was deleted
+        """
+        deleted = []
+        for parts in paths:
+            local_path = os.path.join(parent.production_folder, *parts)
+            if os.path.lexists(local_path):
+                try:
+                    parent.local_trash.move_to_trash(local_path, parent.project_folder)
+                except OSError as e:
+                    QMessageBox.warning(parent, "Delete Failed", f"Could not delete '{parts[-1]}':\n{e}")
+                    continue
+            deleted.append("/".join(parts))
+
+        if deleted:
+            parent.sync_manager.delete_on_server(deleted)
+        return bool(deleted)
 
 
 # Legacy compatibility functions (to be removed later)
@@ -0,0 +1,132 @@
+"""
+Project Context Module
+
+Single description of the active project, resolved once when it is loaded:
+- Project name, root folder and 02_Production folder
+- Server endpoint prefixes of the project
+- Atomic swap on project switch with one notification to invalidate every
+  derived cache
+"""
+
+import os
+from urllib.parse import quote
+from PySide6.QtCore import QObject, Signal
+from src.config import configSparkle
+
+
+class ProjectContext:
+    """
+    Immutable paths and endpoints of one project.
+
+    Build a new context instead of modifying one: holders only ever swap the
+    reference, so a reader never sees half of two projects.
+    """
+
+    def __init__(self, project_folder):
+        """
+        Resolve every path and endpoint of a project.
+
+        Args:
+            project_folder (str): Project root folder ("" if no project is active)
+        """
+        self.root = os.path.normpath(project_folder) if project_folder else ""
+        self.name = os.path.basename(self.root)
+        self.production_folder = os.path.join(self.root, "02_Production")
+
+        # Server endpoint prefixes (append "/<relative path>" where needed)
+        project = quote(self.name)
+        self.api_prefix = f"/projects/{project}"
+        self.status_endpoint = f"/status/{project}"
+        self.stat_endpoint = f"/stat/{project}"
+        self.upload_prefix = f"/upload/{project}"
+        self.download_prefix = f"/download/{project}"
+        self.hash_prefix = f"/hash/{project}"
+        self.reserve_version_prefix = f"/reserve_version/{project}"
+        self.set_master_prefix = f"/set_master/{project}"
+        self.create_folder_prefix = f"/create_folder/{project}"
+        self.instantiate_prefix = f"/instantiate/{project}"
+        self.delete_prefix = f"/delete/{project}"
+
+    @property
+    def is_valid(self):
+        """True if a project is active."""
+        return bool(self.name)
+
+    def local_path(self, *parts):
+        """
+        Local path inside the production folder.
+
+        Args:
+            *parts (str): Folder/file names below 02_Production
+
+        Returns:
+            str: Absolute local path
+        """
+        return os.path.join(self.production_folder, *parts)
+
+    def __eq__(self, other):
+        return isinstance(other, ProjectContext) and other.root == self.root
+
+    def __hash__(self):
+        return hash(self.root)
+
+    def __repr__(self):
+        return f"ProjectContext({self.name!r})"
+
+
+class ProjectContextManager(QObject):
+    """
+    Holder of the active ProjectContext.
+
+    Follows "project_active_folder" in the config: loading another project
+    swaps the context and emits context_changed once, which is the single
+    place where project-derived state must be invalidated.
+    """
+
+    # Signals
+    context_changed = Signal(object, object)  # New context, previous context
+
+    def __init__(self):
+        """Initialize the holder, the context is resolved on first use."""
+        super().__init__()
+        self._context = None
+        configSparkle.add_listener(self._on_config_changed)
+
+    @property
+    def context(self):
+        """
+        Returns:
+            ProjectContext: Context of the active project
+        """
+        if self._context is None:
+            self._context = ProjectContext(configSparkle().load_config().get("project_active_folder", ""))
+        return self._context
+
+    def switch(self, project_folder):
+        """
+        Make another project active.
+
+        Args:
+            project_folder (str): Root folder of the project to activate
+
+        Returns:
+            ProjectContext: The new context
+        """
+        previous = self.context
+        context = ProjectContext(project_folder)
+        if context == previous:
+            return previous
+
+        self._context = context
+        print(f"INFO: Active project switched to '{context.name}'")
+        self.context_changed.emit(context, previous)
+        return context
+
+    def _on_config_changed(self, config):
+        # Config saved by the project loader or edited on disk
+        if self._context is not None:
+            self.switch(config.get("project_active_folder", ""))
+
+
+# Global singleton instance
+project_contexts = ProjectContextManager()
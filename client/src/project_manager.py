@@ -1,10 +1,12 @@
 import os
 import json
-from PySide6.QtWidgets import QMainWindow, QLineEdit, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QMessageBox, QWidget, QListWidget
+from PySide6.QtWidgets import QMainWindow, QLineEdit, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QMessageBox, QWidget, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt
 from pathlib import Path
 from src.config import configSparkle
 from src.config_project import project_config
 from src.connection_manager import connection_manager
+from src.managers.template_manager import template_cache
 from ui.ui_utility import stylesheet
 from ui.settings import settings
 
@@ -14,7 +16,6 @@ class createProject(QMainWindow):
 
         stylesheet(self)
 
-        self.projectConfig = project_config()
         self.settings = settings
 
         self.config = configSparkle()
@@ -69,10 +70,9 @@ class createProject(QMainWindow):
         try:
             if status == True:
                 # 1. Create project on server first
-                server_response = connection_manager.make_request(
+                server_response = connection_manager.make_post_request(
                     f"/projects/{project_name}",
-                    method="POST",
-                    data={"name": project_name}
+                    {"name": project_name, "template": "project"}
                 )
                 print(f"Server response: {server_response}")
                 
@@ -81,11 +81,8 @@ class createProject(QMainWindow):
                     QMessageBox.warning(self, "Server Error", server_response["error"])
                     return
             
-            # 2. Create project locally
-            for main_folders, subfolders in self.projectConfig.config_project.items():
-                for subfolder in subfolders:
-                    full_path = os.path.join(project_path, main_folders, subfolder)
-                    os.makedirs(full_path, exist_ok=True)
+            # 2. Create project locally, same layout as the server's template
+            template_cache.scaffold("project", project_path)
 
             # 3. Update active project
             self.config.update_active_project(project_path)
@@ -140,24 +137,58 @@ class load_project(QMainWindow):
         self.setCentralWidget(central_widget)
 
     def load_projects_in_list(self):
-        """Scan le dossier et remplit la liste"""
-        if not os.path.exists(self.project_folder):
-            return
-            
-        projects = [
-            folder for folder in os.listdir(self.project_folder) 
-            if os.path.isdir(os.path.join(self.project_folder, folder))
-        ]
-        
-        for project in projects:
-            self.project_list.addItem(project)
+        """
+        Fill the list with the server projects (with their stats) and the local ones.
+
+        The server answers from its project table, nothing is walked; local
+        folders missing on the server are listed as local only.
+        """
+        projects = {}
+        response = connection_manager.make_request("/projects")
+        for project in (response or {}).get("projects", []):
+            projects[project["name"]] = self._describe_project(project)
+
+        if os.path.exists(self.project_folder):
+            for folder in os.listdir(self.project_folder):
+                if folder not in projects and not folder.startswith(".") \
+                        and os.path.isdir(os.path.join(self.project_folder, folder)):
+                    projects[folder] = f"{folder}  (local only)" if response else folder
+
+        for name in sorted(projects):
+            item = QListWidgetItem(projects[name])
+            item.setData(Qt.UserRole, name)
+            self.project_list.addItem(item)
+
+    @staticmethod
+    def _describe_project(project):
+        """
+        List label of a server project.
+
+        Args:
+            project (dict): Project entry of /projects
+
+        Returns:
+            str: "name  -  N assets, size" (plus the description if any)
+        """
+        label = project["name"]
+        stats = project.get("stats")
+        if stats:
+            size = stats["total_bytes"]
+            for unit in ("B", "KB", "MB", "GB", "TB"):
+                if size < 1024 or unit == "TB":
+                    break
+                size /= 1024
+            label += f"  -  {stats['asset_count']} assets, {size:.1f} {unit}"
+        if project.get("description"):
+            label += f"  -  {project['description']}"
+        return label
 
     def load_selected_project(self):
         """Récupère le projet sélectionné"""
         current_item = self.project_list.currentItem()
         
         if current_item:
-            selected_project = current_item.text()
+            selected_project = current_item.data(Qt.UserRole)
             project_path = os.path.join(self.project_folder, selected_project)
             
             self.config.update_active_project(project_path)
@@ -0,0 +1,78 @@
+"""
+Rate Limiter Module
+
+Client-side cap on bulk transfer bandwidth:
+- One token bucket shared by every upload and download of the process, so
+  parallel transfers split the limit instead of multiplying it
+- Thread-safe, transfers run in worker threads
+- Limit read from the config ("transfer_rate_limit_mbps", megabits per
+  second, 0 or missing = unlimited) and followed when the config is saved
+"""
+
+import threading
+import time
+from src.config import configSparkle
+
+
+class RateLimiter:
+    """
+    Blocking token bucket.
+
+    Transfers call consume() with the size of each chunk before sending or
+    after receiving it; the call sleeps as long as needed to stay under the
+    rate.
+    """
+
+    def __init__(self, rate=0.0):
+        """
+        Args:
+            rate (float): Bytes per second (0 = unlimited)
+        """
+        self.rate = rate
+        self.tokens = 0.0
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        """
+        Change the rate.
+
+        Args:
+            rate (float): Bytes per second (0 = unlimited)
+        """
+        with self._lock:
+            self.rate = rate
+            self.tokens = min(self.tokens, 0.0)
+            self.updated_at = time.monotonic()
+
+    def consume(self, amount):
+        """
+        Account for amount bytes, sleeping until the bucket allows them.
+
+        Args:
+            amount (int): Bytes transferred
+        """
+        with self._lock:
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            # Allow a burst of at most a quarter second of traffic
+            self.tokens = min(self.tokens + (now - self.updated_at) * self.rate, self.rate / 4)
+            self.updated_at = now
+            self.tokens -= amount
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _rate_from_config(config):
+    return float(config.get("transfer_rate_limit_mbps") or 0) * 125000
+
+
+def _on_config_changed(config):
+    transfer_limiter.set_rate(_rate_from_config(config))
+
+
+# Global singleton instance
+transfer_limiter = RateLimiter(_rate_from_config(configSparkle().load_config()))
+configSparkle.add_listener(_on_config_changed)
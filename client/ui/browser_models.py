@@ -0,0 +1,492 @@
+"""
+Browser Models Module
+
+Qt item models backing the 4-column file browser of the Sparkle 3D Pipeline.
+
+Features:
+- AssetTreeModel for the Asset column (asset types -> assets)
+- StatusListModel for the Department, Task and File columns
+- Lazy row loading through canFetchMore/fetchMore
+- In-place updates emitting minimal rowsInserted/rowsRemoved/dataChanged signals
+"""
+
+from PySide6.QtCore import Qt, QAbstractItemModel, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QBrush
+
+from src.managers.ui_population_manager import UIPopulationManager
+
+
+# Custom role exposing the raw sync status string ('synced', 'local_only', ...)
+StatusRole = Qt.UserRole + 1
+
+# Number of rows exposed to the view per fetchMore call
+FETCH_BATCH_SIZE = 256
+
+_brush_cache = {}
+
+
+def status_brush(status):
+    """
+    Get a shared brush for a sync status.
+
+    Args:
+        status (str): Sync status
+
+    Returns:
+        QBrush: Brush with the status color
+    """
+    brush = _brush_cache.get(status)
+    if brush is None:
+        brush = QBrush(UIPopulationManager._get_status_color(status))
+        _brush_cache[status] = brush
+    return brush
+
+
+class _RowSet:
+    """
+    Sorted rows of one level of a model.
+
+    Attributes:
+        name (str): Name of the owner row (asset type for asset rows)
+        names (list): Sorted row names
+        statuses (dict): name -> status info dict
+        loaded (int): Number of rows already exposed to the view
+        children (dict): name -> child _RowSet (asset type rows only)
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.names = []
+        self.statuses = {}
+        self.loaded = 0
+        self.children = {}
+
+
+class _SortedRowsMixin:
+    """
+    Diff and lazy loading helpers shared by the browser models.
+
+    Works on _RowSet containers and emits the minimal set of model signals
+    needed to turn the current rows into a new sorted set of rows.
+    """
+
+    def _sync_rows(self, parent_index, rows, new_statuses, lazy=True, on_insert=None):
+        """
+        Update a row set in place.
+
+        Args:
+            parent_index (QModelIndex): Index owning the rows
+            rows (_RowSet): Rows to update
+            new_statuses (dict): name -> status info dict (or None) of the new rows
+            lazy (bool): Leave rows past the loaded window hidden until fetched
+            on_insert (callable): Called with each newly inserted name
+
+        Returns:
+            bool: True if anything changed
+        """
+        changed = False
+        new_names = sorted(new_statuses)
+        new_set = set(new_statuses)
+
+        # Removals, contiguous runs from the end so row numbers stay valid
+        row = len(rows.names) - 1
+        while row >= 0:
+            if rows.names[row] in new_set:
+                row -= 1
+                continue
+            first = row
+            while first > 0 and rows.names[first - 1] not in new_set:
+                first -= 1
+            self._remove_rows(parent_index, rows, first, row)
+            changed = True
+            row = first - 1
+
+        # Insertions, current names are now a sorted subset of new_names
+        old_set = set(rows.names)
+        position = 0
+        while position < len(new_names):
+            if new_names[position] in old_set:
+                position += 1
+                continue
+            last = position
+            while last + 1 < len(new_names) and new_names[last + 1] not in old_set:
+                last += 1
+            inserted = new_names[position:last + 1]
+            self._insert_rows(parent_index, rows, position, inserted, new_statuses, lazy)
+            if on_insert:
+                for name in inserted:
+                    on_insert(name)
+            changed = True
+            position = last + 1
+
+        # Status changes of rows present on both sides
+        for row, name in enumerate(rows.names):
+            status_info = new_statuses[name]
+            if name in old_set and rows.statuses.get(name) != status_info:
+                rows.statuses[name] = status_info
+                if row < rows.loaded:
+                    index = self.index(row, 0, parent_index)
+                    self.dataChanged.emit(index, index, [Qt.ForegroundRole, Qt.ToolTipRole, StatusRole])
+                changed = True
+
+        return changed
+
+    def _remove_rows(self, parent_index, rows, first, last):
+        """Remove rows first..last (inclusive), signalling only the visible part."""
+        visible_last = min(last, rows.loaded - 1)
+        visible = first <= visible_last
+
+        if visible:
+            self.beginRemoveRows(parent_index, first, visible_last)
+        for name in rows.names[first:last + 1]:
+            rows.statuses.pop(name, None)
+            rows.children.pop(name, None)
+        del rows.names[first:last + 1]
+        if visible:
+            rows.loaded -= visible_last - first + 1
+            self.endRemoveRows()
+
+    def _insert_rows(self, parent_index, rows, position, names, statuses, lazy):
+        """Insert names at position, signalling them only if inside the loaded window."""
+        visible = not lazy or position < rows.loaded
+
+        if visible:
+            self.beginInsertRows(parent_index, position, position + len(names) - 1)
+        rows.names[position:position] = names
+        for name in names:
+            rows.statuses[name] = statuses[name]
+        if visible:
+            rows.loaded += len(names)
+            self.endInsertRows()
+            return
+
+        # Rows landed past the loaded window: keep at least one batch visible
+        target = min(len(rows.names), FETCH_BATCH_SIZE)
+        if rows.loaded < target:
+            self.beginInsertRows(parent_index, rows.loaded, target - 1)
+            rows.loaded = target
+            self.endInsertRows()
+
+    def _fetch_rows(self, parent_index, rows):
+        """Expose the next batch of hidden rows to the view."""
+        remaining = len(rows.names) - rows.loaded
+        if remaining <= 0:
+            return
+        count = min(FETCH_BATCH_SIZE, remaining)
+        self.beginInsertRows(parent_index, rows.loaded, rows.loaded + count - 1)
+        rows.loaded += count
+        self.endInsertRows()
+
+    def _ensure_loaded(self, parent_index, rows, row):
+        """Fetch batches until the given row is exposed to the view."""
+        while rows.loaded <= row < len(rows.names):
+            self._fetch_rows(parent_index, rows)
+
+    @staticmethod
+    def _row_data(name, status_info, role):
+        """Data of a row for a given role."""
+        if role == Qt.DisplayRole:
+            return name
+        if status_info is None:
+            return None
+        if role == Qt.ForegroundRole:
+            return status_brush(status_info.get('status'))
+        if role == Qt.ToolTipRole:
+            return status_info.get('tooltip')
+        if role == StatusRole:
+            return status_info.get('status')
+        return None
+
+
+class StatusListModel(_SortedRowsMixin, QAbstractListModel):
+    """
+    Flat list of names with sync status, used by the Department, Task and File columns.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialize an empty list model.
+
+        Args:
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self._rows = _RowSet()
+
+    # Qt model interface -------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._rows.loaded
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._rows.loaded:
+            return None
+        name = self._rows.names[index.row()]
+        return self._row_data(name, self._rows.statuses.get(name), role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._rows.loaded < len(self._rows.names)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._fetch_rows(QModelIndex(), self._rows)
+
+    # Sparkle API --------------------------------------------------------------
+
+    def set_entries(self, statuses):
+        """
+        Update the list in place from a name -> status info mapping.
+
+        Args:
+            statuses (dict): name -> status info dict
+
+        Returns:
+            bool: True if anything changed
+        """
+        return self._sync_rows(QModelIndex(), self._rows, statuses)
+
+    def clear(self):
+        """Remove every row."""
+        if not self._rows.names:
+            return
+        self.beginResetModel()
+        self._rows = _RowSet()
+        self.endResetModel()
+
+    def name_at(self, index):
+        """
+        Get the name of a row.
+
+        Args:
+            index (QModelIndex): Row index
+
+        Returns:
+            str or None: Row name, None for an invalid index
+        """
+        if not index.isValid() or index.row() >= self._rows.loaded:
+            return None
+        return self._rows.names[index.row()]
+
+    def index_of(self, name):
+        """
+        Get the index of a name, fetching hidden rows if needed.
+
+        Args:
+            name (str): Row name
+
+        Returns:
+            QModelIndex: Index of the row, invalid if not found
+        """
+        try:
+            row = self._rows.names.index(name)
+        except ValueError:
+            return QModelIndex()
+        self._ensure_loaded(QModelIndex(), self._rows, row)
+        return self.index(row, 0)
+
+    def names(self):
+        """
+        Get every name of the list, including rows not fetched yet.
+
+        Returns:
+            list: Sorted names
+        """
+        return list(self._rows.names)
+
+
+class AssetTreeModel(_SortedRowsMixin, QAbstractItemModel):
+    """
+    Two level tree of asset types and their assets, used by the Asset column.
+
+    Asset rows carry their parent _RowSet as internal pointer; asset type
+    rows have none.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialize an empty tree model.
+
+        Args:
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self._folders = _RowSet()
+
+    # Qt model interface -------------------------------------------------------
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if row >= self._folders.loaded:
+                return QModelIndex()
+            return self.createIndex(row, 0)
+        if parent.internalPointer() is not None:
+            return QModelIndex()
+        folder = self._folders.children[self._folders.names[parent.row()]]
+        if row >= folder.loaded:
+            return QModelIndex()
+        return self.createIndex(row, 0, folder)
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        folder = index.internalPointer()
+        if folder is None:
+            return QModelIndex()
+        return self.createIndex(self._folders.names.index(folder.name), 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self._folders.loaded
+        if parent.internalPointer() is not None:
+            return 0
+        return self._folders.children[self._folders.names[parent.row()]].loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._folders.names)
+        if parent.internalPointer() is not None:
+            return False
+        return bool(self._folders.children[self._folders.names[parent.row()]].names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        folder = index.internalPointer()
+        if folder is None:
+            return self._folders.names[index.row()] if role == Qt.DisplayRole else None
+        name = folder.names[index.row()]
+        return self._row_data(name, folder.statuses.get(name), role)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return "Asset"
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if not parent.isValid() or parent.internalPointer() is not None:
+            return False
+        folder = self._folders.children[self._folders.names[parent.row()]]
+        return folder.loaded < len(folder.names)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid() or parent.internalPointer() is not None:
+            return
+        folder = self._folders.children[self._folders.names[parent.row()]]
+        self._fetch_rows(parent, folder)
+
+    # Sparkle API --------------------------------------------------------------
+
+    def set_tree(self, local_assets, server_assets, statuses):
+        """
+        Update the tree in place from local/server assets and their statuses.
+
+        Args:
+            local_assets (dict): Asset type -> set of local asset names
+            server_assets (dict): Asset type -> list of server asset names
+            statuses (dict): (folder_name, asset_name) -> status info dict
+
+        Returns:
+            bool: True if anything changed
+        """
+        all_folders = set(local_assets.keys()) | set(server_assets.keys())
+
+        def add_folder(folder_name):
+            self._folders.children[folder_name] = _RowSet(folder_name)
+
+        # Asset types are few: always fully loaded
+        changed = self._sync_rows(
+            QModelIndex(), self._folders, dict.fromkeys(all_folders),
+            lazy=False, on_insert=add_folder
+        )
+
+        for row, folder_name in enumerate(self._folders.names):
+            asset_names = set(local_assets.get(folder_name, set())) | set(server_assets.get(folder_name, []))
+            folder_statuses = {
+                asset_name: statuses.get((folder_name, asset_name)) for asset_name in asset_names
+            }
+            if self._sync_rows(self.index(row, 0), self._folders.children[folder_name], folder_statuses):
+                changed = True
+
+        return changed
+
+    def clear(self):
+        """Remove every row."""
+        if not self._folders.names:
+            return
+        self.beginResetModel()
+        self._folders = _RowSet()
+        self.endResetModel()
+
+    def entry_at(self, index):
+        """
+        Get the asset type and asset name of an index.
+
+        Args:
+            index (QModelIndex): Tree index
+
+        Returns:
+            tuple: (folder_name, asset_name); asset_name is None for an asset
+                type row, both are None for an invalid index
+        """
+        if not index.isValid():
+            return None, None
+        folder = index.internalPointer()
+        if folder is None:
+            return self._folders.names[index.row()], None
+        return folder.name, folder.names[index.row()]
+
+    def folder_index(self, folder_name):
+        """
+        Get the index of an asset type row.
+
+        Args:
+            folder_name (str): Asset type name
+
+        Returns:
+            QModelIndex: Index of the row, invalid if not found
+        """
+        try:
+            return self.index(self._folders.names.index(folder_name), 0)
+        except ValueError:
+            return QModelIndex()
+
+    def asset_index(self, folder_name, asset_name):
+        """
+        Get the index of an asset row, fetching hidden rows if needed.
+
+        Args:
+            folder_name (str): Asset type name
+            asset_name (str): Asset name
+
+        Returns:
+            QModelIndex: Index of the row, invalid if not found
+        """
+        parent_index = self.folder_index(folder_name)
+        if not parent_index.isValid():
+            return QModelIndex()
+        folder = self._folders.children[folder_name]
+        try:
+            row = folder.names.index(asset_name)
+        except ValueError:
+            return QModelIndex()
+        self._ensure_loaded(parent_index, folder, row)
+        return self.index(row, 0, parent_index)
+
+    def folder_names(self):
+        """
+        Get every asset type name.
+
+        Returns:
+            list: Sorted asset type names
+        """
+        return list(self._folders.names)
@@ -9,32 +9,43 @@ Features:
 - 4-column hierarchical file browser (Assets/Departments/Tasks/Files)
 - Intelligent server connection with local fallback
 - Visual sync status indicators (local, synced, server-only)
-- Smart refresh system with selection preservation
+- Diff-based refresh keeping selection and expansion untouched
+- Model/view columns with lazy loading and in-place updates
 - Context menus for CRUD operations
+- Offline publishes queued and replayed on reconnection, conflicts reported
+- Instant switching between recent projects (per-project warm caches)
+- Name search over the whole project tree (server index, local mirror offline)
 """
 
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
-                               QLabel, QTreeWidget, QTreeWidgetItem, QMenu, 
-                               QMessageBox, QPushButton)
-from PySide6.QtGui import QBrush, QColor
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView, 
+                               QLabel, QTreeView, QMenu, 
+                               QMessageBox, QPushButton, QLineEdit, QComboBox,
+                               QListWidget, QListWidgetItem, QAbstractItemView)
 from PySide6.QtCore import Signal, Qt, QTimer
 
 # UI imports
 from ui.ui_utility import stylesheet
 from ui.connection_indicator import ConnectionIndicator
+from ui.browser_models import AssetTreeModel, StatusListModel
 
 # Manager imports
 from src.managers.asset_manager import AssetManager
 from src.managers.sync_manager import SyncManager
-from src.managers.selection_manager import SelectionManager
 from src.managers.ui_population_manager import UIPopulationManager
+from src.managers.cache_manager import CacheManager
+from src.managers.scan_worker import AssetScanWorker
+from src.managers.offline_journal import OfflineJournal
+from src.managers.trash_manager import LocalTrash
+from src.managers.search_manager import SearchManager, parse_search_text
+from src.managers.version_manager import VERSION_PATTERN
 from src.operations.crud_operations import (CreateAssetDialog, CreateDepartmentDialog, 
                                           CreateTaskDialog, DeleteOperations)
 
 # Core imports
 from src.config import configSparkle
 from src.connection_manager import connection_manager
+from src.project_context import project_contexts
 import os
 
 class FileManager(QWidget):
@@ -53,11 +64,8 @@ class FileManager(QWidget):
         """
         super().__init__()
         
-        # Initialize configuration and paths
-        config = configSparkle()
-        current_config = config.load_config()
-        self.project_folder = current_config.get("project_active_folder", "")
-        self.production_folder = os.path.join(self.project_folder, "02_Production")
+        # Active project, resolved once and swapped on project switch
+        self._set_project_context(project_contexts.context)
         
         # Initialize managers
         self._setup_managers()
@@ -74,6 +82,26 @@ class FileManager(QWidget):
         
         # Spacer to push refresh button to the right
         btn_layout.addStretch()
+
+        # Project search: name query with ext:/dept:/type:/kind: filters
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search (*.blend, ext:blend, dept:Modeling)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(lambda text: self.search_timer.start())
+        self.search_edit.returnPressed.connect(self.run_search)
+        btn_layout.addWidget(self.search_edit)
+
+        self.search_mode = QComboBox()
+        self.search_mode.addItem("Starts with", "prefix")
+        self.search_mode.addItem("Contains", "substring")
+        self.search_mode.currentIndexChanged.connect(lambda index: self.run_search())
+        btn_layout.addWidget(self.search_mode)
+
+        # Search as you type, once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.run_search)
         
         # Manual refresh button on the right
         refresh_btn = QPushButton("Refresh")
@@ -83,24 +111,40 @@ class FileManager(QWidget):
         
         layout.addLayout(btn_layout)
 
+        # Search results, shown only while a search has results
+        self.search_results = QListWidget()
+        self.search_results.setUniformItemSizes(True)
+        self.search_results.setMaximumHeight(160)
+        self.search_results.itemActivated.connect(self.on_search_result_activated)
+        self.search_results.hide()
+        self._search_filters = None
+        layout.addWidget(self.search_results)
+
         # Setup 4-column browser layout
         layout_tree = QHBoxLayout()
 
         # Column 1: Asset Tree (hierarchical folders and assets)
-        self.asset_tree = QTreeWidget()
-        self.asset_tree.setHeaderLabel("Asset")
+        self.asset_model = AssetTreeModel(self)
+        self.asset_tree = QTreeView()
+        self.asset_tree.setModel(self.asset_model)
+        self.asset_tree.setUniformRowHeights(True)
+        # Ctrl/Shift select several entries to delete them at once
+        self.asset_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.asset_tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.asset_tree.customContextMenuRequested.connect(self.asset_menu)
-        self.asset_tree.itemSelectionChanged.connect(self.on_asset_selection_changed)
+        self.asset_tree.selectionModel().currentChanged.connect(
+            lambda current, previous: self.on_asset_selection_changed()
+        )
         layout_tree.addWidget(self.asset_tree)
 
         # Column 2: Department List
         department_layout = QVBoxLayout()
         department_label = QLabel("Department")
-        self.department_list = QListWidget()
-        self.department_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.department_list.customContextMenuRequested.connect(self.department_menu)
-        self.department_list.itemSelectionChanged.connect(self.on_department_selection_changed)
+        self.department_model = StatusListModel(self)
+        self.department_list = self._create_list_view(self.department_model, self.department_menu)
+        self.department_list.selectionModel().currentChanged.connect(
+            lambda current, previous: self.on_department_selection_changed()
+        )
         department_layout.addWidget(department_label)
         department_layout.addWidget(self.department_list)
         layout_tree.addLayout(department_layout)
@@ -108,10 +152,11 @@ class FileManager(QWidget):
         # Column 3: Task List
         task_layout = QVBoxLayout()
         task_label = QLabel("Task")
-        self.task_list = QListWidget()
-        self.task_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.task_list.customContextMenuRequested.connect(self.task_menu)
-        self.task_list.itemSelectionChanged.connect(self.on_task_selection_changed)
+        self.task_model = StatusListModel(self)
+        self.task_list = self._create_list_view(self.task_model, self.task_menu)
+        self.task_list.selectionModel().currentChanged.connect(
+            lambda current, previous: self.on_task_selection_changed()
+        )
         task_layout.addWidget(task_label)
         task_layout.addWidget(self.task_list)
         layout_tree.addLayout(task_layout)
@@ -119,9 +164,8 @@ class FileManager(QWidget):
         # Column 4: File List
         file_layout = QVBoxLayout()
         file_label = QLabel("File")
-        self.file_list = QListWidget()
-        self.file_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.file_list.customContextMenuRequested.connect(self.file_menu)
+        self.file_model = StatusListModel(self)
+        self.file_list = self._create_list_view(self.file_model, self.file_menu)
         file_layout.addWidget(file_label)
         file_layout.addWidget(self.file_list)
         layout_tree.addLayout(file_layout)
@@ -129,12 +173,37 @@ class FileManager(QWidget):
         layout.addLayout(layout_tree)
 
         self.setLayout(layout)
-        
+
+        # Paint the last known tree immediately, before any network access
+        self._paint_from_cache()
+
         # Initialize connection management and auto-refresh system
         self._setup_connection_management()
-        
-        # Load initial data
-        self.load_assets()
+
+        # Reconcile cached data with the real local/server state in the background
+        self.reconcile_assets()
+
+        # Loading another project swaps the context and resets the browser
+        project_contexts.context_changed.connect(self.on_project_changed)
+
+    def _create_list_view(self, model, menu_callback):
+        """
+        Create a list view for one of the browser columns.
+
+        Args:
+            model: StatusListModel displayed by the view
+            menu_callback (callable): Context menu handler
+
+        Returns:
+            QListView: Configured list view
+        """
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        view.setContextMenuPolicy(Qt.CustomContextMenu)
+        view.customContextMenuRequested.connect(menu_callback)
+        return view
 
     def _setup_managers(self):
         """
@@ -143,11 +212,27 @@ class FileManager(QWidget):
         Creates instances of specialized managers and sets up their configurations.
         """
         # Business logic managers
-        self.asset_manager = AssetManager(self.production_folder)
-        self.sync_manager = SyncManager(self.production_folder)
-        
-        # UI manager will be initialized after widgets are created
-        self.selection_manager = None
+        self.asset_manager = AssetManager(self.project_context)
+
+        # Publishes made offline are journaled and replayed on reconnection
+        self.offline_journal = OfflineJournal()
+        self.offline_journal.replay_finished.connect(self.on_offline_replay_finished)
+        self.sync_manager = SyncManager(self.project_context, self.offline_journal)
+
+        # Deletes are moved to the project trash and reclaimed in the background
+        self.local_trash = LocalTrash()
+        self.local_trash.entry_reclaimed.connect(self.on_trash_reclaimed)
+        if self.project_context.is_valid:
+            self.local_trash.reclaim(self.project_folder)
+
+        # Name search: server index online, local mirror of it offline
+        self.search_manager = SearchManager(self.project_context)
+
+        # Persistent sync-state cache for instant cold start
+        self.cache_manager = CacheManager()
+        self.scan_worker = None
+        self._stale_workers = []
+        self._cached_assets = None
 
     def _setup_connection_management(self):
         """
@@ -158,6 +243,8 @@ class FileManager(QWidget):
         """
         # Connect to connection manager signals before configuration
         connection_manager.connection_changed.connect(self.on_connection_changed)
+        connection_manager.push_changed.connect(self.on_push_changed)
+        connection_manager.change_received.connect(self.on_server_change)
         
         # Setup auto-refresh timer (only active when connected to server)
         self.auto_refresh_timer = QTimer()
@@ -167,14 +254,11 @@ class FileManager(QWidget):
         config = configSparkle()
         current_config = config.load_config()
         server_url = current_config.get("url", "")
-        
-        # Initialize SelectionManager now that UI components exist
-        ui_components = {
-            'asset_tree': self.asset_tree,
-            'department_list': self.department_list,
-            'task_list': self.task_list
-        }
-        self.selection_manager = SelectionManager(ui_components)
+
+        # Follow server change events of the active project (opened once connected)
+        project_name = self._get_project_name()
+        if project_name:
+            connection_manager.start_change_stream(project_name)
         
         if server_url:
             print(f"INFO: Server configuration detected: {server_url}")
@@ -205,7 +289,7 @@ class FileManager(QWidget):
         Handle connection state changes.
         
         Manages auto-refresh behavior and updates UI based on connection status.
-        - Connected: Enable auto-refresh every 15 seconds
+        - Connected: Enable auto-refresh every 15 seconds until the change stream is live
         - Disconnected: Disable auto-refresh, manual refresh only
         
         Args:
@@ -214,10 +298,14 @@ class FileManager(QWidget):
         print(f"INFO: Connection status changed - connected: {connected}")
         
         if connected:
-            # Collaborative mode: enable auto-refresh every 15 seconds
+            # Collaborative mode: poll every 15 seconds unless changes are pushed
             self.auto_refresh_timer.setInterval(15000)
-            self.auto_refresh_timer.start()
+            if not connection_manager.push_active:
+                self.auto_refresh_timer.start()
             self.update_connection_indicator("connected")
+            self.search_manager.sync_mirror()
+            # Scans run before the probe answered only had the cached server side
+            self.reconcile_assets()
             print("INFO: Collaborative mode activated - Auto-refresh enabled")
         else:
             # Local mode: disable auto-refresh
@@ -225,33 +313,122 @@ class FileManager(QWidget):
             self.update_connection_indicator("disconnected")
             print("INFO: Local mode activated - Manual refresh only")
 
+    def on_push_changed(self, live):
+        """
+        Switch between server push and polling.
+
+        Args:
+            live (bool): True if the change stream is live
+        """
+        if live:
+            # Stop polling; a resumed stream replays what was missed by itself,
+            # a fresh one needs a catch-up refresh
+            self.auto_refresh_timer.stop()
+            if not connection_manager.stream_resumed:
+                self.asset_manager.clear_all_caches()
+                self.refresh_all()
+        elif connection_manager.is_connected:
+            self.auto_refresh_timer.start(15000)
+
+    def on_offline_replay_finished(self, replayed, issues):
+        """
+        Report the replay of the offline journal.
+
+        Conflicts are never overwritten silently: the user chooses to overwrite
+        the server, to drop the queued operations, or to decide later.
+
+        Args:
+            replayed (int): Number of operations sent to the server
+            issues (list): Operation dicts in conflict or failed
+        """
+        if replayed:
+            self.asset_manager.clear_all_caches()
+            self.refresh_all()
+
+        failed = [issue for issue in issues if issue['state'] == 'failed']
+        conflicts = [issue for issue in issues if issue['state'] == 'conflict']
+        if failed:
+            lines = "\n".join(f"- {issue['path']}: {issue['detail']}" for issue in failed)
+            QMessageBox.warning(self, "Offline Publish Failed", f"These operations could not be replayed:\n{lines}")
+        if not conflicts:
+            return
+
+        lines = "\n".join(f"- {issue['op']} {issue['path']}: {issue['detail']}" for issue in conflicts)
+        box = QMessageBox(QMessageBox.Warning, "Offline Publish Conflicts",
+                          f"The server changed while you were offline:\n{lines}", parent=self)
+        overwrite_button = box.addButton("Overwrite Server", QMessageBox.DestructiveRole)
+        discard_button = box.addButton("Discard Mine", QMessageBox.RejectRole)
+        box.addButton("Decide Later", QMessageBox.NoRole)
+        box.exec()
+
+        operation_ids = [issue['id'] for issue in conflicts]
+        if box.clickedButton() == overwrite_button:
+            self.offline_journal.resolve_conflicts(operation_ids, overwrite=True)
+        elif box.clickedButton() == discard_button:
+            self.offline_journal.resolve_conflicts(operation_ids, overwrite=False)
+
+    def on_trash_reclaimed(self, name):
+        """
+        Log the end of a background reclaim of the local trash.
+
+        Args:
+            name (str): Trash entry name
+        """
+        print(f"INFO: Trash entry {name} reclaimed")
+
+    def on_server_change(self, event):
+        """
+        Update only the nodes affected by a server change event.
+
+        Args:
+            event (dict): Change event with 'type', 'path' and 'kind'
+        """
+        self.search_manager.apply_event(event)
+        parts = [part for part in event.get("path", "").split("/") if part]
+
+        # Project level change: nothing more precise to do
+        if not parts:
+            self.asset_manager.clear_all_caches()
+            self.refresh_all()
+            return
+
+        depth = min(len(parts), 5)
+        self.asset_manager.invalidate_server_listing(depth)
+
+        if depth <= 2:
+            self.load_assets()
+            return
+
+        # Deeper changes only matter if their parent column is displayed
+        selection = self.get_current_selection()
+        displayed = [selection['folder_name'], selection['asset_name'],
+                     selection['department_name'], selection['task_name']]
+        if parts[:depth - 1] != displayed[:depth - 1]:
+            return
+
+        if depth == 3:
+            self.refresh_current_asset()
+        elif depth == 4:
+            self.refresh_current_department()
+        else:
+            self.refresh_current_task()
+
     # =============================================================================
     # DATA REFRESH AND SELECTION MANAGEMENT
     # =============================================================================
     
     def refresh_all(self):
         """
-        Refresh all data while preserving current selections and tree expansion state.
-        
-        This method delegates to the SelectionManager to save/restore UI state
-        while reloading data from managers.
+        Refresh every visible column in place.
+
+        Each column is diffed against its model, so only inserted rows, removed
+        rows and status changes reach the views. Selection and expansion are
+        kept by Qt itself and an idle refresh does no widget work.
         """
-        # Save current UI state
-        saved_selection = self.selection_manager.save_current_selection()
-        expanded_folders = self.selection_manager.save_tree_expanded_state()
-        
-        # Reload all data
         self.load_assets()
-        
-        # Restore UI state
-        self.selection_manager.restore_tree_expanded_state(expanded_folders)
-        
-        callbacks = {
-            'on_asset_selection_changed': self.on_asset_selection_changed,
-            'on_department_selection_changed': self.on_department_selection_changed,
-            'on_task_selection_changed': self.on_task_selection_changed
-        }
-        self.selection_manager.restore_selection(saved_selection, callbacks)
+        self.refresh_current_asset()
+        self.refresh_current_department()
+        self.refresh_current_task()
 
     # =============================================================================
     # DATA LOADING AND POPULATION METHODS
@@ -263,23 +440,352 @@ class FileManager(QWidget):
         
         Uses AssetManager to fetch data and UIPopulationManager to populate the tree.
         """
-        self.asset_tree.clear()
-        
-        # Get project configuration
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self._get_project_name()
 
         # Get assets from managers
         local_assets = self.asset_manager.get_local_assets()
-        server_assets = self.asset_manager.get_server_assets(project_name)
+        server_assets = self.asset_manager.fetch_server_assets(project_name)
+
+        self._apply_assets(project_name, local_assets, server_assets)
+
+    def _apply_assets(self, project_name, local_assets, server_assets):
+        """
+        Update the asset tree in place from fresh data and store it in the cache.
+
+        Args:
+            project_name (str): Name of the current project
+            local_assets (dict): Local assets data
+            server_assets (dict or None): Server assets data, None if the server
+                didn't answer (offline, or the connection probe hasn't reported yet)
+        """
+        # Without a server answer the last known server side is kept, and not cached again
+        server_known = server_assets is not None
+        if not server_known:
+            server_assets = self._last_server_assets(project_name)
 
         # Populate UI using manager
+        statuses = UIPopulationManager.populate_asset_tree(
+            self.asset_model, local_assets, server_assets, self.asset_manager
+        )
+
+        # Only write the cache when something actually changed
+        snapshot = (project_name, local_assets, server_assets, statuses)
+        if project_name and server_known and snapshot != self._cached_assets:
+            self.cache_manager.store_assets(project_name, local_assets, server_assets, statuses)
+            self._cached_assets = snapshot
+
+    def _last_server_assets(self, project_name):
+        """
+        Server side of the last cached asset tree of a project.
+
+        Returns:
+            dict: Server assets data, empty if the project was never cached
+        """
+        if self._cached_assets and self._cached_assets[0] == project_name:
+            return self._cached_assets[2]
+        cached = self.cache_manager.load_assets(project_name) if project_name else None
+        return cached[1] if cached else {}
+
+    def _paint_from_cache(self):
+        """
+        Populate the asset tree from the persistent sync-state cache.
+
+        Gives a usable browser instantly on launch; real data is reconciled
+        afterwards by reconcile_assets().
+
+        Returns:
+            bool: True if cached data was painted, False otherwise
+        """
+        project_name = self._get_project_name()
+        if not project_name:
+            return False
+
+        cached = self.cache_manager.load_assets(project_name)
+        if cached is None:
+            return False
+
+        local_assets, server_assets, statuses = cached
         UIPopulationManager.populate_asset_tree(
-            self.asset_tree, local_assets, server_assets, self.asset_manager
+            self.asset_model, local_assets, server_assets, self.asset_manager, statuses
         )
+        # A reconcile finding the same tree then has nothing to write back
+        self._cached_assets = (project_name, local_assets, server_assets, statuses)
+        print(f"INFO: Asset tree painted from cache for project '{project_name}'")
+        return True
+
+    def reconcile_assets(self):
+        """
+        Rescan local folders and server listings in a background thread.
+
+        The asset tree is repopulated once the scan completes, keeping the
+        current selection and expansion state.
+        """
+        if (self.scan_worker is not None and self.scan_worker.isRunning()
+                and self.scan_worker.project_name == self._get_project_name()):
+            return
+
+        if self.scan_worker is not None and self.scan_worker.isRunning():
+            # Results of a scan started before a project switch are dropped,
+            # the thread is kept alive until it ends
+            stale_worker = self.scan_worker
+            stale_worker.scan_finished.disconnect(self._on_scan_finished)
+            self._stale_workers.append(stale_worker)
+            stale_worker.finished.connect(lambda: self._stale_workers.remove(stale_worker))
+        self.scan_worker = AssetScanWorker(self.asset_manager, self._get_project_name())
+        self.scan_worker.scan_finished.connect(self._on_scan_finished)
+        self.scan_worker.start()
+
+    def _on_scan_finished(self, local_assets, server_assets):
+        """
+        Apply background scan results to the asset tree.
 
+        Args:
+            local_assets (dict): Local assets data
+            server_assets (dict or None): Server assets data, None without a server answer
+        """
+        self._apply_assets(self._get_project_name(), local_assets, server_assets)
+
+    def get_current_selection(self):
+        """
+        Get the names currently selected in every column.
+
+        Returns:
+            dict: folder_name, asset_name, department_name, task_name and
+                file_name (None when nothing is selected in a column)
+        """
+        folder_name, asset_name = self.asset_model.entry_at(self.asset_tree.currentIndex())
+        return {
+            'folder_name': folder_name,
+            'asset_name': asset_name,
+            'department_name': self.department_model.name_at(self.department_list.currentIndex()),
+            'task_name': self.task_model.name_at(self.task_list.currentIndex()),
+            'file_name': self.file_model.name_at(self.file_list.currentIndex())
+        }
+
+    def get_selected_paths(self, view):
+        """
+        Get every entry selected in a column (Ctrl/Shift selection).
+
+        Falls back to the current entry when nothing is selected.
+
+        Args:
+            view: asset_tree, department_list, task_list or file_list
+
+        Returns:
+            list: Path parts below 02_Production of each entry, e.g.
+                [("Chara", "hero", "Modeling"), ...]; asset type rows are skipped
+        """
+        selection = self.get_current_selection()
+        indexes = view.selectionModel().selectedIndexes() or [view.currentIndex()]
+        if view is self.asset_tree:
+            entries = [self.asset_model.entry_at(index) for index in indexes]
+            return [entry for entry in entries if entry[1] is not None]
+
+        columns = ((self.department_list, self.department_model, ('folder_name', 'asset_name')),
+                   (self.task_list, self.task_model, ('folder_name', 'asset_name', 'department_name')),
+                   (self.file_list, self.file_model,
+                    ('folder_name', 'asset_name', 'department_name', 'task_name')))
+        for column_view, model, parent_keys in columns:
+            if view is column_view:
+                parents = tuple(selection[key] for key in parent_keys)
+                if None in parents:
+                    return []
+                names = [model.name_at(index) for index in indexes]
+                return [parents + (name,) for name in names if name]
+        return []
+
+    def refresh_current_asset(self):
+        """Reload the department column of the selected asset in place."""
+        selection = self.get_current_selection()
+        if selection['asset_name']:
+            self._load_departments(selection['folder_name'], selection['asset_name'])
+
+    def refresh_current_department(self):
+        """Reload the task column of the selected department in place."""
+        selection = self.get_current_selection()
+        if selection['asset_name'] and selection['department_name']:
+            self._load_tasks(selection['folder_name'], selection['asset_name'],
+                             selection['department_name'])
+
+    def refresh_current_task(self):
+        """Reload the file column of the selected task in place."""
+        selection = self.get_current_selection()
+        if selection['asset_name'] and selection['department_name'] and selection['task_name']:
+            self._load_files(selection['folder_name'], selection['asset_name'],
+                             selection['department_name'], selection['task_name'])
+
+    def _get_project_name(self):
+        """
+        Get current project name.
+
+        Returns:
+            str: Current project name
+        """
+        return self.project_context.name
+
+    def _set_project_context(self, context):
+        """
+        Point the widget at a project.
+
+        Args:
+            context (ProjectContext): Active project
+        """
+        self.project_context = context
+        self.project_folder = context.root
+        self.production_folder = context.production_folder
+
+    def on_project_changed(self, context, previous):
+        """
+        Switch the whole browser to another project.
+
+        Single place where everything derived from the previous project is
+        swapped: manager contexts, models and change stream. The listings of
+        recently displayed projects stay warm in memory and their change
+        stream resumes where it stopped, so switching between a few projects
+        paints at once; the new project is then reconciled in the background.
+
+        Args:
+            context (ProjectContext): New active project
+            previous (ProjectContext): Project that was displayed
+        """
+        print(f"INFO: Switching browser from '{previous.name}' to '{context.name}'")
+        self._set_project_context(context)
+        self.asset_manager.set_context(context)
+        self.sync_manager.set_context(context)
+        self.search_manager.set_context(context)
+        self.search_manager.sync_mirror()
+        self._cached_assets = None
+        self.search_edit.clear()
+        self.clear_search_results()
+        if context.is_valid:
+            self.local_trash.reclaim(context.root)
+
+        self.file_model.clear()
+        self.task_model.clear()
+        self.department_model.clear()
+        self.asset_model.clear()
+
+        if context.is_valid:
+            connection_manager.start_change_stream(context.name)
+        else:
+            connection_manager.stop_change_stream()
+
+        self._paint_from_cache()
+        self.reconcile_assets()
+
+
+    # =============================================================================
+    # SEARCH
+    # =============================================================================
+
+    def run_search(self):
+        """
+        Search the project with the text of the search box.
+
+        Results come from the server index when connected and from the local
+        mirror otherwise; an empty search box hides the results.
+        """
+        self.search_timer.stop()
+        filters = parse_search_text(self.search_edit.text(), self.search_mode.currentData())
+        if not filters["query"] and len(filters) == 2:
+            self.clear_search_results()
+            return
+        self._search_filters = filters
+        self.search_results.clear()
+        self._show_search_page(None)
+
+    def _show_search_page(self, cursor):
+        """
+        Append one page of results to the results list.
+
+        Args:
+            cursor (str): Cursor of the page, None for the first one
+        """
+        try:
+            response = self.search_manager.search(cursor=cursor, **self._search_filters)
+        except ValueError as e:
+            print(f"WARNING: Invalid search: {e}")
+            self.clear_search_results()
+            return
+
+        for result in response["results"]:
+            item = QListWidgetItem(result["path"])
+            item.setData(Qt.UserRole, result["path"])
+            self.search_results.addItem(item)
+        if response.get("next_cursor"):
+            more_item = QListWidgetItem("More results...")
+            more_item.setData(Qt.UserRole + 1, response["next_cursor"])
+            self.search_results.addItem(more_item)
+        if self.search_results.count() == 0:
+            self.search_results.addItem("No results")
+        if response.get("offline"):
+            self.search_results.setToolTip("Offline results from the local search mirror")
+        else:
+            self.search_results.setToolTip("")
+        self.search_results.show()
+
+    def clear_search_results(self):
+        """Empty and hide the search results."""
+        self._search_filters = None
+        self.search_results.clear()
+        self.search_results.hide()
+
+    def on_search_result_activated(self, item):
+        """
+        Open a search result in the browser, or load the next page.
+
+        Args:
+            item (QListWidgetItem): Activated result
+        """
+        cursor = item.data(Qt.UserRole + 1)
+        if cursor:
+            self.search_results.takeItem(self.search_results.row(item))
+            self._show_search_page(cursor)
+            return
+        path = item.data(Qt.UserRole)
+        if path:
+            self.reveal_path(path)
+
+    def reveal_path(self, path):
+        """
+        Select a production path in the browser columns.
+
+        Args:
+            path (str): Path relative to the production folder
+                (type/asset/department/task/file)
+
+        Returns:
+            bool: True if the whole path was found
+        """
+        parts = [part for part in path.split("/") if part]
+        if not parts:
+            return False
+
+        folder_index = self.asset_model.folder_index(parts[0])
+        if not folder_index.isValid():
+            return False
+        if len(parts) == 1:
+            self.asset_tree.setCurrentIndex(folder_index)
+            return True
+        self.asset_tree.expand(folder_index)
+        asset_index = self.asset_model.asset_index(parts[0], parts[1])
+        if not asset_index.isValid():
+            self.asset_tree.setCurrentIndex(folder_index)
+            return False
+        self.asset_tree.setCurrentIndex(asset_index)
+        self.asset_tree.scrollTo(asset_index)
+
+        # Selecting a row fills the next column synchronously
+        columns = ((self.department_model, self.department_list),
+                   (self.task_model, self.task_list),
+                   (self.file_model, self.file_list))
+        for name, (model, view) in zip(parts[2:], columns):
+            index = model.index_of(name)
+            if not index.isValid():
+                return False
+            view.setCurrentIndex(index)
+            view.scrollTo(index)
+        return True
 
     # =============================================================================
     # SELECTION CHANGE HANDLERS
@@ -293,22 +799,14 @@ class FileManager(QWidget):
         from both local and server sources with appropriate color coding.
         """
         # Clear dependent columns
-        self.department_list.clear()
-        self.task_list.clear()
-        self.file_list.clear()
+        self.department_model.clear()
+        self.task_model.clear()
+        self.file_model.clear()
 
         # Get current selection and project info
-        asset = self.asset_tree.currentItem()
-        if asset is None:
-            print("DEBUG: No asset selected")
-            return
-
-        folder = asset.parent()
-        if folder is None:
+        folder_name, asset_name = self.asset_model.entry_at(self.asset_tree.currentIndex())
+        if asset_name is None:
             return
-        
-        asset_name = asset.text(0)
-        folder_name = folder.text(0)
 
         # Load departments for this asset
         self._load_departments(folder_name, asset_name)
@@ -321,11 +819,7 @@ class FileManager(QWidget):
             folder_name (str): Name of the asset type folder
             asset_name (str): Name of the specific asset
         """
-        # Get project configuration
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.project_context.name
         
         # Get departments from managers
         local_departments = self.asset_manager.get_local_departments(folder_name, asset_name)
@@ -333,7 +827,7 @@ class FileManager(QWidget):
 
         # Populate UI using manager with advanced tooltips
         UIPopulationManager.populate_department_list(
-            self.department_list, local_departments, server_departments,
+            self.department_model, local_departments, server_departments,
             self.asset_manager, folder_name, asset_name
         )
 
@@ -346,23 +840,17 @@ class FileManager(QWidget):
         from both local and server sources with appropriate color coding.
         """
         # Clear dependent columns
-        self.task_list.clear()
-        self.file_list.clear()
+        self.task_model.clear()
+        self.file_model.clear()
 
         # Get current selection hierarchy
-        asset = self.asset_tree.currentItem()
-        department = self.department_list.currentItem()
+        selection = self.get_current_selection()
+        folder_name = selection['folder_name']
+        asset_name = selection['asset_name']
+        department_name = selection['department_name']
         
-        if asset is None or department is None:
+        if asset_name is None or department_name is None:
             return
-            
-        folder = asset.parent()
-        if folder is None:
-            return
-
-        asset_name = asset.text(0)
-        folder_name = folder.text(0)
-        department_name = department.text()
 
         # Load tasks for this department
         self._load_tasks(folder_name, asset_name, department_name)
@@ -376,11 +864,7 @@ class FileManager(QWidget):
             asset_name (str): Name of the specific asset
             department_name (str): Name of the department
         """
-        # Get project configuration
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.project_context.name
 
         # Get tasks from managers
         local_tasks = self.asset_manager.get_local_tasks(folder_name, asset_name, department_name)
@@ -388,7 +872,7 @@ class FileManager(QWidget):
 
         # Populate UI using manager with advanced tooltips
         UIPopulationManager.populate_task_list(
-            self.task_list, local_tasks, server_tasks,
+            self.task_model, local_tasks, server_tasks,
             self.asset_manager, folder_name, asset_name, department_name
         )
 
@@ -401,25 +885,18 @@ class FileManager(QWidget):
         with appropriate color coding.
         """
         # Clear file list
-        self.file_list.clear()
+        self.file_model.clear()
 
         # Get current selection hierarchy
-        asset = self.asset_tree.currentItem()
-        department = self.department_list.currentItem() 
-        task = self.task_list.currentItem()
+        selection = self.get_current_selection()
+        folder_name = selection['folder_name']
+        asset_name = selection['asset_name']
+        department_name = selection['department_name']
+        task_name = selection['task_name']
         
-        if asset is None or department is None or task is None:
-            return
-            
-        folder = asset.parent()
-        if folder is None:
+        if asset_name is None or department_name is None or task_name is None:
             return
 
-        asset_name = asset.text(0)
-        folder_name = folder.text(0)
-        department_name = department.text()
-        task_name = task.text()
-
         # Load files for this task
         self._load_files(folder_name, asset_name, department_name, task_name)
 
@@ -433,11 +910,7 @@ class FileManager(QWidget):
             department_name (str): Name of the department
             task_name (str): Name of the task
         """
-        # Get project configuration
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.project_context.name
 
         # Get files from managers
         local_files = self.asset_manager.get_local_files(folder_name, asset_name, department_name, task_name)
@@ -445,7 +918,7 @@ class FileManager(QWidget):
 
         # Populate UI using advanced manager with conflict detection
         UIPopulationManager.populate_file_list_advanced(
-            self.file_list, local_files, server_files, self.asset_manager,
+            self.file_model, local_files, server_files, self.asset_manager,
             folder_name, asset_name, department_name, task_name
         )
 
@@ -469,7 +942,10 @@ class FileManager(QWidget):
         # Use SyncManager to handle the publish operation
         success = self.sync_manager.publish_asset(folder_name, asset_name)
         
-        if success:
+        if success and not connection_manager.is_connected:
+            message = f"Server unavailable: Asset {asset_name} will be published when it is back."
+            QMessageBox.information(self, "Publish Queued", message)
+        elif success:
             message = f"Asset {asset_name} published successfully!"
             QMessageBox.information(self, "Publish Complete", message)
         else:
@@ -533,7 +1009,10 @@ class FileManager(QWidget):
         # Use SyncManager to handle the publish operation
         success = self.sync_manager.publish_department(folder_name, asset_name, department_name)
         
-        if success:
+        if success and not connection_manager.is_connected:
+            message = f"Server unavailable: Department {department_name} will be published when it is back."
+            QMessageBox.information(self, "Publish Queued", message)
+        elif success:
             message = f"Department {department_name} published successfully!"
             QMessageBox.information(self, "Publish Complete", message)
         else:
@@ -581,7 +1060,10 @@ class FileManager(QWidget):
         # Use SyncManager to handle the publish operation
         success = self.sync_manager.publish_task(folder_name, asset_name, department_name, task_name)
         
-        if success:
+        if success and not connection_manager.is_connected:
+            message = f"Server unavailable: Task {task_name} will be published when it is back."
+            QMessageBox.information(self, "Publish Queued", message)
+        elif success:
             message = f"Task {task_name} published successfully!"
             QMessageBox.information(self, "Publish Complete", message)
         else:
@@ -617,9 +1099,16 @@ class FileManager(QWidget):
 
     def publish_file(self, folder_name, asset_name, department_name, task_name, file_name):
 
-        success = self.sync_manager.publish_file(folder_name, asset_name, department_name, task_name, file_name)
+        published_name = self.sync_manager.publish_version(folder_name, asset_name, department_name, task_name, file_name)
 
-        if success:
+        if published_name and not connection_manager.is_connected:
+            message = f"Server unavailable: File {file_name} will be published when it is back."
+            QMessageBox.information(self, "Publish Queued", message)
+        elif published_name and published_name != file_name:
+            message = (f"{file_name} was already published by someone else.\n"
+                       f"Your file was renamed and published as {published_name}.")
+            QMessageBox.information(self, "Publish Complete", message)
+        elif published_name:
             message = f"File {file_name} published successfully!"
             QMessageBox.information(self, "Publish Complete", message)
         else:
@@ -629,6 +1118,21 @@ class FileManager(QWidget):
         print(f"INFO: File publish complete")
         self.refresh_all()
 
+    def set_master(self, folder_name, asset_name, department_name, task_name, file_name):
+        """
+        Make a version file the master of its task.
+
+        Args:
+            folder_name (str): Asset type folder name
+            asset_name (str): Asset name
+            department_name (str): Department name
+            task_name (str): Task name
+            file_name (str): Version file
+        """
+        if not self.sync_manager.set_master(folder_name, asset_name, department_name, task_name, file_name):
+            QMessageBox.warning(self, "Set Master Failed", f"Could not set {file_name} as master")
+        self.refresh_current_task()
+
     def download_file(self, folder_name, asset_name, department_name, task_name, file_name):
 
         success = self.sync_manager.download_file(folder_name, asset_name, department_name, task_name, file_name)
@@ -657,21 +1161,14 @@ class FileManager(QWidget):
         """
 
         # Retrieve clicked asset
-        asset_item = self.asset_tree.itemAt(position)
-        if not asset_item or not asset_item.parent():
+        folder_name, asset_name = self.asset_model.entry_at(self.asset_tree.indexAt(position))
+        if not asset_name:
             return # We only use asset not parent folder
 
-        # Retrieve asset name
-        asset_name = asset_item.text(0)
-        folder_name = asset_item.parent().text(0)
-
         # Get status using AssetManager
         local_assets = self.asset_manager.get_local_assets()
         
-        config = configSparkle()
-        current_config = config.load_config()
-        folder_path = current_config.get("project_active_folder", "")
-        project_name = os.path.basename(folder_path)
+        project_name = self.project_context.name
         server_assets = self.asset_manager.get_server_assets(project_name)
         
         status = self.asset_manager.get_asset_status(folder_name, asset_name, local_assets, server_assets)
@@ -711,16 +1208,15 @@ class FileManager(QWidget):
             position (QPoint): Position where the menu was requested
         """
         # Get current selection hierarchy
-        asset = self.asset_tree.currentItem()
-        department_item = self.department_list.itemAt(position)
+        selection = self.get_current_selection()
+        department_name = self.department_model.name_at(self.department_list.indexAt(position))
         
-        if not asset or not asset.parent() or not department_item:
+        if not selection['asset_name'] or not department_name:
             return
         
         # Get names
-        asset_name = asset.text(0)
-        folder_name = asset.parent().text(0)
-        department_name = department_item.text()
+        asset_name = selection['asset_name']
+        folder_name = selection['folder_name']
         
         # Get department status using AssetManager
         status = self.asset_manager.get_department_status(folder_name, asset_name, department_name)
@@ -764,18 +1260,16 @@ class FileManager(QWidget):
             position (QPoint): Position where the menu was requested
         """
         # Get current selection hierarchy
-        asset = self.asset_tree.currentItem()
-        department = self.department_list.currentItem()
-        task_item = self.task_list.itemAt(position)
+        selection = self.get_current_selection()
+        task_name = self.task_model.name_at(self.task_list.indexAt(position))
         
-        if not asset or not asset.parent() or not department or not task_item:
+        if not selection['asset_name'] or not selection['department_name'] or not task_name:
             return
         
         # Get names
-        asset_name = asset.text(0)
-        folder_name = asset.parent().text(0)
-        department_name = department.text()
-        task_name = task_item.text()
+        asset_name = selection['asset_name']
+        folder_name = selection['folder_name']
+        department_name = selection['department_name']
         
         # Get task status using AssetManager
         status = self.asset_manager.get_task_status(folder_name, asset_name, department_name, task_name)
@@ -818,16 +1312,16 @@ class FileManager(QWidget):
         Args:
             position (QPoint): Position where the menu was requested
         """
-        asset = self.asset_tree.currentItem()
-        department = self.department_list.currentItem()
-        task_item = self.task_list.currentItem()
-        file_item = self.file_list.itemAt(position)
+        selection = self.get_current_selection()
+        file_name = self.file_model.name_at(self.file_list.indexAt(position))
+
+        if not selection['asset_name'] or not selection['department_name'] or not selection['task_name'] or not file_name:
+            return
 
-        asset_name = asset.text(0)
-        folder_name = asset.parent().text(0)
-        department_name = department.text()
-        task_name = task_item.text()
-        file_name = file_item.text()
+        asset_name = selection['asset_name']
+        folder_name = selection['folder_name']
+        department_name = selection['department_name']
+        task_name = selection['task_name']
 
         # Get file status using local method
         status = self.asset_manager.get_file_status(folder_name, asset_name, department_name, task_name, file_name)
@@ -854,6 +1348,11 @@ class FileManager(QWidget):
                 self.download_task(folder_name, asset_name, department_name, task_name, file_name)
             ))
         
+        # Versions present locally can become the master (linked, not copied)
+        if status != "server_only" and VERSION_PATTERN.match(file_name):
+            master_action = file_menu.addAction("⭐ Set as Master")
+            master_action.triggered.connect(lambda: self.set_master(folder_name, asset_name, department_name, task_name, file_name))
+
         file_menu.addSeparator()
 
         delete_action = file_menu.addAction("Delete")
@@ -871,17 +1370,10 @@ class FileManager(QWidget):
         """
         Open dialog to create a new asset in the selected folder.
         """
-        asset = self.asset_tree.currentItem()
-        if asset is None:
+        # Works for both a selected asset type and an asset within it
+        folder_name, _ = self.asset_model.entry_at(self.asset_tree.currentIndex())
+        if folder_name is None:
             return
-            
-        folder = asset.parent()
-        if folder is None:
-            # Selected item is a folder itself
-            folder_name = asset.text(0)
-        else:
-            # Selected item is an asset within a folder
-            folder_name = folder.text(0)
         
         folder_path = os.path.join(self.production_folder, folder_name)
         self.create_asset_window = CreateAssetDialog(self, folder_path)
@@ -891,16 +1383,10 @@ class FileManager(QWidget):
         """
         Open dialog to create a new department for the selected asset.
         """
-        asset = self.asset_tree.currentItem()
-        if asset is None:
-            return
-            
-        folder = asset.parent()
-        if folder is None:
+        folder_name, asset_name = self.asset_model.entry_at(self.asset_tree.currentIndex())
+        if asset_name is None:
             return
             
-        asset_name = asset.text(0)
-        folder_name = folder.text(0)
         asset_path = os.path.join(self.production_folder, folder_name, asset_name)
 
         self.create_department_window = CreateDepartmentDialog(self, asset_path)
@@ -910,19 +1396,13 @@ class FileManager(QWidget):
         """
         Open dialog to create a new task for the selected department.
         """
-        asset = self.asset_tree.currentItem()
-        department = self.department_list.currentItem()
+        selection = self.get_current_selection()
+        folder_name = selection['folder_name']
+        asset_name = selection['asset_name']
+        department_name = selection['department_name']
         
-        if asset is None or department is None:
+        if asset_name is None or department_name is None:
             return
-            
-        folder = asset.parent()
-        if folder is None:
-            return
-            
-        asset_name = asset.text(0)
-        folder_name = folder.text(0)
-        department_name = department.text()
 
         department_path = os.path.join(self.production_folder, folder_name, 
                                      asset_name, department_name)
@@ -31,7 +31,7 @@ def stylesheet (widget):
                     outline: none;
                     border: 1px solid #db7515;
                 }
-                QListWidget {
+                QListView {
                     background-color: #3a3a3a;
                     color: white;
                     border: 1px solid #555;
@@ -40,17 +40,17 @@ def stylesheet (widget):
                     show-decoration-selected: 0;
                 }
 
-                QListWidget::item {
+                QListView::item {
                     padding: 8px;
                     border-bottom: 1px solid #555;
                     outline: none;
                 }
 
-                QListWidget::item:selected {
+                QListView::item:selected {
                     background-color: #505050;
                 }
 
-                QListWidget::item:hover {
+                QListView::item:hover {
                     background-color: #404040;
                 }
                 QLineEdit {
@@ -68,7 +68,7 @@ def stylesheet (widget):
                 QLineEdit:hover {
                     border-color: #666666;
                 }
-                QTreeWidget {
+                QTreeView {
                     background-color: #3a3a3a;
                     color: white;
                     border: 1px solid #555;
@@ -76,21 +76,21 @@ def stylesheet (widget):
                     outline: none;
                     show-decoration-selected: 0;
                 }
-                QTreeWidget::item {
+                QTreeView::item {
                     padding: 4px;
                     height: 20px;
                     outline: none;
                 }
-                QTreeWidget::item:selected {
+                QTreeView::item:selected {
                     background-color: #505050;
                 }
-                QTreeWidget::item:hover {
+                QTreeView::item:hover {
                     background-color: #404040;
                 }
-                QTreeWidget::item:focus {
+                QTreeView::item:focus {
                     outline: none;
                 }
-                QTreeWidget QHeaderView::section {
+                QTreeView QHeaderView::section {
                     background-color: #db7515;
                     color: white;
                     padding: 6px;
@@ -0,0 +1,146 @@
+"""
+Bandwidth scheduling
+
+Token-bucket throttling of bulk transfers (uploads and downloads):
+- Per-client limit (client = remote address)
+- Global limit shared fairly: each active client gets an equal share
+- Metadata endpoints never go through the scheduler, so listings stay fast
+  while large files move
+
+All the state lives on the event loop: streams are entered and consumed
+from async code only.
+
+Limits are read from server_config.json ("bandwidth_global_mbps",
+"bandwidth_client_mbps", megabits per second, 0 or missing = unlimited).
+"""
+
+import asyncio
+import time
+
+
+def mbps_to_bytes(mbps):
+    return float(mbps or 0) * 125000
+
+
+class TokenBucket:
+    """Async token bucket, rate in bytes per second (0 = unlimited)."""
+
+    def __init__(self, rate=0.0):
+        self.rate = rate
+        self.tokens = 0.0
+        self.updated_at = time.monotonic()
+
+    def set_rate(self, rate):
+        self._refill()
+        self.rate = rate
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            # Allow a burst of at most a quarter second of traffic
+            self.tokens = min(self.tokens + (now - self.updated_at) * self.rate, self.rate / 4)
+        self.updated_at = now
+
+    async def consume(self, amount):
+        """Take amount bytes, sleeping until the bucket allows them."""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self.tokens -= amount
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+class TransferStream:
+    """One bulk transfer of a client, used as an async context manager."""
+
+    def __init__(self, scheduler, client_id):
+        self.scheduler = scheduler
+        self.client_id = client_id
+        self.bucket = None
+
+    async def __aenter__(self):
+        self.scheduler._reload_config()
+        self.bucket = self.scheduler._register(self.client_id)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.scheduler._unregister(self.client_id)
+
+    @property
+    def unlimited(self):
+        """True when no limit applies (the transfer can bypass accounting, e.g. zero-copy)."""
+        return self.scheduler.global_rate <= 0 and self.scheduler.client_rate <= 0
+
+    async def consume(self, amount):
+        """Account amount bytes of this transfer."""
+        await self.bucket.consume(amount)
+
+
+class BandwidthScheduler:
+    """
+    Fair-share bandwidth scheduler.
+
+    Streams of the same client share that client's bucket. Each client's
+    rate is min(per-client limit, global limit / active clients), updated
+    whenever a client starts or stops transferring.
+    """
+
+    def __init__(self, config_loader=None):
+        """
+        Args:
+            config_loader: Callable returning the server config dict, read
+                when a transfer starts (optional)
+        """
+        self.config_loader = config_loader
+        self.global_rate = 0.0
+        self.client_rate = 0.0
+        self._buckets = {}
+        self._streams = {}
+
+    def configure(self, global_rate, client_rate):
+        """Change the limits (bytes per second, 0 = unlimited)."""
+        if (global_rate, client_rate) != (self.global_rate, self.client_rate):
+            self.global_rate = global_rate
+            self.client_rate = client_rate
+            self._rebalance()
+
+    def _reload_config(self):
+        if self.config_loader is not None:
+            config = self.config_loader()
+            self.configure(mbps_to_bytes(config.get("bandwidth_global_mbps")),
+                           mbps_to_bytes(config.get("bandwidth_client_mbps")))
+
+    def stream(self, client_id):
+        """
+        Returns:
+            TransferStream: Context manager throttling one transfer of client_id
+        """
+        return TransferStream(self, client_id)
+
+    def _register(self, client_id):
+        self._streams[client_id] = self._streams.get(client_id, 0) + 1
+        if client_id not in self._buckets:
+            self._buckets[client_id] = TokenBucket()
+            self._rebalance()
+        return self._buckets[client_id]
+
+    def _unregister(self, client_id):
+        self._streams[client_id] -= 1
+        if self._streams[client_id] <= 0:
+            del self._streams[client_id]
+            del self._buckets[client_id]
+            self._rebalance()
+
+    def _rebalance(self):
+        if not self._buckets:
+            return
+        limits = []
+        if self.client_rate > 0:
+            limits.append(self.client_rate)
+        if self.global_rate > 0:
+            limits.append(self.global_rate / len(self._buckets))
+        rate = min(limits) if limits else 0.0
+        for bucket in self._buckets.values():
+            bucket.set_rate(rate)
+
@@ -1,39 +1,118 @@
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
+
+def contained_path(folder, relative_path):
+    """
+    folder / relative_path if it stays inside folder, else None.
+
+    The parent folders are resolved (symlinks, "..") but not the last name, so
+    a link inside the folder is the link itself, wherever it points.
+    """
+    relative = Path(relative_path)
+    if relative.anchor or not relative.parts or relative.name == "..":
+        return None
+    folder = Path(folder).resolve()
+    target = (folder / relative).parent.resolve() / relative.name
+    return target if folder in target.parents else None
+
+
 class ServerConfig:
+    # Seconds between two mtime checks of server_config.json
+    RELOAD_CHECK_INTERVAL = 1.0
+
     def __init__(self):
         if os.name == 'nt':
             documents_path = Path(os.environ.get('USERPROFILE', Path.home())) / 'Documents'
         else:
             documents_path = Path.home() / 'Documents'
-            
+
         self.config_folder = documents_path / "Sparkle"
         self.config_file = self.config_folder / "server_config.json"
         self.default_config = {
             "projects_folder": str(documents_path / "Sparkle")
         }
-    
+
+        # In-memory copy, reparsed only when the file changes
+        self._config = None
+        self._file_state = None
+        self._checked_at = 0.0
+        self._projects_folder = None
+        self._lock = threading.Lock()
+
     def load_config(self):
-        """Load server config"""
-        if not self.config_file.exists():
-            self.save_config(self.default_config)
-            return self.default_config
-        
+        """Load server config (cached, reloaded when the file changes on disk)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._config is not None and now - self._checked_at < self.RELOAD_CHECK_INTERVAL:
+                return dict(self._config)
+            self._checked_at = now
+
+            state = self._stat_config()
+            if self._config is not None and state == self._file_state:
+                return dict(self._config)
+
+            if state is None:
+                self._write_config(self.default_config)
+                config = dict(self.default_config)
+            else:
+                try:
+                    with open(self.config_file, 'r') as f:
+                        config = json.load(f)
+                except (OSError, ValueError):
+                    config = dict(self._config or self.default_config)
+
+            self._config = config
+            self._file_state = self._stat_config()
+            self._projects_folder = Path(config["projects_folder"])
+            return dict(config)
+
+    def _stat_config(self):
         try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        except:
-            return self.default_config
-    
-    def save_config(self, config):
-        """Sauvegarder la configuration"""
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _write_config(self, config):
+        """Write the file atomically: a crash never leaves a truncated config"""
         self.config_folder.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
+        tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
             json.dump(config, f, indent=2)
-    
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.config_file)
+
+    def save_config(self, config):
+        """Sauvegarder la configuration"""
+        with self._lock:
+            self._write_config(config)
+            self._config = dict(config)
+            self._file_state = self._stat_config()
+            self._checked_at = time.monotonic()
+            self._projects_folder = Path(config["projects_folder"])
+
     def get_projects_folder(self):
         """Récupérer le dossier des projets"""
-        config = self.load_config()
-        return Path(config["projects_folder"])
\ No newline at end of file
+        self.load_config()
+        return self._projects_folder
+
+    def production_path(self, project_name, relative_path=""):
+        """
+        Path in the production tree of a project, None if it points outside of it.
+
+        An empty relative_path is the 02_Production folder itself.
+        """
+        if Path(project_name).name != project_name or project_name.startswith("."):
+            return None
+        project_folder = contained_path(self.get_projects_folder(), project_name)
+        if project_folder is None:
+            return None
+        production_folder = project_folder / "02_Production"
+        if not Path(relative_path).parts:
+            return production_folder
+        return contained_path(production_folder, relative_path)
@@ -0,0 +1,31 @@
+"""
+Database connection
+
+SQLAlchemy engine and sessions of the pipeline database, sparkle_pipeline.db
+at the repository root unless the server config sets "database_url".
+"""
+
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+DEFAULT_DATABASE_URL = f"sqlite:///{Path(__file__).resolve().parents[2] / 'sparkle_pipeline.db'}"
+
+Base = declarative_base()
+
+
+def create_session_factory(database_url=None):
+    """
+    Engine and session factory of a database, its missing tables are created.
+
+    Args:
+        database_url: SQLAlchemy URL, DEFAULT_DATABASE_URL if None
+
+    Returns:
+        sessionmaker: Session factory bound to the engine
+    """
+    database_url = database_url or DEFAULT_DATABASE_URL
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
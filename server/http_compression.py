@@ -0,0 +1,121 @@
+"""
+HTTP compression
+
+ASGI middleware compressing JSON responses with the best encoding the client
+accepts: zstd when the optional `zstandard` package is installed, gzip
+otherwise. Streams (SSE, file downloads) are left untouched.
+"""
+
+import asyncio
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+    print("WARNING: zstandard not installed, responses are compressed with gzip only")
+
+
+# Bodies above this size are compressed in a worker thread, off the event loop
+THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSIBLE_TYPES = (b"application/json",)
+
+
+def available_encodings():
+    """Encodings this server can produce, by preference."""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding):
+    """
+    Pick the response encoding from an Accept-Encoding header value.
+
+    Returns None when the client accepts none of ours.
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip())
+    for encoding in available_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress_body(body, encoding, gzip_level=6, zstd_level=3):
+    """Compress a full response body."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compress(body)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class JSONCompressionMiddleware:
+    """
+    Negotiated compression of JSON responses.
+
+    JSON endpoints answer with a single body, it is buffered and compressed
+    in one go; anything else passes through unbuffered.
+    """
+
+    def __init__(self, app, minimum_size=1024, gzip_level=6, zstd_level=3):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers") or [])
+                content_type = response_headers.get(b"content-type", b"").split(b";")[0].strip()
+                if content_type not in COMPRESSIBLE_TYPES or b"content-encoding" in response_headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            response_headers = [(k, v) for k, v in start_message.get("headers") or []
+                                if k not in (b"content-length", b"content-encoding")]
+            if len(body) >= self.minimum_size:
+                if len(body) >= THREAD_THRESHOLD:
+                    body = await asyncio.get_running_loop().run_in_executor(
+                        None, compress_body, body, encoding, self.gzip_level, self.zstd_level
+                    )
+                else:
+                    body = compress_body(body, encoding, self.gzip_level, self.zstd_level)
+                response_headers.append((b"content-encoding", encoding.encode()))
+            response_headers.append((b"vary", b"Accept-Encoding"))
+            response_headers.append((b"content-length", str(len(body)).encode()))
+
+            await send({**start_message, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
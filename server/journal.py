@@ -0,0 +1,119 @@
+"""
+Change journal
+
+Numbered log of the changes made to each project (created, deleted, uploaded),
+fan-out of new events to the push subscribers (WebSocket, SSE) and replay of
+missed events for reconnecting clients.
+
+Event ids are "<epoch>-<revision>": the epoch changes on every server start so
+an id from a previous run is never mistaken for a recent one.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class ChangeJournal:
+    def __init__(self, max_events=10000):
+        self.max_events = max_events
+        self.epoch = int(time.time())
+        self.revision = 0
+        self._events = {}
+        self._evicted = {}
+        self._subscribers = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """Call callback(event) for every new event, in the thread recording it."""
+        self._listeners.append(callback)
+
+    def record(self, project_name, event_type, path="", kind="folder"):
+        """
+        Add an event to the journal and push it to the project subscribers.
+
+        Can be called from the request worker threads.
+
+        Args:
+            project_name: Name of the project
+            event_type: "created", "deleted" or "uploaded"
+            path: Path relative to 02_Production ("" for the project itself)
+            kind: "folder", "file" or "project"
+        """
+        with self._lock:
+            self.revision += 1
+            event = {
+                "id": f"{self.epoch}-{self.revision}",
+                "revision": self.revision,
+                "type": event_type,
+                "project": project_name,
+                "path": path,
+                "kind": kind,
+                "timestamp": time.time()
+            }
+            events = self._events.setdefault(project_name, deque(maxlen=self.max_events))
+            if len(events) == self.max_events:
+                # Oldest event falls out: older ids can't be resumed anymore
+                self._evicted[project_name] = events[0]["revision"]
+            events.append(event)
+            subscribers = list(self._subscribers.get(project_name, ()))
+
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"ERROR: Change listener failed on {event['id']}: {e}")
+        return event
+
+    @property
+    def last_event_id(self):
+        return f"{self.epoch}-{self.revision}"
+
+    def project_event_id(self, project_name):
+        """Id of the last event of a project in this server run, None if it had none."""
+        with self._lock:
+            events = self._events.get(project_name)
+            return events[-1]["id"] if events else None
+
+    def since(self, project_name, last_event_id):
+        """
+        Events of a project newer than an event id.
+
+        Returns the list of missed events, or None if they can't be replayed
+        (unknown id, previous server run or events already evicted), in
+        which case the client must rescan.
+        """
+        try:
+            epoch, revision = (int(part) for part in str(last_event_id).split("-"))
+        except ValueError:
+            return None
+        if epoch != self.epoch or revision > self.revision:
+            return None
+
+        with self._lock:
+            if revision < self._evicted.get(project_name, 0):
+                return None
+            return [event for event in self._events.get(project_name, ()) if event["revision"] > revision]
+
+    def subscribe(self, project_name):
+        """Register a subscriber, must be called from the event loop. Returns its queue."""
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(project_name, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, project_name, queue):
+        """Remove a subscriber queue."""
+        with self._lock:
+            subscribers = self._subscribers.get(project_name, set())
+            for subscriber in [s for s in subscribers if s[1] is queue]:
+                subscribers.discard(subscriber)
+            if not subscribers:
+                self._subscribers.pop(project_name, None)
+
+
+change_journal = ChangeJournal()
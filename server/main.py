@@ -1,58 +1,95 @@
-from fastapi import FastAPI, File, UploadFile
+import sys
 from pathlib import Path
+# Code shared with the client lives in <repository>/shared
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, File, UploadFile, WebSocket, WebSocketDisconnect, Request, Header
 from config import ServerConfig 
+from journal import change_journal
+from http_compression import JSONCompressionMiddleware
+from tree_encoding import walk_production, encode_list, encode_columnar
+from responses import FastJSONResponse
+from file_transfer import FileStreamResponse, file_hash
+from bandwidth import BandwidthScheduler
+from versions import version_allocator
+from shared.file_links import promote_file
+from retention import CATALOG_FOLDER, VersionCatalog, RetentionEngine
+from trash import TrashBin
+from templates import TemplateStore
+from project_registry import ProjectRegistry
+from search_index import SearchIndex
 from pydantic import BaseModel
+from typing import Optional
+import asyncio
 import shutil
+import json
+from stat import S_ISDIR
 import os
-from fastapi.responses import FileResponse
+import uuid
+from fastapi.responses import StreamingResponse
 
-app = FastAPI(title="Sparkle Server")
+app = FastAPI(title="Sparkle Server", default_response_class=FastJSONResponse)
+app.add_middleware(JSONCompressionMiddleware, minimum_size=1024)
 server_config = ServerConfig()
+bandwidth = BandwidthScheduler(config_loader=server_config.load_config)
+version_catalog = VersionCatalog(server_config.get_projects_folder)
+retention = RetentionEngine(
+    version_catalog, server_config.load_config,
+    on_deleted=lambda project_name, path: change_journal.record(project_name, "deleted", path, kind="file")
+)
+trash_bin = TrashBin(server_config.get_projects_folder, server_config.load_config)
+template_store = TemplateStore(server_config.config_folder / "templates.json")
+search_index = SearchIndex(server_config.get_projects_folder)
+change_journal.add_listener(search_index.apply_event)
+
+def project_totals(project_name):
+    """(asset count, total bytes) of a project, versions hardlinked to a master counted once."""
+    totals = search_index.totals(project_name)
+    return totals["assets"], totals["bytes"] - version_catalog.linked_bytes(project_name)
+
+project_registry = ProjectRegistry(server_config.get_projects_folder, server_config.load_config,
+                                   change_journal.project_event_id, project_totals)
 
 class ProjectCreate(BaseModel):
     name: str
+    template: str = "project"
+    description: Optional[str] = None
+
+class PathList(BaseModel):
+    paths: list[str]
+
+class VersionRequest(BaseModel):
+    asset: str
+    task: str
+    extension: str
+    min_version: int = 1
+
+class TagRequest(BaseModel):
+    tagged: bool = True
+
+class TemplateDefinition(BaseModel):
+    kind: str
+    folders: list[str]
+
+class InstantiateRequest(BaseModel):
+    template: str
 
-config_project = {
-    "01_PreProduction" : [
-        "concept_art",
-        "references",
-        "storyboard"
-    ],
-    "02_Production" : [
-        "Chara",
-        "Env",
-        "Props",
-        "Items",
-        "Modules",
-        "FX",
-        "00_Shot"
-    ],
-    "03_PostProduction" : [
-        "Grading",
-        "Editing",
-        "DCP"
-    ]            
-}
+def invalid_path(path):
+    """400 response of a path outside the production tree of its project."""
+    return FastJSONResponse({"error": f"Invalid path: {path}"}, status_code=400)
+
+def client_address(request: Request):
+    """Remote address of a request, the bandwidth scheduler's client id."""
+    return request.client.host if request.client else ""
 
 @app.get("/health")
 def health_check():
     return {"status": "OK"}
 
 @app.get("/projects")
-def get_projects():
-    projects_folder = server_config.get_projects_folder()
-
-    if not projects_folder.exists():
-        return {"projects": []}
-    
-    projects = []
-    for folder in projects_folder.iterdir():
-        if folder.is_dir():
-            projects.append({
-                "name": folder.name,
-                "path": str(folder)
-            })
-    return {"projects": projects}
+def get_projects(include_inactive: bool = False):
+    """Registered projects with their cached stats (asset count, total bytes, last change)."""
+    return FastJSONResponse({"projects": project_registry.projects(include_inactive)})
 
 @app.post("/projects/{project_name}")
 def create_project(project: ProjectCreate, project_name = str):
@@ -62,12 +99,18 @@ def create_project(project: ProjectCreate, project_name = str):
     
     if project_path.exists():
         return {"error": f"Project '{project_name}' already exists"}
-    
-    for main_folder, subfolders in config_project.items():
-        for subfolder in subfolders:
-            full_path = project_path / main_folder / subfolder
-            full_path.mkdir(parents=True, exist_ok=True)
-    
+    try:
+        template = template_store.get(project.template)
+    except KeyError:
+        return FastJSONResponse({"error": f"Unknown template: {project.template}"}, status_code=404)
+    if template["kind"] != "project":
+        return FastJSONResponse({"error": f"Not a project template: {project.template}"}, status_code=400)
+
+    project_path.mkdir(parents=True)
+    change_journal.record(project_name, "created", kind="project")
+    instantiate_template(project_name, template, "")
+    project_registry.add(project_name, project_path, project.description)
+    project_registry.refresh_stats(project_name)
     return {"message": f"Project '{project_name}' created successfully"}
 
 """ 
@@ -86,7 +129,7 @@ def get_assets(project_name = str):
     project_path = projects_folder / project_name
     production_folder = project_path / "02_Production"
     if not production_folder.exists():
-        return {"assets": []}
+        return FastJSONResponse({"assets": []})
 
     for asset_type_folder in production_folder.iterdir():
         if asset_type_folder.is_dir() and asset_type_folder.name != "00_Shot":
@@ -96,7 +139,7 @@ def get_assets(project_name = str):
                 if asset.is_dir():
                     assets.append(asset.name)
             server_assets[asset_type] = assets
-    return server_assets
+    return FastJSONResponse(server_assets)
 
 @app.get("/projects/{project_name}/{folder_name}/{asset_name}/department")
 def get_department(project_name = str, folder_name = str, asset_name = str):
@@ -107,12 +150,12 @@ def get_department(project_name = str, folder_name = str, asset_name = str):
     project_path = projects_folder / project_name
     asset_folder = project_path / "02_Production" / folder_name / asset_name
     if not asset_folder.exists():
-        return {"departments": []}
+        return FastJSONResponse({"departments": []})
 
     for department in asset_folder.iterdir():
         if department.is_dir():
             server_department.append(department.name)
-    return {"departments": server_department}
+    return FastJSONResponse({"departments": server_department})
 
 @app.get("/projects/{project_name}/{folder_name}/{asset_name}/{department_name}/task")
 def get_department(project_name = str, folder_name = str, asset_name = str, department_name = str):
@@ -123,12 +166,12 @@ def get_department(project_name = str, folder_name = str, asset_name = str, depa
     project_path = projects_folder / project_name
     department_folder = project_path / "02_Production" / folder_name / asset_name / department_name
     if not department_folder.exists():
-        return {"departments": []}
+        return FastJSONResponse({"departments": []})
 
     for task in department_folder.iterdir():
         if task.is_dir():
             server_task.append(task.name)
-    return {"task": server_task}
+    return FastJSONResponse({"task": server_task})
 
 @app.get("/projects/{project_name}/{folder_name}/{asset_name}/{department_name}/{task_name}/file")
 def get_department(project_name = str, folder_name = str, asset_name = str, department_name = str, task_name = str):
@@ -139,76 +182,478 @@ def get_department(project_name = str, folder_name = str, asset_name = str, depa
     project_path = projects_folder / project_name
     task_folder = project_path / "02_Production" / folder_name / asset_name / department_name /task_name
     if not task_folder.exists():
-        return {"file": []}
+        return FastJSONResponse({"file": []})
 
     for file in task_folder.iterdir():
         if file.is_file():  # ✅ CORRECTION : Vérifier les fichiers, pas les dossiers !
             server_file.append(file.name)
-    return {"file": server_file}
+    return FastJSONResponse({"file": server_file})
 
 @app.get("/status/{project_name}")
-def get_status(project_name: str):
-    tree = []
+def get_status(project_name: str, format: str = "list"):
+    """Whole production tree; format=columnar shares the parent paths between entries."""
     projects_folder = server_config.get_projects_folder()
     project_path = projects_folder / project_name
     production_folder = project_path / "02_Production"
 
-    for root, dirs, files in os.walk(production_folder):
-        for d in dirs:
-            tree.append({
-                "type": "dir",
-                "name": d,
-                "path": os.path.relpath(os.path.join(root, d), str(production_folder))
-            })
-        for f in files:
-            tree.append({
-                "type": "file",
-                "name": f,
-                "path": os.path.relpath(os.path.join(root, f), str(production_folder))
-            })
-    return {"tree": tree}
+    walk = walk_production(production_folder)
+    if format == "columnar":
+        return FastJSONResponse(encode_columnar(walk))
+    return FastJSONResponse({"tree": encode_list(walk)})
+
+def make_folders(project_name: str, production_folder: Path, relative_path: str):
+    """mkdir -p that journals every folder it actually creates, returns them."""
+    created = []
+    parts = Path(relative_path).parts
+    for depth in range(1, len(parts) + 1):
+        folder = production_folder.joinpath(*parts[:depth])
+        if not folder.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+            created.append("/".join(parts[:depth]))
+            change_journal.record(project_name, "created", created[-1])
+    return created
+
+def instantiate_template(project_name: str, template: dict, path: str):
+    """
+    Create the folders of a template below path (relative to 02_Production,
+    or to the project root for project templates), returns the created
+    production folders.
+    """
+    project_folder = server_config.get_projects_folder() / project_name
+    production_folder = project_folder / "02_Production"
+    created = []
+    for folder in template["folders"]:
+        if template["kind"] != "project":
+            created += make_folders(project_name, production_folder, f"{path}/{folder}")
+        elif Path(folder).parts[0] == "02_Production":
+            created += make_folders(project_name, production_folder, Path(*Path(folder).parts[1:]).as_posix())
+        else:
+            (project_folder / folder).mkdir(parents=True, exist_ok=True)
+    return created
+
+def partial_upload_path(project_name: str):
+    """
+    Temporary file of one upload, in <project>/.sparkle/uploads: outside the
+    production tree (never listed or indexed), same file system for the final move.
+    """
+    folder = server_config.get_projects_folder() / project_name / CATALOG_FOLDER / "uploads"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder / f"{uuid.uuid4().hex}.part"
 
 @app.post("/upload/{project_name}/{path:path}")
-def upload_file(project_name: str, path: str, file: UploadFile = File(...)):
+def upload_file(project_name: str, path: str, file: UploadFile = File(...), reservation: Optional[str] = None):
+    target_path = server_config.production_path(project_name, path)
+    if target_path is None or not Path(path).parts:
+        return invalid_path(path)
     projects_folder = server_config.get_projects_folder()
-    target_path = projects_folder / project_name / "02_Production" / Path(path)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(target_path, "wb") as buffer:
-        buffer.write(file.file.read())
+    if not version_allocator.check(projects_folder / project_name, path, reservation):
+        return FastJSONResponse({"error": f"Version reserved by another save: {path}"}, status_code=409)
+    production_folder = projects_folder / project_name / "02_Production"
+    make_folders(project_name, production_folder, str(Path(path).parent))
+    # Replaced, never written in place: the target may be a master hardlinked to its version
+    partial_path = partial_upload_path(project_name)
+    try:
+        with open(partial_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        os.replace(partial_path, target_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    if reservation is not None:
+        version_allocator.release(projects_folder / project_name, path)
+    version_catalog.record_file(project_name, path)
+    change_journal.record(project_name, "uploaded", Path(path).as_posix(), kind="file")
     return {"message": f"Fichier {file.filename} uploadé dans {target_path}"}
 
+@app.put("/upload/{project_name}/{path:path}")
+async def upload_stream(project_name: str, path: str, request: Request, reservation: Optional[str] = None):
+    """
+    Streamed upload of a raw request body, throttled by the bandwidth scheduler.
+
+    A reserved version name can only be written with its reservation token.
+    """
+    # Disk work and journal listeners run in the executor, never on the event loop
+    loop = asyncio.get_running_loop()
+    target_path = await loop.run_in_executor(None, server_config.production_path, project_name, path)
+    if target_path is None or not Path(path).parts:
+        return invalid_path(path)
+    projects_folder = server_config.get_projects_folder()
+    if not await loop.run_in_executor(None, version_allocator.check, projects_folder / project_name, path, reservation):
+        return FastJSONResponse({"error": f"Version reserved by another save: {path}"}, status_code=409)
+    production_folder = projects_folder / project_name / "02_Production"
+    await loop.run_in_executor(None, make_folders, project_name, production_folder, str(Path(path).parent))
+    # One temporary file per transfer: concurrent uploads of a path never share it
+    partial_path = await loop.run_in_executor(None, partial_upload_path, project_name)
+
+    buffer = await loop.run_in_executor(None, open, partial_path, "wb")
+    try:
+        async with bandwidth.stream(client_address(request)) as stream:
+            async for chunk in request.stream():
+                await stream.consume(len(chunk))
+                await loop.run_in_executor(None, buffer.write, chunk)
+        await loop.run_in_executor(None, buffer.close)
+        await loop.run_in_executor(None, os.replace, partial_path, target_path)
+        if reservation is not None:
+            await loop.run_in_executor(None, version_allocator.release, projects_folder / project_name, path)
+    except BaseException:
+        buffer.close()
+        partial_path.unlink(missing_ok=True)
+        raise
+    await loop.run_in_executor(None, version_catalog.record_file, project_name, path)
+    await loop.run_in_executor(None, change_journal.record, project_name, "uploaded", Path(path).as_posix(), "file")
+    return {"message": f"Uploaded: {path}"}
+
 @app.post("/create_folder/{project_name}/{path:path}")
 def create_folder(project_name: str, path: str):
     """Create a folder structure on the server."""
-    projects_folder = server_config.get_projects_folder()
-    target_path = projects_folder / project_name / "02_Production" / Path(path)
-    target_path.mkdir(parents=True, exist_ok=True)
+    target_path = server_config.production_path(project_name, path)
+    if target_path is None or not Path(path).parts:
+        return invalid_path(path)
+    production_folder = server_config.get_projects_folder() / project_name / "02_Production"
+    make_folders(project_name, production_folder, path)
     return {"message": f"Folder created: {target_path}"}
 
-@app.get("/download/{project_name}/{path:path}")
-def download_file(project_name: str, path: str):
-    """Download a file from the server."""
-    projects_folder = server_config.get_projects_folder()
-    file_path = projects_folder / project_name / "02_Production" / Path(path)
-    
-    if not file_path.exists():
+@app.get("/templates")
+def get_templates(since: Optional[str] = None):
+    """Named templates, or just the version if the client's copy (since) is current."""
+    version, templates = template_store.all()
+    if since == version:
+        return {"version": version, "unchanged": True}
+    return {"version": version, "templates": templates}
+
+@app.put("/templates/{name}")
+def save_template(name: str, template: TemplateDefinition):
+    try:
+        version = template_store.save(name, template.kind, template.folders)
+    except ValueError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=400)
+    return {"message": f"Template saved: {name}", "version": version}
+
+@app.delete("/templates/{name}")
+def delete_template(name: str):
+    if not template_store.delete(name):
+        return FastJSONResponse({"error": f"Unknown template: {name}"}, status_code=404)
+    return {"message": f"Template deleted: {name}", "version": template_store.all()[0]}
+
+@app.post("/instantiate/{project_name}/{path:path}")
+def instantiate(project_name: str, path: str, request: InstantiateRequest):
+    """Scaffold an asset or department folder (or fill a project) from a template in one call."""
+    project_folder = server_config.get_projects_folder() / project_name
+    if server_config.production_path(project_name, path) is None:
+        return invalid_path(f"{project_name}/{path}")
+    if not project_folder.is_dir():
+        return FastJSONResponse({"error": f"Project '{project_name}' not found"}, status_code=404)
+    try:
+        template = template_store.get(request.template)
+    except KeyError:
+        return FastJSONResponse({"error": f"Unknown template: {request.template}"}, status_code=404)
+    if template["kind"] != "project" and not path.strip("/"):
+        return FastJSONResponse({"error": f"A {template['kind']} template needs a target folder"}, status_code=400)
+    created = instantiate_template(project_name, template, path.strip("/"))
+    return {"message": f"Template {request.template} applied to {path or project_name}", "created": created}
+
+@app.post("/reserve_version/{project_name}/{path:path}")
+def reserve_version(project_name: str, path: str, request: VersionRequest):
+    """Atomically reserve the next version of (asset, task, extension) in a task folder."""
+    project_folder = server_config.get_projects_folder() / project_name
+    if server_config.production_path(project_name, path) is None or not Path(path).parts:
+        return invalid_path(path)
+    if not project_folder.is_dir():
+        return FastJSONResponse({"error": f"Project '{project_name}' not found"}, status_code=404)
+    try:
+        return version_allocator.reserve(project_folder, path, request.asset, request.task, request.extension,
+                                         request.min_version)
+    except ValueError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=409)
+
+@app.post("/set_master/{project_name}/{path:path}")
+def set_master(project_name: str, path: str):
+    """Promote a version file to the master of its task, without copying the data when possible."""
+    version_path = server_config.production_path(project_name, path)
+    if version_path is None or not Path(path).parts:
+        return invalid_path(path)
+    if not version_path.is_file():
+        return FastJSONResponse({"error": f"File not found: {path}"}, status_code=404)
+    try:
+        master_path = version_path.with_name(version_allocator.master_name(version_path.name))
+    except ValueError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=400)
+
+    method = promote_file(version_path, master_path)
+    master = Path(path).with_name(master_path.name).as_posix()
+    version_catalog.record_master(project_name, master, path)
+    change_journal.record(project_name, "uploaded", master, kind="file")
+    return {"message": f"Master set to {version_path.name}", "master": master, "method": method}
+
+@app.post("/stat/{project_name}")
+def stat_paths(project_name: str, request: PathList):
+    """Existence, mtime and size of many paths in one call (offline replay conflict checks)."""
+    targets = {path: server_config.production_path(project_name, path) for path in request.paths}
+    invalid = [path for path, target in targets.items() if target is None or not Path(path).parts]
+    if invalid:
+        return invalid_path(", ".join(invalid))
+    stats = {}
+    for path, target in targets.items():
+        try:
+            stat = target.stat()
+        except OSError:
+            stats[path] = {"exists": False}
+            continue
+        stats[path] = {"exists": True, "mtime": stat.st_mtime, "size": stat.st_size,
+                       "is_dir": S_ISDIR(stat.st_mode)}
+    return FastJSONResponse({"stats": stats})
+
+@app.delete("/delete/{project_name}/{path:path}")
+def delete_path(project_name: str, path: str):
+    """Delete a folder or file of the production tree (moved to the trash, restorable)."""
+    if server_config.production_path(project_name, path) is None or not Path(path).parts:
+        return invalid_path(path)
+    try:
+        entry = trash_bin.trash(project_name, path)
+    except ValueError:
+        return invalid_path(path)
+    except FileNotFoundError:
+        return FastJSONResponse({"error": f"Path not found: {path}"}, status_code=404)
+    except OSError as e:
+        return FastJSONResponse({"error": f"{path} is in use: {e}"}, status_code=409)
+    version_catalog.remove(project_name, path)
+    change_journal.record(project_name, "deleted", entry["path"], kind=entry["kind"])
+    return {"message": f"Deleted: {path}", "trash_id": entry["id"]}
+
+@app.api_route("/download/{project_name}/{path:path}", methods=["GET", "HEAD"])
+def download_file(project_name: str, path: str, request: Request,
+                  range_header: Optional[str] = Header(None, alias="Range")):
+    """Download a file from the server (Range requests supported)."""
+    file_path = server_config.production_path(project_name, path)
+    if file_path is None:
+        return invalid_path(path)
+
+    if not file_path.is_file():
         return {"error": f"File not found: {path}"}
     
-    return FileResponse(
-        path=str(file_path),
-        filename=file_path.name,
-        media_type='application/octet-stream'
-    )
+    return FileStreamResponse(file_path, file_path.name, range_header=range_header,
+                              throttle=bandwidth.stream(client_address(request)))
+
+@app.get("/hash/{project_name}/{path:path}")
+def hash_file(project_name: str, path: str):
+    """SHA-256 of a file, to verify downloads."""
+    file_path = server_config.production_path(project_name, path)
+    if file_path is None:
+        return invalid_path(path)
+
+    if not file_path.is_file():
+        return {"error": f"File not found: {path}"}
+
+    digest, size = file_hash(file_path)
+    return {"algorithm": "sha256", "hash": digest, "size": size}
 
 @app.delete("/projects/{name}")
 def delete_project(name: str):
+    if server_config.production_path(name) is None:
+        return invalid_path(name)
     projects_folder = server_config.get_projects_folder()
     project_path = projects_folder / name
     
     if not project_path.exists():
         return {"error": f"Project '{name}' not found"}
-    shutil.rmtree(project_path)
-    return {"message": f"Project '{name}' deleted successfully"}
+    # The catalogs are closed first: an open database blocks the rename on Windows
+    version_catalog.forget(name)
+    search_index.forget(name)
+    try:
+        entry = trash_bin.trash(name)
+    except OSError as e:
+        return FastJSONResponse({"error": f"Project '{name}' is in use: {e}"}, status_code=409)
+    project_registry.set_status(name, "deleted")
+    change_journal.record(name, "deleted", kind="project")
+    return {"message": f"Project '{name}' deleted successfully", "trash_id": entry["id"]}
+
+@app.post("/delete/{project_name}")
+def delete_paths(project_name: str, request: PathList):
+    """Delete many folders or files in one call (moved to the trash, restorable)."""
+    invalid = [path for path in request.paths
+               if server_config.production_path(project_name, path) is None or not Path(path).parts]
+    if invalid:
+        return invalid_path(", ".join(invalid))
+    deleted, missing, failed, trash_ids = [], [], [], {}
+    # Parents first: a path inside an already deleted folder is gone with it
+    for path in sorted({Path(p).as_posix() for p in request.paths}, key=lambda p: (p.count("/"), p)):
+        if any(path.startswith(parent + "/") for parent in deleted):
+            deleted.append(path)
+            continue
+        try:
+            entry = trash_bin.trash(project_name, path)
+        except (FileNotFoundError, ValueError):
+            missing.append(path)
+            continue
+        except OSError as e:
+            print(f"ERROR: Could not delete {project_name}/{path}: {e}")
+            failed.append(path)
+            continue
+        version_catalog.remove(project_name, path)
+        change_journal.record(project_name, "deleted", entry["path"], kind=entry["kind"])
+        deleted.append(path)
+        trash_ids[path] = entry["id"]
+    return {"deleted": deleted, "missing": missing, "failed": failed, "trash_ids": trash_ids}
+
+@app.get("/trash")
+def list_trash(project: Optional[str] = None):
+    """Trashed subtrees with their restore deadline and reclaim progress."""
+    return {"entries": trash_bin.entries(project)}
+
+@app.post("/trash/{entry_id}/restore")
+def restore_trash(entry_id: str):
+    """Undo a delete while it is in the retention window."""
+    try:
+        entry = trash_bin.restore(entry_id)
+    except LookupError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=409)
+    if entry["path"]:
+        version_catalog.record_tree(entry["project"], entry["path"])
+    else:
+        project_registry.set_status(entry["project"], "active")
+    change_journal.record(entry["project"], "created", entry["path"], kind=entry["kind"])
+    return {"message": f"Restored: {entry['path'] or entry['project']}"}
+
+@app.post("/trash/{entry_id}/purge")
+def purge_trash(entry_id: str):
+    """Give up the undo and reclaim the space of an entry now."""
+    if not trash_bin.expire(entry_id):
+        return FastJSONResponse({"error": f"Nothing to purge for {entry_id}"}, status_code=404)
+    return {"message": f"Purge scheduled: {entry_id}"}
+
+def list_project_names():
+    """Names of the projects of the projects folder."""
+    projects_folder = server_config.get_projects_folder()
+    if not projects_folder.is_dir():
+        return []
+    return [p.name for p in projects_folder.iterdir() if (p / "02_Production").is_dir()]
+
+@app.on_event("startup")
+async def start_background_tasks():
+    asyncio.create_task(retention.run_forever(list_project_names))
+    asyncio.create_task(trash_bin.run_forever())
+    asyncio.create_task(project_registry.run_forever())
+    asyncio.get_running_loop().run_in_executor(None, search_index.warm, list_project_names())
+    # Version files written while the server was down or copied in by hand
+    asyncio.get_running_loop().run_in_executor(None, version_catalog.reconcile_all, list_project_names())
+
+@app.get("/search/{project_name}")
+def search(project_name: str, q: str = "", mode: str = "prefix", kind: Optional[str] = None,
+           type: Optional[str] = None, extension: Optional[str] = None, department: Optional[str] = None,
+           modified_since: Optional[float] = None, cursor: Optional[str] = None, limit: int = 100):
+    """Search the names of a project's tree (prefix, glob or substring), one page at a time."""
+    try:
+        return FastJSONResponse(search_index.search(
+            project_name, query=q, mode=mode, kind=kind, asset_type=type, extension=extension,
+            department=department, modified_since=modified_since, cursor=cursor, limit=limit))
+    except FileNotFoundError:
+        return FastJSONResponse({"error": f"Project '{project_name}' not found"}, status_code=404)
+    except ValueError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=400)
+
+@app.get("/search_index/{project_name}")
+def export_search_index(project_name: str):
+    """Whole name index of a project, for the client offline mirror."""
+    event_id = change_journal.project_event_id(project_name) or change_journal.last_event_id
+    try:
+        return FastJSONResponse(search_index.export(project_name, event_id))
+    except FileNotFoundError:
+        return FastJSONResponse({"error": f"Project '{project_name}' not found"}, status_code=404)
+
+@app.get("/storage/{project_name}")
+def get_storage(project_name: str):
+    """Storage used per asset, from the version catalog."""
+    if not (server_config.get_projects_folder() / project_name / "02_Production").is_dir():
+        return FastJSONResponse({"error": f"Project '{project_name}' not found"}, status_code=404)
+    storage = version_catalog.storage(project_name)
+    storage["last_prune"] = retention.reports.get(project_name)
+    return FastJSONResponse(storage)
+
+@app.post("/prune/{project_name}")
+async def prune_project(project_name: str, dry_run: bool = False):
+    """Apply the retention policies now: a dry run reports, a real run starts in the background."""
+    if not (server_config.get_projects_folder() / project_name / "02_Production").is_dir():
+        return FastJSONResponse({"error": f"Project '{project_name}' not found"}, status_code=404)
+    if dry_run:
+        return await retention.prune(project_name, dry_run=True)
+    asyncio.create_task(retention.prune(project_name))
+    return {"message": f"Pruning started for {project_name}", "last_prune": retention.reports.get(project_name)}
+
+@app.post("/tag/{project_name}/{path:path}")
+def tag_version(project_name: str, path: str, request: TagRequest):
+    """Tag a version so retention keeps it (or untag it)."""
+    if not version_catalog.set_tagged(project_name, path, request.tagged):
+        return FastJSONResponse({"error": f"Not a version file: {path}"}, status_code=404)
+    return {"message": f"{'Tagged' if request.tagged else 'Untagged'}: {path}"}
+
+def change_backlog(project_name, last_event_id):
+    """Events missed since last_event_id, or a single resync event if they are gone."""
+    if not last_event_id:
+        return []
+    events = change_journal.since(project_name, last_event_id)
+    if events is None:
+        return [{"type": "resync", "id": change_journal.last_event_id, "revision": change_journal.revision,
+                 "project": project_name, "path": "", "kind": "project"}]
+    return events
+
+@app.websocket("/ws/{project_name}")
+async def changes_websocket(websocket: WebSocket, project_name: str, since: Optional[str] = None):
+    """Push the change events of a project as they are journaled."""
+    await websocket.accept()
+    # Subscribe before reading the backlog so nothing falls in between
+    queue = change_journal.subscribe(project_name)
+    try:
+        await websocket.send_json({"type": "hello", "id": change_journal.last_event_id, "revision": change_journal.revision})
+        sent_revision = 0
+        for event in change_backlog(project_name, since):
+            sent_revision = max(sent_revision, event["revision"])
+            await websocket.send_json(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=30)
+            except asyncio.TimeoutError:
+                # Keep proxies from closing an idle socket and detect dead clients
+                event = {"type": "ping", "revision": change_journal.revision}
+            if event["type"] != "ping" and event["revision"] <= sent_revision:
+                continue
+            await websocket.send_json(event)
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        pass
+    finally:
+        change_journal.unsubscribe(project_name, queue)
+
+def sse_message(event, name="change"):
+    # The hello carries no SSE id: a browser would resume from it and skip the backlog
+    event_id = f"id: {event['id']}\n" if name != "hello" else ""
+    return f"{event_id}event: {name}\ndata: {json.dumps(event)}\n\n"
+
+@app.get("/events/{project_name}")
+async def changes_event_stream(request: Request, project_name: str, last_event_id: Optional[str] = Header(None)):
+    """Same change stream as /ws as Server-Sent Events, for proxies that block WebSockets."""
+    async def stream():
+        # Subscribed once the body is iterated: a client gone before that leaves no queue behind
+        queue = change_journal.subscribe(project_name)
+        try:
+            backlog = change_backlog(project_name, last_event_id)
+            # Tell the client the stream is up, proxies may hold headers until the first bytes
+            yield sse_message({"type": "hello", "id": change_journal.last_event_id, "revision": change_journal.revision}, "hello")
+            sent_revision = 0
+            for event in backlog:
+                sent_revision = max(sent_revision, event["revision"])
+                yield sse_message(event, event["type"] if event["type"] == "resync" else "change")
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event["revision"] > sent_revision:
+                    yield sse_message(event)
+        finally:
+            change_journal.unsubscribe(project_name, queue)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
 
 
 
@@ -0,0 +1,54 @@
+"""
+Project models
+
+Rows of the projects table and their cached summary statistics.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import relationship
+from database.connection import Base
+
+
+class Project(Base):
+    __tablename__ = "projects"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    description = Column(String)
+    path = Column(String, unique=True, nullable=False)
+    status = Column(String, default="active")  # "active", "deleted" (in the trash) or "missing"
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    stats = relationship("ProjectStats", uselist=False, cascade="all, delete-orphan", lazy="joined")
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "path": self.path,
+            "description": self.description,
+            "status": self.status,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "stats": self.stats.to_dict() if self.stats else None,
+        }
+
+
+class ProjectStats(Base):
+    """Summary of a project, recomputed in the background after it changed."""
+
+    __tablename__ = "project_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    asset_count = Column(Integer, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    last_revision = Column(String)  # Change journal event id the stats include
+    computed_at = Column(DateTime)
+
+    def to_dict(self):
+        return {
+            "asset_count": self.asset_count,
+            "total_bytes": self.total_bytes,
+            "last_revision": self.last_revision,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
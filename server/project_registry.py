@@ -0,0 +1,157 @@
+"""
+Project registry
+
+The projects table of the pipeline database as the source of /projects:
+- Rows are written by project creation, delete and restore, and reconciled
+  with the projects folder at startup and then periodically (projects
+  copied in or removed by hand)
+- Summary statistics (asset count, total bytes, last change) are cached in
+  project_stats and refreshed in the background only for projects that
+  changed since, so listing projects never walks a tree
+- The counts come from totals kept current by the change events (search
+  index, version catalog); the only walks are the ones that build or
+  reconcile those indexes
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from models.project import Project, ProjectStats
+from database.connection import create_session_factory
+
+STATS_INTERVAL = 30  # Seconds between two checks for changed projects
+
+
+class ProjectRegistry:
+    def __init__(self, projects_folder_getter, config_loader, event_id_getter, totals_getter):
+        """
+        Args:
+            projects_folder_getter: Callable returning the projects folder
+            config_loader: Callable returning the server config dict ("database_url")
+            event_id_getter: Callable(project name) returning its last change event id or None
+            totals_getter: Callable(project name) returning its (asset count, total bytes)
+        """
+        self.projects_folder_getter = projects_folder_getter
+        self.config_loader = config_loader
+        self.event_id_getter = event_id_getter
+        self.totals_getter = totals_getter
+        self._sessions = None
+        self._sessions_lock = threading.Lock()
+        # Serializes the writers of the table: creation, status changes and the folder sync
+        self._write_lock = threading.Lock()
+        # Projects whose stats were computed by this server run
+        self._computed = set()
+
+    def _session(self):
+        if self._sessions is None:
+            # Concurrent first requests would each create the tables
+            with self._sessions_lock:
+                if self._sessions is None:
+                    self._sessions = create_session_factory(self.config_loader().get("database_url"))
+        return self._sessions()
+
+    def _folder_projects(self):
+        """{name: folder} of the project folders on disk."""
+        projects_folder = self.projects_folder_getter()
+        if not projects_folder.is_dir():
+            return {}
+        return {folder.name: folder for folder in projects_folder.iterdir()
+                if not folder.name.startswith(".") and (folder / "02_Production").is_dir()}
+
+    def projects(self, include_inactive=False):
+        """
+        Registered projects with their cached stats, by name.
+
+        Args:
+            include_inactive: Also list the deleted and missing projects
+        """
+        with self._session() as session:
+            query = session.query(Project)
+            if not include_inactive:
+                query = query.filter(Project.status == "active")
+            return [project.to_dict() for project in query.order_by(Project.name)]
+
+    def add(self, name, path, description=None):
+        """Register a new project (or revive the row of a deleted one with the same name)."""
+        with self._write_lock, self._session() as session, session.begin():
+            project = session.query(Project).filter(Project.name == name).one_or_none()
+            if project is None:
+                project = Project(name=name)
+                session.add(project)
+            project.path = str(path)
+            project.description = description
+            project.status = "active"
+            project.stats = None
+        self._computed.discard(name)
+
+    def set_status(self, name, status):
+        """
+        Returns:
+            bool: False if the project isn't registered
+        """
+        with self._write_lock, self._session() as session, session.begin():
+            project = session.query(Project).filter(Project.name == name).one_or_none()
+            if project is None:
+                return False
+            project.status = status
+        self._computed.discard(name)
+        return True
+
+    def sync_folder(self):
+        """Reconcile the table with the projects folder, returns the names of the active projects."""
+        with self._write_lock, self._session() as session, session.begin():
+            # Rows first: a project created since has its folder already, the listing sees it
+            registered = {project.name: project for project in session.query(Project)}
+            folders = self._folder_projects()
+            for name, folder in folders.items():
+                project = registered.get(name)
+                if project is None:
+                    session.add(Project(name=name, path=str(folder), status="active"))
+                elif project.status != "active" or project.path != str(folder):
+                    project.status = "active"
+                    project.path = str(folder)
+            for name, project in registered.items():
+                if name not in folders and project.status == "active" \
+                        and not (self.projects_folder_getter() / name / "02_Production").is_dir():
+                    project.status = "missing"
+        return sorted(folders)
+
+    def refresh_stats(self, name):
+        """Store the current stats of a project."""
+        event_id = self.event_id_getter(name)
+        asset_count, total_bytes = self.totals_getter(name)
+        with self._session() as session, session.begin():
+            project = session.query(Project).filter(Project.name == name).one_or_none()
+            if project is None:
+                return
+            if project.stats is None:
+                project.stats = ProjectStats()
+            project.stats.asset_count = asset_count
+            project.stats.total_bytes = total_bytes
+            project.stats.last_revision = event_id or project.stats.last_revision
+            project.stats.computed_at = datetime.utcnow()
+        self._computed.add(name)
+
+    def stale_projects(self, names):
+        """Projects whose stats miss the latest changes."""
+        with self._session() as session:
+            revisions = {project.name: project.stats.last_revision if project.stats else None
+                         for project in session.query(Project).filter(Project.name.in_(names))}
+        stale = []
+        for name in names:
+            event_id = self.event_id_getter(name)
+            if name not in self._computed or (event_id is not None and event_id != revisions.get(name)):
+                stale.append(name)
+        return stale
+
+    async def run_forever(self):
+        """Reconcile the table and refresh the stats of the changed projects, forever."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                names = await loop.run_in_executor(None, self.sync_folder)
+                for name in await loop.run_in_executor(None, self.stale_projects, names):
+                    await loop.run_in_executor(None, self.refresh_stats, name)
+            except Exception as e:
+                print(f"ERROR: Project stats refresh failed: {e}")
+            await asyncio.sleep(STATS_INTERVAL)
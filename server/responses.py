@@ -0,0 +1,32 @@
+"""
+Fast JSON responses
+
+FastJSONResponse renders with orjson when it is installed and falls back to
+the standard library otherwise. Endpoints return it directly with plain
+dicts/lists/str/int/float so the content is serialized in a single pass
+(FastAPI skips jsonable_encoder for Response objects).
+"""
+
+import json
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    print("WARNING: orjson not installed, JSON responses use the slower standard library encoder")
+
+
+def dump_json(content):
+    """Serialize plain JSON content to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    # Same output settings as Starlette's JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content):
+        return dump_json(content)
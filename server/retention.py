@@ -0,0 +1,514 @@
+"""
+Version retention
+
+Catalog of the version files of each project and pruning of old versions:
+- The catalog (sqlite, <project>/.sparkle/versions.db) is updated by the
+  endpoints that write or delete files, so storage usage is a query, not a
+  walk of the tree
+- Retention policies per project and per department, read from
+  server_config.json:
+      "retention": {
+          "default": {"keep_last": 10},
+          "projects": {"MyFilm": {"default": {...}, "departments": {"Modeling": {...}}}}
+      }
+  keep_last: versions kept per (task, asset, task name, extension), 0 = all
+  keep_tagged: never prune tagged versions (default true)
+  keep_masters: never prune the version promoted to master (default true)
+- Pruning runs in the background, in batches, off the event loop
+- The catalog is reconciled with the tree at startup and before every
+  periodic pruning pass (files copied in by hand or written while the
+  server was down); masters are matched to the version they hold by a
+  shared inode or the same content, so keep_masters survives a rebuild
+"""
+
+import asyncio
+import filecmp
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from versions import VERSION_PATTERN, MASTER_PATTERN
+
+CATALOG_FOLDER = ".sparkle"
+PRUNE_BATCH_SIZE = 200
+
+DEFAULT_POLICY = {"keep_last": 0, "keep_tagged": True, "keep_masters": True}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    asset_path TEXT NOT NULL,
+    department TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    task TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    links INTEGER NOT NULL DEFAULT 1,
+    tagged INTEGER NOT NULL DEFAULT 0,
+    is_master INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS versions_series ON versions (folder, asset, task, extension, version);
+CREATE INDEX IF NOT EXISTS versions_asset ON versions (asset_path);
+CREATE INDEX IF NOT EXISTS versions_linked ON versions (size) WHERE links > 1;
+CREATE TABLE IF NOT EXISTS masters (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    asset_path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    version_path TEXT
+);
+"""
+
+
+def _split(relative_path):
+    """(folder, asset path, department) of a path relative to 02_Production."""
+    parts = Path(relative_path).parts
+    return (Path(*parts[:-1]).as_posix() if len(parts) > 1 else "",
+            "/".join(parts[:2]), parts[2] if len(parts) > 3 else "")
+
+
+class _Locked:
+    """Hold a lock, then use a sqlite connection as a transaction."""
+
+    def __init__(self, lock, connect):
+        self.lock = lock
+        self.connect = connect
+        self.connection = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.connection = self.connect()
+            return self.connection.__enter__()
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        try:
+            return self.connection.__exit__(*exc_info)
+        finally:
+            self.lock.release()
+
+
+class VersionCatalog:
+    """Per-project sqlite index of version and master files."""
+
+    def __init__(self, projects_folder_getter):
+        """
+        Args:
+            projects_folder_getter: Callable returning the projects folder
+        """
+        self.projects_folder_getter = projects_folder_getter
+        self._connections = {}
+        # Guards the dicts only; each project catalog has its own lock, so a
+        # project being scanned never blocks the others
+        self._lock = threading.Lock()
+        self._project_locks = {}
+
+    def _production_folder(self, project_name):
+        return self.projects_folder_getter() / project_name / "02_Production"
+
+    def _project_lock(self, project_name):
+        with self._lock:
+            return self._project_locks.setdefault(project_name, threading.Lock())
+
+    def _connect(self, project_name):
+        """
+        Connection to a project catalog, created (one walk of the tree) on
+        first use. The caller holds the project lock.
+        """
+        db_path = self.projects_folder_getter() / project_name / CATALOG_FOLDER / "versions.db"
+        with self._lock:
+            connection = self._connections.get(db_path)
+        if connection is None:
+            created = not db_path.exists()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared by the worker threads, every use holds the project lock
+            connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            connection.executescript(SCHEMA)
+            if created:
+                self._scan(project_name, connection)
+            with self._lock:
+                self._connections[db_path] = connection
+        return connection
+
+    def _open(self, project_name):
+        """Project lock and catalog transaction: `with self._open(name) as connection:`."""
+        return _Locked(self._project_lock(project_name), lambda: self._connect(project_name))
+
+    def forget(self, project_name):
+        """Close the catalog of a deleted project."""
+        db_path = self.projects_folder_getter() / project_name / CATALOG_FOLDER / "versions.db"
+        with self._project_lock(project_name):
+            with self._lock:
+                connection = self._connections.pop(db_path, None)
+            if connection is not None:
+                connection.close()
+
+    def _walk(self, project_name):
+        """Paths (relative to 02_Production) of the version and master files of the tree."""
+        production_folder = self._production_folder(project_name)
+        prefix_length = len(str(production_folder)) + 1
+        for root, _, files in os.walk(production_folder):
+            for name in files:
+                if VERSION_PATTERN.match(name) or MASTER_PATTERN.match(name):
+                    yield os.path.join(root, name)[prefix_length:].replace(os.sep, "/")
+
+    def _scan(self, project_name, connection):
+        """Fill a new catalog from the tree."""
+        production_folder = self._production_folder(project_name)
+        for relative_path in self._walk(project_name):
+            self._upsert(connection, production_folder, relative_path)
+        self._link_masters(connection, production_folder)
+        connection.commit()
+
+    def _link_masters(self, connection, production_folder):
+        """
+        Find the version each master holds, for the masters cataloged without
+        one (catalog rebuilt, files copied in): sets masters.version_path and
+        the is_master flag keep_masters relies on.
+
+        A hardlinked master shares its version's inode (checked first, a stat
+        each); a reflinked, copied or uploaded one has the same content.
+        Masters matching no version are marked "" so they aren't compared
+        again until they change.
+
+        Returns:
+            int: Masters examined
+        """
+        rows = connection.execute("SELECT path, folder FROM masters WHERE version_path IS NULL").fetchall()
+        for master_path, folder in rows:
+            asset, task, extension = MASTER_PATTERN.match(Path(master_path).name).groups()
+            series = (folder, asset, task, extension)
+            master_file = production_folder / master_path
+            version_path = ""
+            try:
+                master_size = master_file.stat().st_size
+                # Newest first: the master is nearly always the latest version
+                candidates = [path for path, size in connection.execute(
+                    "SELECT path, size FROM versions WHERE folder = ? AND asset = ? AND task = ? AND extension = ?"
+                    " ORDER BY version DESC", series) if size == master_size]
+                for compare in (os.path.samefile, lambda a, b: filecmp.cmp(a, b, shallow=False)):
+                    version_path = next((path for path in candidates
+                                         if compare(production_folder / path, master_file)), "")
+                    if version_path:
+                        break
+            except OSError:
+                continue
+            connection.execute("UPDATE masters SET version_path = ? WHERE path = ?", (version_path, master_path))
+            connection.execute("UPDATE versions SET is_master = (path = ?)"
+                               " WHERE folder = ? AND asset = ? AND task = ? AND extension = ?",
+                               (version_path, *series))
+        return len(rows)
+
+    def reconcile(self, project_name):
+        """
+        Bring the catalog in line with the tree: catalog the files written
+        behind the server's back, drop the rows of files gone.
+
+        The walk runs without holding the project lock; only the differences
+        are applied under it, each checked again on disk so a concurrent
+        upload or delete is never undone.
+
+        Returns:
+            tuple: (files added or updated, rows removed)
+        """
+        production_folder = self._production_folder(project_name)
+        if not production_folder.is_dir():
+            return 0, 0
+        if not (self.projects_folder_getter() / project_name / CATALOG_FOLDER / "versions.db").exists():
+            # A new catalog is filled by its first walk, nothing to reconcile
+            with self._open(project_name):
+                return 0, 0
+        on_disk = {}
+        for relative_path in self._walk(project_name):
+            try:
+                stat = (production_folder / relative_path).stat()
+            except OSError:
+                continue
+            on_disk[relative_path] = (stat.st_size, stat.st_nlink)
+
+        with self._open(project_name) as connection:
+            cataloged = {path: (size, links) for path, size, links in
+                         connection.execute("SELECT path, size, links FROM versions")}
+            cataloged.update((path, (size, None)) for path, size in
+                             connection.execute("SELECT path, size FROM masters"))
+        changed = [path for path, state in on_disk.items()
+                   if path not in cataloged or cataloged[path][0] != state[0]
+                   or cataloged[path][1] not in (None, state[1])]
+        gone = [path for path in cataloged if path not in on_disk]
+
+        removed = 0
+        with self._open(project_name) as connection:
+            for relative_path in changed:
+                self._upsert(connection, production_folder, relative_path)
+                # The masters of the folder may now hold another version: matched again below
+                connection.execute("UPDATE masters SET version_path = NULL WHERE folder = ?",
+                                   (_split(relative_path)[0],))
+            for relative_path in gone:
+                if not (production_folder / relative_path).exists():
+                    for table in ("versions", "masters"):
+                        removed += connection.execute(f"DELETE FROM {table} WHERE path = ?",
+                                                      (relative_path,)).rowcount
+            # Also links the masters of catalogs built before they were derived from the tree
+            linked = self._link_masters(connection, production_folder)
+        if not changed and not removed and not linked:
+            return 0, 0
+        print(f"INFO: Version catalog of {project_name} reconciled "
+              f"({len(changed)} files cataloged, {removed} removed, {linked} masters checked)")
+        return len(changed), removed
+
+    def reconcile_all(self, project_names):
+        """Reconcile the catalogs of several projects (startup, in a worker thread)."""
+        for project_name in project_names:
+            try:
+                self.reconcile(project_name)
+            except Exception as e:
+                print(f"ERROR: Version catalog reconciliation of {project_name} failed: {e}")
+
+    def _upsert(self, connection, production_folder, relative_path):
+        name = Path(relative_path).name
+        try:
+            stat = (production_folder / relative_path).stat()
+        except OSError:
+            return
+        folder, asset_path, department = _split(relative_path)
+        match = VERSION_PATTERN.match(name)
+        if match:
+            asset, task, version, extension = match.groups()
+            connection.execute(
+                "INSERT INTO versions (path, folder, asset_path, department, asset, task, extension, version, size, links)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(path) DO UPDATE SET size = excluded.size, links = excluded.links",
+                (relative_path, folder, asset_path, department, asset, task, extension, int(version),
+                 stat.st_size, stat.st_nlink))
+        elif MASTER_PATTERN.match(name):
+            connection.execute(
+                "INSERT INTO masters (path, folder, asset_path, size) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(path) DO UPDATE SET size = excluded.size",
+                (relative_path, folder, asset_path, stat.st_size))
+
+    def record_file(self, project_name, relative_path):
+        """Catalog a file just written (upload)."""
+        relative_path = Path(relative_path).as_posix()
+        with self._open(project_name) as connection:
+            self._upsert(connection, self._production_folder(project_name), relative_path)
+
+    def record_tree(self, project_name, relative_path):
+        """Catalog every file of a folder put back in the tree (trash restore)."""
+        production_folder = self._production_folder(project_name)
+        target = production_folder / Path(relative_path)
+        paths = [relative_path] if target.is_file() else [
+            os.path.relpath(os.path.join(root, name), production_folder).replace(os.sep, "/")
+            for root, _, files in os.walk(target) for name in files
+        ]
+        with self._open(project_name) as connection:
+            for path in paths:
+                self._upsert(connection, production_folder, Path(path).as_posix())
+
+    def record_master(self, project_name, master_path, version_path):
+        """Catalog a master promotion: master_path now holds version_path."""
+        master_path, version_path = Path(master_path).as_posix(), Path(version_path).as_posix()
+        with self._open(project_name) as connection:
+            production_folder = self._production_folder(project_name)
+            previous = connection.execute("SELECT version_path FROM masters WHERE path = ?", (master_path,)).fetchone()
+            self._upsert(connection, production_folder, master_path)
+            self._upsert(connection, production_folder, version_path)
+            if previous and previous[0]:
+                # No longer linked to the master: its link count dropped
+                self._upsert(connection, production_folder, previous[0])
+            connection.execute("UPDATE masters SET version_path = ? WHERE path = ?", (version_path, master_path))
+            asset, task, _, extension = VERSION_PATTERN.match(Path(version_path).name).groups()
+            connection.execute("UPDATE versions SET is_master = (path = ?)"
+                               " WHERE folder = ? AND asset = ? AND task = ? AND extension = ?",
+                               (version_path, _split(version_path)[0], asset, task, extension))
+
+    def remove(self, project_name, relative_path):
+        """Forget a deleted file or folder (and everything below it)."""
+        relative_path = Path(relative_path).as_posix()
+        below = relative_path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"
+        with self._open(project_name) as connection:
+            for table in ("versions", "masters"):
+                connection.execute(f"DELETE FROM {table} WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+                                   (relative_path, below))
+
+    def set_tagged(self, project_name, relative_path, tagged=True):
+        """
+        Tag or untag a version (tagged versions are kept by default).
+
+        Returns:
+            bool: False if the path isn't a cataloged version
+        """
+        with self._open(project_name) as connection:
+            cursor = connection.execute("UPDATE versions SET tagged = ? WHERE path = ?",
+                                        (int(tagged), Path(relative_path).as_posix()))
+            return cursor.rowcount > 0
+
+    def storage(self, project_name):
+        """
+        Storage used per asset.
+
+        Returns:
+            dict: {"assets": {asset path: {"versions", "version_bytes", "master_bytes"}}, "total_bytes"}
+        """
+        with self._open(project_name) as connection:
+            assets = {}
+            for asset_path, count, size in connection.execute(
+                    "SELECT asset_path, COUNT(*), SUM(CASE WHEN links > 1 THEN 0 ELSE size END) FROM versions"
+                    " GROUP BY asset_path"):
+                assets[asset_path] = {"versions": count, "version_bytes": size, "master_bytes": 0}
+            for asset_path, size in connection.execute(
+                    "SELECT asset_path, SUM(size) FROM masters GROUP BY asset_path"):
+                assets.setdefault(asset_path, {"versions": 0, "version_bytes": 0, "master_bytes": 0})
+                assets[asset_path]["master_bytes"] = size
+        total = sum(usage["version_bytes"] + usage["master_bytes"] for usage in assets.values())
+        return {"assets": assets, "total_bytes": total}
+
+    def linked_bytes(self, project_name):
+        """Bytes of the versions hardlinked to a master (the same data as the master file)."""
+        with self._open(project_name) as connection:
+            return connection.execute("SELECT COALESCE(SUM(size), 0) FROM versions WHERE links > 1").fetchone()[0]
+
+    def prune_candidates(self, project_name, policy_for):
+        """
+        Versions the retention policies allow to delete.
+
+        Args:
+            project_name: Project name
+            policy_for: Callable(department) returning the policy dict
+
+        Returns:
+            list: (path, size, links) of the versions to delete
+        """
+        candidates = []
+        policies = {}
+        with self._open(project_name) as connection:
+            rows = connection.execute(
+                "SELECT path, folder, department, asset, task, extension, size, links, tagged, is_master"
+                " FROM versions ORDER BY folder, asset, task, extension, version DESC")
+            series, rank = None, 0
+            for path, folder, department, asset, task, extension, size, links, tagged, is_master in rows:
+                if (folder, asset, task, extension) != series:
+                    series, rank = (folder, asset, task, extension), 0
+                rank += 1
+                if department not in policies:
+                    policies[department] = policy_for(department)
+                policy = policies[department]
+                if not policy["keep_last"] or rank <= policy["keep_last"]:
+                    continue
+                if (tagged and policy["keep_tagged"]) or (is_master and policy["keep_masters"]):
+                    continue
+                candidates.append((path, size, links))
+        return candidates
+
+
+class RetentionEngine:
+    """Background pruning of the versions outside the retention policies."""
+
+    def __init__(self, catalog, config_loader, on_deleted=None):
+        """
+        Args:
+            catalog: VersionCatalog
+            config_loader: Callable returning the server config dict
+            on_deleted: Callable(project_name, relative_path) for every pruned file (optional)
+        """
+        self.catalog = catalog
+        self.config_loader = config_loader
+        self.on_deleted = on_deleted
+        self.reports = {}
+        self._running = set()
+
+    def policy(self, project_name, department=""):
+        """Effective policy of a department of a project."""
+        retention = self.config_loader().get("retention", {})
+        project = retention.get("projects", {}).get(project_name, {})
+        policy = dict(DEFAULT_POLICY)
+        policy.update(retention.get("default", {}))
+        policy.update(project.get("default", {}))
+        policy.update(project.get("departments", {}).get(department, {}))
+        return policy
+
+    def _delete_batch(self, project_name, batch):
+        """Delete a batch of versions, returns (deleted count, reclaimed bytes)."""
+        production_folder = self.catalog.projects_folder_getter() / project_name / "02_Production"
+        deleted = reclaimed = 0
+        for path, size, _ in batch:
+            file_path = production_folder / path
+            try:
+                # A hardlinked version (promoted to master) frees nothing
+                links = file_path.stat().st_nlink
+                file_path.unlink()
+            except FileNotFoundError:
+                links = 0
+            self.catalog.remove(project_name, path)
+            if links:
+                deleted += 1
+                reclaimed += size if links == 1 else 0
+                if self.on_deleted is not None:
+                    self.on_deleted(project_name, path)
+        return deleted, reclaimed
+
+    async def prune(self, project_name, dry_run=False):
+        """
+        Apply the retention policies of a project.
+
+        Returns:
+            dict: Report (deleted, reclaimed_bytes, candidates, started_at, finished_at)
+        """
+        loop = asyncio.get_running_loop()
+        report = {"project": project_name, "dry_run": dry_run, "started_at": time.time(),
+                  "finished_at": None, "candidates": 0, "deleted": 0, "reclaimed_bytes": 0}
+        if project_name in self._running:
+            return {**report, "error": "Pruning already running"}
+
+        self._running.add(project_name)
+        try:
+            candidates = await loop.run_in_executor(
+                None, self.catalog.prune_candidates, project_name,
+                lambda department: self.policy(project_name, department))
+            report["candidates"] = len(candidates)
+            if dry_run:
+                report["reclaimable_bytes"] = sum(size for _, size, links in candidates if links == 1)
+            else:
+                for start in range(0, len(candidates), PRUNE_BATCH_SIZE):
+                    deleted, reclaimed = await loop.run_in_executor(
+                        None, self._delete_batch, project_name, candidates[start:start + PRUNE_BATCH_SIZE])
+                    report["deleted"] += deleted
+                    report["reclaimed_bytes"] += reclaimed
+            report["finished_at"] = time.time()
+            if not dry_run:
+                self.reports[project_name] = report
+            if report["deleted"]:
+                print(f"INFO: Pruned {report['deleted']} versions of {project_name}, "
+                      f"{report['reclaimed_bytes']} bytes reclaimed")
+            return report
+        finally:
+            self._running.discard(project_name)
+
+    async def run_forever(self, list_projects):
+        """
+        Prune every project periodically ("retention_interval_hours" in the
+        config, default 24; 0 disables the background pass).
+
+        Args:
+            list_projects: Callable returning the project names
+        """
+        while True:
+            interval = float(self.config_loader().get("retention_interval_hours", 24)) * 3600
+            if interval <= 0:
+                await asyncio.sleep(3600)
+                continue
+            await asyncio.sleep(interval)
+            loop = asyncio.get_running_loop()
+            for project_name in list_projects():
+                try:
+                    # Files copied in by hand since the last pass are pruned too
+                    await loop.run_in_executor(None, self.catalog.reconcile, project_name)
+                    await self.prune(project_name)
+                except Exception as e:
+                    print(f"ERROR: Pruning {project_name} failed: {e}")
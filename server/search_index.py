@@ -0,0 +1,321 @@
+"""
+Search index
+
+Per-project sqlite index of every folder and file of 02_Production
+(<project>/.sparkle/search.db) answering name searches without touching the
+tree:
+- Prefix matches are a range scan of the name index, glob patterns use their
+  literal prefix for the same range, substring matches go through an FTS5
+  trigram index of the names (plain scan for 1-2 characters or without FTS5)
+- Filters by entry kind, asset type, extension, department and modification
+  time; keyset pagination on (name, path), or (mtime, path) for "modified
+  since" without a name, so every page costs the same
+- The index is built by one walk the first time a project is used in a
+  server run (startup warms them in the background), then kept current by
+  the change journal events
+- Events are queued by the journal listener and applied by a worker
+  thread, so recording a change never waits for the index; the events of a
+  project received while its index is being built are kept and replayed on
+  top of the walk
+- Per-project totals (files, bytes, asset folders) are kept by triggers on
+  the entries, so project stats never walk the tree
+- Schema and query semantics are shared with the client offline mirror
+  (shared/search_schema.py)
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+
+from retention import CATALOG_FOLDER
+from shared.search_schema import ENTRY_COLUMNS, FTS_REBUILD, FTS_SCHEMA, SCHEMA, below, entry_row, search_page
+
+BUILD_BATCH_SIZE = 5000
+# Longest wait of an export for the events queued before it
+CATCH_UP_TIMEOUT = 30
+
+# An asset folder: <type>/<asset>, shots and hidden folders excluded (same rule as the asset list)
+ASSET_ROW = ("({row}.kind = 'folder' AND {row}.asset_type != '00_Shot' AND {row}.path GLOB '[^.]*/[^.]*'"
+             " AND {row}.path NOT GLOB '*/*/*')")
+
+# Project totals, filled once from the built entries, then kept by the triggers
+TOTALS_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    assets INTEGER NOT NULL
+);
+INSERT OR REPLACE INTO totals (id, files, bytes, assets)
+    SELECT 0, COALESCE(SUM(kind = 'file'), 0), COALESCE(SUM(size), 0),
+           COALESCE(SUM({ASSET_ROW.format(row="entries")}), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS totals_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET files = files + (new.kind = 'file'), bytes = bytes + new.size,
+                      assets = assets + {ASSET_ROW.format(row="new")};
+END;
+CREATE TRIGGER IF NOT EXISTS totals_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET files = files - (old.kind = 'file'), bytes = bytes - old.size,
+                      assets = assets - {ASSET_ROW.format(row="old")};
+END;
+CREATE TRIGGER IF NOT EXISTS totals_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes + new.size - old.size;
+END;
+"""
+
+
+class SearchIndex:
+    """Name index of the production trees, fed by the change journal."""
+
+    def __init__(self, projects_folder_getter):
+        """
+        Args:
+            projects_folder_getter: Callable returning the projects folder
+        """
+        self.projects_folder_getter = projects_folder_getter
+        self._connections = {}
+        self._fts = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        # Events of the projects being built, replayed once the walk is done
+        self._pending = {}
+        self._events = queue.SimpleQueue()
+        threading.Thread(target=self._apply_events, name="search-index", daemon=True).start()
+
+    def _production_folder(self, project_name):
+        return self.projects_folder_getter() / project_name / "02_Production"
+
+    def _build_lock(self, project_name):
+        with self._lock:
+            return self._build_locks.setdefault(project_name, threading.Lock())
+
+    def _connect(self, project_name):
+        """
+        Index of a project, built from the tree on first use in this server run.
+
+        Raises:
+            FileNotFoundError: No such project
+        """
+        connection = self._connections.get(project_name)
+        if connection is not None:
+            return connection
+        with self._build_lock(project_name):
+            connection = self._connections.get(project_name)
+            if connection is not None:
+                return connection
+            with self._lock:
+                self._pending[project_name] = []
+            try:
+                connection, fts = self._create(project_name)
+                while True:
+                    with self._lock:
+                        events = self._pending[project_name]
+                        if not events:
+                            # Caught up: later events go straight to the index
+                            del self._pending[project_name]
+                            self._fts[project_name] = fts
+                            self._connections[project_name] = connection
+                            break
+                        self._pending[project_name] = []
+                    if any(event["kind"] == "project" for event in events):
+                        # Deleted or recreated during the walk: start over
+                        connection.close()
+                        connection, fts = self._create(project_name)
+                        continue
+                    for event in events:
+                        with connection:
+                            self._apply(connection, project_name, event)
+            except BaseException:
+                with self._lock:
+                    self._pending.pop(project_name, None)
+                raise
+            print(f"INFO: Search index of {project_name} built")
+            return connection
+
+    def _create(self, project_name):
+        """
+        New index database filled from the tree.
+
+        Returns:
+            tuple: (connection, trigram index available)
+        """
+        if not self._production_folder(project_name).is_dir():
+            raise FileNotFoundError(project_name)
+        db_path = self.projects_folder_getter() / project_name / CATALOG_FOLDER / "search.db"
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+        connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        self._build(project_name, connection)
+        connection.executescript(TOTALS_SCHEMA)
+        try:
+            # Trigram index filled once from the entries, then kept by the triggers
+            connection.executescript(FTS_SCHEMA + FTS_REBUILD + ";")
+            fts = True
+        except sqlite3.OperationalError:
+            # sqlite without FTS5 or the trigram tokenizer: substring searches scan
+            fts = False
+        return connection, fts
+
+    def _build(self, project_name, connection):
+        """Fill a new index with one walk of the tree."""
+        production_folder = str(self._production_folder(project_name))
+        prefix_length = len(production_folder) + 1
+        insert = f"INSERT INTO entries ({ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        with connection:
+            batch = []
+            for root, dirs, files in os.walk(production_folder):
+                relative_root = root[prefix_length:].replace(os.sep, "/")
+                for name, is_dir in [(d, True) for d in dirs] + [(f, False) for f in files]:
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    relative_path = f"{relative_root}/{name}" if relative_root else name
+                    batch.append(entry_row(relative_path, is_dir, 0 if is_dir else stat.st_size, stat.st_mtime))
+                if len(batch) >= BUILD_BATCH_SIZE:
+                    connection.executemany(insert, batch)
+                    batch = []
+            connection.executemany(insert, batch)
+
+    def warm(self, project_names):
+        """Build the indexes of the projects not opened yet (startup, in a worker thread)."""
+        for project_name in project_names:
+            try:
+                self._connect(project_name)
+            except Exception as e:
+                print(f"ERROR: Search index of {project_name} failed: {e}")
+
+    def forget(self, project_name):
+        """Close the index of a deleted or recreated project."""
+        with self._build_lock(project_name):
+            with self._lock:
+                connection = self._connections.pop(project_name, None)
+                self._fts.pop(project_name, None)
+            if connection is not None:
+                connection.close()
+
+    def _upsert_tree(self, connection, project_name, relative_path):
+        """Index a path and, for a folder, everything below it."""
+        production_folder = self._production_folder(project_name)
+        target = production_folder / Path(relative_path)
+        rows = []
+        try:
+            stat = target.stat()
+        except OSError:
+            return
+        rows.append(entry_row(relative_path, target.is_dir(), 0 if target.is_dir() else stat.st_size, stat.st_mtime))
+        if target.is_dir():
+            prefix_length = len(str(production_folder)) + 1
+            for root, dirs, files in os.walk(target):
+                for name, is_dir in [(d, True) for d in dirs] + [(f, False) for f in files]:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    rows.append(entry_row(path[prefix_length:].replace(os.sep, "/"), is_dir,
+                                          0 if is_dir else stat.st_size, stat.st_mtime))
+        connection.executemany(
+            f"INSERT INTO entries ({ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime", rows)
+
+    def apply_event(self, event):
+        """Change journal listener: queue the event for the index worker."""
+        self._events.put(event)
+
+    def _apply_events(self):
+        """Worker thread: apply the queued events in order."""
+        while True:
+            event = self._events.get()
+            if isinstance(event, threading.Event):
+                event.set()
+                continue
+            try:
+                self._dispatch(event)
+            except Exception as e:
+                print(f"ERROR: Search index update failed for {event.get('path')}: {e}")
+
+    def _dispatch(self, event):
+        """
+        Apply an event to the index of its project.
+
+        Projects whose index isn't built yet are skipped, their build reads
+        the tree as it is then; a build in progress keeps the event.
+        """
+        project_name = event["project"]
+        with self._lock:
+            pending = self._pending.get(project_name)
+            if pending is not None:
+                pending.append(event)
+                return
+            connection = self._connections.get(project_name)
+        if event["kind"] == "project":
+            self.forget(project_name)
+            return
+        if connection is None:
+            return
+        with self._build_lock(project_name), connection:
+            self._apply(connection, project_name, event)
+
+    def _apply(self, connection, project_name, event):
+        """Write a path event (upserts read the disk, so replaying one is harmless)."""
+        relative_path = Path(event["path"]).as_posix()
+        if event["type"] == "deleted":
+            low, high = below(relative_path)
+            connection.execute("DELETE FROM entries WHERE path = ? OR (path >= ? AND path < ?)",
+                               (relative_path, low, high))
+        else:
+            self._upsert_tree(connection, project_name, relative_path)
+
+    def _catch_up(self):
+        """Wait until the events queued so far are applied."""
+        done = threading.Event()
+        self._events.put(done)
+        done.wait(CATCH_UP_TIMEOUT)
+
+    def search(self, project_name, **filters):
+        """
+        Search the names of a project (see shared.search_schema.search_query for the filters).
+
+        Raises:
+            FileNotFoundError: No such project
+            ValueError: Invalid mode or cursor
+        """
+        connection = self._connect(project_name)
+        with self._build_lock(project_name):
+            return search_page(connection, fts=self._fts.get(project_name, False), **filters)
+
+    def export(self, project_name, event_id=None):
+        """
+        Whole index of a project in columns, for client mirrors.
+
+        Args:
+            event_id: Change event id the export includes, returned as is
+        """
+        # The events recorded up to event_id may still be queued
+        self._catch_up()
+        connection = self._connect(project_name)
+        with self._build_lock(project_name):
+            rows = connection.execute("SELECT path, kind, size, mtime FROM entries ORDER BY path").fetchall()
+        paths, kinds, sizes, mtimes = (list(column) for column in zip(*rows)) if rows else ([], [], [], [])
+        return {"event_id": event_id, "paths": paths, "kinds": kinds, "sizes": sizes, "mtimes": mtimes}
+
+    def totals(self, project_name):
+        """
+        Current totals of a project tree.
+
+        Returns:
+            dict: {"files", "bytes", "assets"}, hardlinked files counted once per path
+
+        Raises:
+            FileNotFoundError: No such project
+        """
+        self._catch_up()
+        connection = self._connect(project_name)
+        with self._build_lock(project_name):
+            files, total_bytes, assets = connection.execute("SELECT files, bytes, assets FROM totals").fetchone()
+        return {"files": files, "bytes": total_bytes, "assets": assets}
@@ -0,0 +1,180 @@
+"""
+Project templates
+
+Named folder templates stored once on the server (templates.json next to
+server_config.json), used to scaffold:
+- "project": folders relative to the project root (01_PreProduction/..., 02_Production/...)
+- "asset": department/task folders relative to an asset folder
+- "department": task folders relative to a department folder
+
+The file is parsed once and reloaded only when it changes on disk. Every
+content change gets a new version string, so clients can keep their cached
+copy until the version moves.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+TEMPLATE_KINDS = ("project", "asset", "department")
+
+DEPARTMENTS = {
+    "Modeling": ["Low", "Hight", "UV"],
+    "Surfacing": ["Texturing", "Shading"],
+    "Rigging": ["Block", "Body", "Facial"],
+    "Assembly": ["Assembly"],
+    "FX": ["FX"],
+}
+
+DEFAULT_TEMPLATES = {
+    "project": {
+        "kind": "project",
+        "folders": [
+            "01_PreProduction/concept_art",
+            "01_PreProduction/references",
+            "01_PreProduction/storyboard",
+            "02_Production/Chara",
+            "02_Production/Env",
+            "02_Production/Props",
+            "02_Production/Items",
+            "02_Production/Modules",
+            "02_Production/FX",
+            "02_Production/00_Shot",
+            "03_PostProduction/Grading",
+            "03_PostProduction/Editing",
+            "03_PostProduction/DCP",
+        ],
+    },
+    "asset": {
+        "kind": "asset",
+        "folders": [f"{department}/{task}" for department, tasks in DEPARTMENTS.items() for task in tasks],
+    },
+    **{department: {"kind": "department", "folders": list(tasks)} for department, tasks in DEPARTMENTS.items()},
+}
+
+
+def clean_folders(folders):
+    """
+    Normalized relative folders of a template.
+
+    Raises:
+        ValueError: Absolute path or path leaving the base folder
+    """
+    cleaned = []
+    for folder in folders:
+        path = Path(folder)
+        if not folder or path.is_absolute() or ".." in path.parts:
+            raise ValueError(f"Invalid template folder: {folder!r}")
+        cleaned.append(path.as_posix())
+    return cleaned
+
+
+class TemplateStore:
+    """Named templates of the server, cached in memory."""
+
+    def __init__(self, templates_file):
+        """
+        Args:
+            templates_file: JSON file holding the templates (created with the defaults)
+        """
+        self.templates_file = Path(templates_file)
+        self._templates = None
+        self._version = None
+        self._file_state = None
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.templates_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _version_of(templates):
+        return hashlib.sha1(json.dumps(templates, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _write(self, templates):
+        self.templates_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.templates_file.with_name(self.templates_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(templates, f, indent=2)
+        os.replace(tmp_file, self.templates_file)
+
+    def _load(self):
+        """Templates and version, reparsed only when the file changed (lock held)."""
+        state = self._stat()
+        if self._templates is not None and state == self._file_state:
+            return self._templates, self._version
+
+        if state is None:
+            self._write(DEFAULT_TEMPLATES)
+            templates = json.loads(json.dumps(DEFAULT_TEMPLATES))
+        else:
+            try:
+                with open(self.templates_file, "r") as f:
+                    templates = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"ERROR: Could not read {self.templates_file}: {e}")
+                templates = self._templates or json.loads(json.dumps(DEFAULT_TEMPLATES))
+
+        self._templates = templates
+        self._version = self._version_of(templates)
+        self._file_state = self._stat()
+        return self._templates, self._version
+
+    def all(self):
+        """
+        Returns:
+            tuple: (version, {name: {"kind", "folders"}})
+        """
+        with self._lock:
+            templates, version = self._load()
+            return version, templates
+
+    def get(self, name):
+        """
+        Raises:
+            KeyError: Unknown template
+        """
+        with self._lock:
+            templates, _ = self._load()
+            return templates[name]
+
+    def save(self, name, kind, folders):
+        """
+        Create or replace a template.
+
+        Returns:
+            str: New version of the templates
+
+        Raises:
+            ValueError: Unknown kind or invalid folders
+        """
+        if kind not in TEMPLATE_KINDS:
+            raise ValueError(f"Unknown template kind: {kind}")
+        folders = clean_folders(folders)
+        with self._lock:
+            templates, _ = self._load()
+            templates = dict(templates)
+            templates[name] = {"kind": kind, "folders": folders}
+            self._write(templates)
+            self._file_state = None
+            return self._load()[1]
+
+    def delete(self, name):
+        """
+        Returns:
+            bool: False if the template didn't exist
+        """
+        with self._lock:
+            templates, _ = self._load()
+            if name not in templates:
+                return False
+            templates = {key: value for key, value in templates.items() if key != name}
+            self._write(templates)
+            self._file_state = None
+            self._load()
+            return True
@@ -0,0 +1,259 @@
+"""
+Trash
+
+Instant deletes of projects and production paths:
+- The subtree is renamed into <projects folder>/.trash/<entry id>/ (same file
+  system, so the request returns at once whatever its size)
+- Every trashed subtree has a tombstone in <projects folder>/.trash/trash.db
+  with its origin, state and reclaim progress
+- It can be restored until the retention window ("trash_retention_hours",
+  default 24) is over, then a background task reclaims it at a throttled
+  pace ("trash_reclaim_files_per_second", default 2000)
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from config import contained_path
+
+TRASH_FOLDER = ".trash"
+RECLAIM_BATCH_SIZE = 500
+RECLAIM_CHECK_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    trashed_at REAL NOT NULL,
+    state TEXT NOT NULL,
+    files_done INTEGER NOT NULL DEFAULT 0,
+    bytes_reclaimed INTEGER NOT NULL DEFAULT 0,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS entries_state ON entries (state, trashed_at);
+"""
+
+ENTRY_COLUMNS = ("id", "project", "path", "kind", "trashed_at", "state", "files_done", "bytes_reclaimed",
+                 "finished_at")
+
+
+class TrashBin:
+    """Trash of the projects folder, with tombstones and background reclaim."""
+
+    def __init__(self, projects_folder_getter, config_loader):
+        """
+        Args:
+            projects_folder_getter: Callable returning the projects folder
+            config_loader: Callable returning the server config dict
+        """
+        self.projects_folder_getter = projects_folder_getter
+        self.config_loader = config_loader
+        self._connection = None
+        self._connection_folder = None
+        self._lock = threading.Lock()
+
+    def _trash_folder(self):
+        return self.projects_folder_getter() / TRASH_FOLDER
+
+    def _db(self):
+        """Tombstone database (reopened if the projects folder changed)."""
+        trash_folder = self._trash_folder()
+        if self._connection is None or self._connection_folder != trash_folder:
+            trash_folder.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(trash_folder / "trash.db", timeout=30, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+            self._connection_folder = trash_folder
+        return self._connection
+
+    def _original_path(self, entry):
+        project_folder = self.projects_folder_getter() / entry["project"]
+        return project_folder / "02_Production" / Path(entry["path"]) if entry["path"] else project_folder
+
+    def trash(self, project_name, relative_path=""):
+        """
+        Move a production path (or a whole project if relative_path is "") to the trash.
+
+        Returns:
+            dict: Tombstone entry
+
+        Raises:
+            FileNotFoundError: Nothing to delete
+            ValueError: The path points outside the project's production tree
+            OSError: The subtree couldn't be moved (files in use)
+        """
+        relative_path = Path(relative_path).as_posix() if relative_path else ""
+        entry = {"id": uuid.uuid4().hex, "project": project_name, "path": relative_path,
+                 "trashed_at": time.time(), "state": "trashed", "files_done": 0, "bytes_reclaimed": 0,
+                 "finished_at": None}
+        source = None
+        if Path(project_name).name == project_name and not project_name.startswith("."):
+            source = contained_path(self.projects_folder_getter(), project_name)
+            if source is not None and relative_path:
+                source = contained_path(source / "02_Production", relative_path)
+        if source is None:
+            raise ValueError(f"Outside the production tree: {project_name}/{relative_path}")
+        if not os.path.lexists(source):
+            raise FileNotFoundError(str(source))
+        entry["kind"] = "project" if not relative_path else ("folder" if source.is_dir() else "file")
+
+        with self._lock:
+            connection = self._db()
+            target_folder = self._trash_folder() / entry["id"]
+            target_folder.mkdir()
+            try:
+                os.rename(source, target_folder / source.name)
+            except OSError:
+                # Open files on Windows, permissions: nothing moved, no entry
+                os.rmdir(target_folder)
+                raise
+            with connection:
+                connection.execute(f"INSERT INTO entries ({', '.join(ENTRY_COLUMNS)}) VALUES "
+                                   f"({', '.join('?' * len(ENTRY_COLUMNS))})",
+                                   tuple(entry[column] for column in ENTRY_COLUMNS))
+        return entry
+
+    def entries(self, project_name=None, active_only=True):
+        """
+        Tombstones, newest first.
+
+        Args:
+            project_name: Only this project's entries (optional)
+            active_only: Skip restored and fully reclaimed entries
+        """
+        query = f"SELECT {', '.join(ENTRY_COLUMNS)} FROM entries"
+        conditions, params = [], []
+        if project_name is not None:
+            conditions.append("project = ?")
+            params.append(project_name)
+        if active_only:
+            conditions.append("state IN ('trashed', 'reclaiming')")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._db().execute(query + " ORDER BY trashed_at DESC", params).fetchall()
+        retention = self.retention_seconds()
+        entries = [dict(zip(ENTRY_COLUMNS, row)) for row in rows]
+        for entry in entries:
+            entry["restorable_until"] = entry["trashed_at"] + retention if entry["state"] == "trashed" else None
+        return entries
+
+    def _entry(self, entry_id):
+        row = self._db().execute(f"SELECT {', '.join(ENTRY_COLUMNS)} FROM entries WHERE id = ?",
+                                 (entry_id,)).fetchone()
+        return dict(zip(ENTRY_COLUMNS, row)) if row else None
+
+    def restore(self, entry_id):
+        """
+        Move a trashed subtree back where it was.
+
+        Returns:
+            dict: The restored entry
+
+        Raises:
+            LookupError: Unknown entry, already reclaimed, or its place is taken
+        """
+        with self._lock:
+            entry = self._entry(entry_id)
+            if entry is None or entry["state"] != "trashed":
+                raise LookupError(f"Nothing to restore for {entry_id}")
+            original = self._original_path(entry)
+            if original.exists():
+                raise LookupError(f"{entry['path'] or entry['project']} exists again, restore it elsewhere")
+            trashed = self._trash_folder() / entry_id / original.name
+            original.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(trashed, original)
+            os.rmdir(self._trash_folder() / entry_id)
+            with self._db() as connection:
+                connection.execute("UPDATE entries SET state = 'restored', finished_at = ? WHERE id = ?",
+                                   (time.time(), entry_id))
+            entry["state"] = "restored"
+        return entry
+
+    def retention_seconds(self):
+        return float(self.config_loader().get("trash_retention_hours", 24)) * 3600
+
+    def expire(self, entry_id):
+        """Make an entry reclaimable now (no undo)."""
+        with self._lock, self._db() as connection:
+            cursor = connection.execute("UPDATE entries SET trashed_at = 0 WHERE id = ? AND state = 'trashed'",
+                                        (entry_id,))
+            return cursor.rowcount > 0
+
+    def _claim_expired(self):
+        """Next entry past its retention window, marked as being reclaimed."""
+        with self._lock, self._db() as connection:
+            row = connection.execute(
+                "SELECT id FROM entries WHERE state = 'reclaiming' OR (state = 'trashed' AND trashed_at < ?)"
+                " ORDER BY trashed_at LIMIT 1", (time.time() - self.retention_seconds(),)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE entries SET state = 'reclaiming' WHERE id = ?", row)
+            return row[0]
+
+    def _reclaim_batch(self, walker, batch_size):
+        """Delete up to batch_size entries of a bottom-up walk, returns (files, bytes, done)."""
+        files = size = 0
+        for _ in range(batch_size):
+            try:
+                root, dirs, names = next(walker)
+            except StopIteration:
+                return files, size, True
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.lstat(path)
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                files += 1
+                size += stat.st_size if stat.st_nlink == 1 else 0
+            for name in dirs:
+                # Symlinks to folders are listed as dirs but not walked
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    os.unlink(path)
+                else:
+                    os.rmdir(path)
+        return files, size, False
+
+    async def reclaim(self, entry_id):
+        """Delete a trashed subtree in throttled batches, recording progress."""
+        loop = asyncio.get_running_loop()
+        folder = str(self._trash_folder() / entry_id)
+        walker = os.walk(folder, topdown=False)
+        done = False
+        while not done:
+            rate = float(self.config_loader().get("trash_reclaim_files_per_second", 2000))
+            started = time.monotonic()
+            files, size, done = await loop.run_in_executor(None, self._reclaim_batch, walker, RECLAIM_BATCH_SIZE)
+            with self._lock, self._db() as connection:
+                connection.execute("UPDATE entries SET files_done = files_done + ?,"
+                                   " bytes_reclaimed = bytes_reclaimed + ? WHERE id = ?", (files, size, entry_id))
+            if rate > 0 and files:
+                await asyncio.sleep(max(0.0, files / rate - (time.monotonic() - started)))
+
+        await loop.run_in_executor(None, shutil.rmtree, folder, True)
+        with self._lock, self._db() as connection:
+            connection.execute("UPDATE entries SET state = 'reclaimed', finished_at = ? WHERE id = ?",
+                               (time.time(), entry_id))
+
+    async def run_forever(self):
+        """Reclaim the expired entries one at a time, forever."""
+        while True:
+            try:
+                entry_id = await asyncio.get_running_loop().run_in_executor(None, self._claim_expired)
+                if entry_id is None:
+                    await asyncio.sleep(RECLAIM_CHECK_INTERVAL)
+                    continue
+                await self.reclaim(entry_id)
+            except Exception as e:
+                print(f"ERROR: Trash reclaim failed: {e}")
+                await asyncio.sleep(RECLAIM_CHECK_INTERVAL)
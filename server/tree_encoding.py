@@ -0,0 +1,72 @@
+"""
+Tree encoding
+
+Encodings of the production tree returned by /status:
+- "list": one {"type", "name", "path"} object per entry (historic format)
+- "columnar": parent folders listed once and referenced by index, names and
+  kinds in parallel arrays, so long shared path prefixes are sent once
+"""
+
+import os
+
+
+def walk_production(production_folder):
+    """
+    Walk a 02_Production folder.
+
+    Yields (relative_root, dirs, files) with relative_root "" for the top
+    folder and "/" separated below.
+    """
+    production_folder = str(production_folder)
+    prefix_length = len(production_folder.rstrip(os.sep)) + 1
+    for root, dirs, files in os.walk(production_folder):
+        relative_root = root[prefix_length:].replace(os.sep, "/")
+        yield relative_root, dirs, files
+
+
+def encode_list(walk):
+    """Historic /status format: a list of entry objects."""
+    tree = []
+    for relative_root, dirs, files in walk:
+        base = f"{relative_root}/" if relative_root else ""
+        for d in dirs:
+            tree.append({"type": "dir", "name": d, "path": base + d})
+        for f in files:
+            tree.append({"type": "file", "name": f, "path": base + f})
+    return tree
+
+
+def encode_columnar(walk):
+    """
+    Columnar /status format.
+
+    Entry i is named name[i], lives in parents[parent[i]] and is a folder if
+    kind[i] == "d", a file if "f". Its path is parents[parent[i]] + "/" + name[i]
+    (just name[i] at the top level).
+    """
+    parents = []
+    parent = []
+    name = []
+    kinds = []
+    for relative_root, dirs, files in walk:
+        index = len(parents)
+        parents.append(relative_root)
+        parent.extend([index] * (len(dirs) + len(files)))
+        name.extend(dirs)
+        name.extend(files)
+        kinds.append("d" * len(dirs) + "f" * len(files))
+    return {"format": "columnar", "parents": parents, "parent": parent, "name": name, "kind": "".join(kinds)}
+
+
+def decode_columnar(payload):
+    """Expand a columnar payload back to the list format (for clients and checks)."""
+    parents = payload["parents"]
+    tree = []
+    for parent_index, entry_name, kind in zip(payload["parent"], payload["name"], payload["kind"]):
+        parent_path = parents[parent_index]
+        tree.append({
+            "type": "dir" if kind == "d" else "file",
+            "name": entry_name,
+            "path": f"{parent_path}/{entry_name}" if parent_path else entry_name
+        })
+    return tree
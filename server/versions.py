@@ -0,0 +1,156 @@
+"""
+Version allocation
+
+Server-side numbering of version files (<asset>_<task>_vNNN.<ext>) so that two
+artists saving the same task at once never get the same version:
+- The next number is computed from the task folder and the outstanding
+  reservations, under a per-folder lock
+- A reservation is a marker file created with O_EXCL in
+  <project>/.reservations/<task folder>/, which also makes it atomic across
+  server worker processes
+- The upload of the reserved name commits it and removes the marker;
+  unused reservations expire
+- Master promotion (shared.file_links.promote_file, same code as the client)
+"""
+
+import os
+import re
+import secrets
+import threading
+import time
+from pathlib import Path
+
+VERSION_PATTERN = re.compile(r"^([A-Za-z0-9]+)_([A-Za-z0-9]+)_v(\d{3})\.([A-Za-z0-9]+)$")
+MASTER_PATTERN = re.compile(r"^([A-Za-z0-9]+)_([A-Za-z0-9]+)_master\.([A-Za-z0-9]+)$")
+NAME_PART = re.compile(r"^[A-Za-z0-9]+$")
+
+RESERVATION_FOLDER = ".reservations"
+
+
+class VersionAllocator:
+    def __init__(self, reservation_ttl=3600):
+        """
+        Args:
+            reservation_ttl: Seconds before an unused reservation is released
+        """
+        self.reservation_ttl = reservation_ttl
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _folder_lock(self, key):
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _marker_folder(project_folder, task_path):
+        return project_folder / RESERVATION_FOLDER / Path(task_path)
+
+    def _reserved_versions(self, marker_folder, asset, task, extension):
+        """Version numbers of the live reservations of a folder, expired ones are removed."""
+        versions = []
+        if not marker_folder.is_dir():
+            return versions
+        expired_before = time.time() - self.reservation_ttl
+        with os.scandir(marker_folder) as entries:
+            for entry in entries:
+                match = VERSION_PATTERN.match(entry.name)
+                if not match or match.group(1, 2, 4) != (asset, task, extension):
+                    continue
+                if entry.stat().st_mtime < expired_before:
+                    Path(entry.path).unlink(missing_ok=True)
+                    continue
+                versions.append(int(match.group(3)))
+        return versions
+
+    def reserve(self, project_folder, task_path, asset, task, extension, min_version=1):
+        """
+        Reserve the next version of (asset, task, extension) in a task folder.
+
+        Args:
+            project_folder: Project root folder
+            task_path: Task folder relative to 02_Production
+            asset: Asset name
+            task: Task name
+            extension: File extension without the dot
+            min_version: Lowest number to hand out (the version a client
+                already saved locally, kept when nobody took it)
+
+        Returns:
+            dict: version, name, path (relative to 02_Production) and token
+
+        Raises:
+            ValueError: Invalid name parts or version space exhausted
+        """
+        if not all(NAME_PART.match(part or "") for part in (asset, task, extension)):
+            raise ValueError("Asset, task and extension must be alphanumeric")
+
+        project_folder = Path(project_folder)
+        task_folder = project_folder / "02_Production" / Path(task_path)
+        marker_folder = self._marker_folder(project_folder, task_path)
+
+        with self._folder_lock((str(project_folder), Path(task_path).as_posix())):
+            versions = self._reserved_versions(marker_folder, asset, task, extension)
+            if task_folder.is_dir():
+                with os.scandir(task_folder) as entries:
+                    for entry in entries:
+                        match = VERSION_PATTERN.match(entry.name)
+                        if match and match.group(1, 2, 4) == (asset, task, extension):
+                            versions.append(int(match.group(3)))
+
+            marker_folder.mkdir(parents=True, exist_ok=True)
+            token = secrets.token_hex(16)
+            version = max(max(versions, default=0) + 1, min_version)
+            while version <= 999:
+                name = f"{asset}_{task}_v{version:03d}.{extension}"
+                try:
+                    # Exclusive create: another worker process may reserve the same number
+                    fd = os.open(marker_folder / name, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                except FileExistsError:
+                    version += 1
+                    continue
+                with os.fdopen(fd, "w") as marker:
+                    marker.write(token)
+                return {"version": version, "name": name,
+                        "path": (Path(task_path) / name).as_posix(), "token": token}
+        raise ValueError(f"No version left for {asset}_{task}.{extension}")
+
+    @staticmethod
+    def master_name(version_name):
+        """
+        Master file name of a version file name.
+
+        Raises:
+            ValueError: Not a version file name
+        """
+        match = VERSION_PATTERN.match(version_name)
+        if not match:
+            raise ValueError(f"Not a version file: {version_name}")
+        asset, task, _, extension = match.groups()
+        return f"{asset}_{task}_master.{extension}"
+
+    def _marker(self, project_folder, relative_path):
+        relative_path = Path(relative_path)
+        return self._marker_folder(Path(project_folder), relative_path.parent) / relative_path.name
+
+    def check(self, project_folder, relative_path, token=None):
+        """
+        True if an upload may write relative_path: the name isn't reserved
+        (or its reservation expired), or it is and token is the reservation token.
+        """
+        marker = self._marker(project_folder, relative_path)
+        try:
+            if marker.stat().st_mtime < time.time() - self.reservation_ttl:
+                marker.unlink(missing_ok=True)
+                return True
+            reserved_token = marker.read_text()
+        except FileNotFoundError:
+            return True
+        return token is not None and secrets.compare_digest(reserved_token, token)
+
+    def release(self, project_folder, relative_path):
+        """Remove the reservation of relative_path once its file is written."""
+        self._marker(project_folder, relative_path).unlink(missing_ok=True)
+
+
+# Global singleton instance
+version_allocator = VersionAllocator()
@@ -0,0 +1,11 @@
+"""
+Shared
+
+Code used by both the client and the server, so both sides keep the same
+semantics:
+- file_links: master promotion without writing the data twice
+- search_schema: search index schema and query builder
+
+The repository root is put on sys.path by client/src/__init__.py and
+server/main.py.
+"""
@@ -0,0 +1,71 @@
+"""
+File links
+
+Master promotion as a metadata operation: reflink (copy-on-write clone) or
+hardlink of the version file, copy only as a last resort.
+
+A hardlinked master is the version file itself: saving it in place rewrites
+the version too. The server only ever replaces masters, so it may link them;
+clients, whose masters are opened and saved by the DCC apps, clone or copy.
+"""
+
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl cloning a file's extents (btrfs, XFS, bcachefs)
+
+
+def reflink(source, target):
+    """Copy-on-write clone of source to target, False if the file system can't."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+
+
+def promote_file(source, target, hardlink=True):
+    """
+    Make target a copy of source without writing the data again when possible.
+
+    Tries a reflink (shared extents, independent files), then a hardlink
+    (same file: the master must only be replaced, never edited in place),
+    then falls back to a copy. target is replaced atomically.
+
+    Args:
+        source: Version file
+        target: Master file
+        hardlink: Allow the hardlink step (False where masters are edited in place)
+
+    Returns:
+        str: "reflink", "hardlink" or "copy"
+    """
+    source, target = str(source), str(target)
+    temporary = f"{target}.promote"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    if reflink(source, temporary):
+        method = "reflink"
+    else:
+        method = "copy"
+        if hardlink:
+            try:
+                os.link(source, temporary)
+                method = "hardlink"
+            except OSError:
+                pass
+        if method == "copy":
+            shutil.copy2(source, temporary)
+    os.replace(temporary, target)
+    return method
@@ -0,0 +1,187 @@
+"""
+Search schema
+
+Schema and query semantics of the name search index, shared by the server
+index (server/search_index.py) and the client offline mirror
+(client/src/managers/search_manager.py) so both answer a query the same way:
+- entries: one row per folder/file of 02_Production, indexed by name,
+  extension, department and mtime
+- names: FTS5 trigram index of the names, kept by triggers (optional, sqlite
+  builds without FTS5 fall back to scans)
+- search_query/search_page: prefix, glob and substring searches with
+  filters and keyset pagination
+"""
+
+import re
+
+MAX_PAGE_SIZE = 1000
+# Sorts after every character a name can hold: upper bound of prefix ranges
+HIGHEST_CHAR = "\U0010ffff"
+GLOB_SPECIAL = re.compile(r"\[[^\]]*\]?|[*?]")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    department TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_name ON entries (name_key, path);
+CREATE INDEX IF NOT EXISTS entries_extension ON entries (extension, name_key);
+CREATE INDEX IF NOT EXISTS entries_department ON entries (department, name_key);
+CREATE INDEX IF NOT EXISTS entries_mtime ON entries (mtime, path);
+"""
+
+FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+    name_key, content='entries', content_rowid='id', tokenize='trigram'
+)"""
+
+# Keep the trigram index in step with the entries, by trigger name
+FTS_TRIGGERS = {
+    "entries_insert": """
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO names (rowid, name_key) VALUES (new.id, new.name_key);
+END""",
+    "entries_delete": """
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO names (names, rowid, name_key) VALUES ('delete', old.id, old.name_key);
+END""",
+    "entries_update": """
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF name_key ON entries BEGIN
+    INSERT INTO names (names, rowid, name_key) VALUES ('delete', old.id, old.name_key);
+    INSERT INTO names (rowid, name_key) VALUES (new.id, new.name_key);
+END""",
+}
+
+FTS_SCHEMA = ";\n".join([FTS_TABLE, *FTS_TRIGGERS.values()]) + ";\n"
+
+# Fills the trigram index from the entries at once (after a bulk load)
+FTS_REBUILD = "INSERT INTO names (names) VALUES ('rebuild')"
+
+ENTRY_COLUMNS = "path, name_key, kind, extension, asset_type, department, size, mtime"
+
+
+def entry_row(relative_path, is_dir, size, mtime):
+    """Indexed columns of an entry of 02_Production (<type>/<asset>/<department>/<task>/<file>)."""
+    parts = relative_path.split("/")
+    name = parts[-1]
+    extension = "" if is_dir or "." not in name else name.rsplit(".", 1)[1].lower()
+    # A folder is its own asset type or department at those depths, a stray file isn't
+    folder_parts = parts if is_dir else parts[:-1]
+    asset_type = folder_parts[0] if folder_parts else ""
+    department = folder_parts[2] if len(folder_parts) > 2 else ""
+    return (relative_path, name.lower(), "folder" if is_dir else "file", extension, asset_type, department,
+            size, mtime)
+
+
+def below(relative_path):
+    """Path range (low, high) of the entries inside a folder, for an index range scan."""
+    return relative_path + "/", relative_path + "0"  # "0" is the character after "/"
+
+
+def search_query(query="", mode="prefix", kind=None, asset_type=None, extension=None, department=None,
+                 modified_since=None, cursor=None, limit=100, fts=True):
+    """
+    SQL and parameters of a search page.
+
+    Args:
+        query: Text matched against the names (case insensitive)
+        mode: "prefix", "substring" or "glob"
+        kind: "file" or "folder"
+        asset_type: First level folder (Chara, Props...)
+        extension: File extension, with or without the dot
+        department: Department folder name
+        modified_since: Only entries modified at or after this timestamp (newest
+            first if there is no query)
+        cursor: next_cursor of the previous page
+        limit: Page size (capped at MAX_PAGE_SIZE)
+        fts: The trigram index is available
+
+    Returns:
+        tuple: (sql, params, limit, recent first)
+
+    Raises:
+        ValueError: Unknown mode or malformed cursor
+    """
+    conditions, params = [], []
+    query = (query or "").lower()
+    if mode == "prefix":
+        if query:
+            conditions.append("name_key >= ? AND name_key < ?")
+            params += [query, query + HIGHEST_CHAR]
+    elif mode == "glob":
+        if query:
+            literal = GLOB_SPECIAL.split(query)[0]
+            if literal:
+                conditions.append("name_key >= ? AND name_key < ?")
+                params += [literal, literal + HIGHEST_CHAR]
+            elif fts and any(len(run) >= 3 for run in GLOB_SPECIAL.split(query)):
+                # No fixed start: the trigrams of the literal parts narrow the candidates
+                conditions.append("id IN (SELECT rowid FROM names WHERE name_key GLOB ?)")
+                params.append(query)
+            conditions.append("name_key GLOB ?")
+            params.append(query)
+    elif mode == "substring":
+        if len(query) >= 3 and fts:
+            conditions.append("id IN (SELECT rowid FROM names WHERE names MATCH ?)")
+            params.append('"' + query.replace('"', '""') + '"')
+        elif query:
+            conditions.append("instr(name_key, ?) > 0")
+            params.append(query)
+    else:
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    for column, value in (("kind", kind), ("asset_type", asset_type), ("department", department),
+                          ("extension", extension.lstrip(".").lower() if extension else None)):
+        if value:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    if modified_since is not None:
+        conditions.append("mtime >= ?")
+        params.append(modified_since)
+
+    # Without a name to match, "modified since" lists the most recent first (mtime index)
+    recent = not query and modified_since is not None
+    if cursor:
+        key, separator, path = cursor.partition("/")
+        if not separator:
+            raise ValueError("Invalid cursor")
+        if recent:
+            conditions.append("(mtime, path) < (?, ?)")
+            params += [float(key), path]
+        else:
+            conditions.append("(name_key, path) > (?, ?)")
+            params += [key, path]
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    sql = f"SELECT {ENTRY_COLUMNS} FROM entries"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += (" ORDER BY mtime DESC, path DESC" if recent else " ORDER BY name_key, path") + " LIMIT ?"
+    return sql, params + [limit + 1], limit, recent
+
+
+def search_page(connection, fts=True, **filters):
+    """
+    Run a search on an index connection.
+
+    Returns:
+        dict: {"results": [{"path", "name", "kind", "size", "mtime"}], "next_cursor"}
+    """
+    sql, params, limit, recent = search_query(fts=fts, **filters)
+    rows = connection.execute(sql, params).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = f"{last[7]!r}/{last[0]}" if recent else f"{last[1]}/{last[0]}"
+    return {
+        "results": [{"path": path, "name": path.rsplit("/", 1)[-1], "kind": kind, "size": size, "mtime": mtime}
+                    for path, _, kind, _, _, _, size, mtime in rows[:limit]],
+        "next_cursor": next_cursor,
+    }